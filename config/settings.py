@@ -1,4 +1,6 @@
+import os
 from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict
 from enum import Enum
 
@@ -15,10 +17,14 @@ class IndicatorType(Enum):
     SOSTENIBILIDAD_ESTRATEGICA = "Sostenibilidad estratégica"
 
 class UIConfig:
-    """Configuración de la interfaz de usuario"""
+    """Configuración de la interfaz de usuario.
+    
+    Las tablas son de solo lectura (MappingProxyType): se comparten entre hilos y
+    sesiones, y el tema activo de cada ventana vive en ui.style_registry.
+    """
     
     # Colores del tema
-    COLORS = {
+    COLORS = MappingProxyType({
         'bg_primary': '#1e1e2e',
         'bg_secondary': '#282a36',
         'bg_button': '#44475a',
@@ -29,16 +35,46 @@ class UIConfig:
         'fg_warning': '#ffb86c',
         'fg_error': '#ff5555',
         'fg_info': '#8be9fd'
-    }
+    })
     
     # Fuentes
-    FONTS = {
+    FONTS = MappingProxyType({
         'title': ('Arial', 20, 'bold'),
         'subtitle': ('Arial', 14, 'bold'),
         'normal': ('Arial', 11),
         'small': ('Arial', 9, 'italic'),
         'indicator': ('Arial', 10, 'bold')
-    }
+    })
+    
+    # Temas de la interfaz (ui.style_registry): mismos roles de color en todos los temas
+    FONT_FAMILY = 'Segoe UI'
+    DEFAULT_THEME = 'oscuro'
+    THEMES = MappingProxyType({
+        'oscuro': MappingProxyType({
+            'primary': '#1a1b23',        # Fondo principal muy oscuro
+            'secondary': '#2d3142',      # Fondo secundario gris oscuro
+            'accent': '#44475a',         # Elementos de acento
+            'highlight': '#6272a4',      # Hover y destacados
+            'success': '#50fa7b',        # Verde brillante
+            'warning': '#ffb86c',        # Naranja brillante
+            'danger': '#ff5555',         # Rojo brillante
+            'text_primary': '#f8f8f2',   # Texto principal claro
+            'text_secondary': '#6272a4', # Texto secundario
+            'card_bg': '#373844'         # Fondo de cards
+        }),
+        'claro': MappingProxyType({
+            'primary': '#e9ecf2',
+            'secondary': '#ffffff',
+            'accent': '#d5dae5',
+            'highlight': '#3b5bdb',
+            'success': '#2f9e44',
+            'warning': '#e8590c',
+            'danger': '#e03131',
+            'text_primary': '#1a1b23',
+            'text_secondary': '#3b5bdb',
+            'card_bg': '#f1f3f8'
+        })
+    })
     
     # Dimensiones
     WINDOW_SIZE = "1000x700"
@@ -46,19 +82,50 @@ class UIConfig:
     INDICATOR_LABEL_WIDTH = 20
     VALUE_LABEL_WIDTH = 8
     
-    # Valores del juego
+    # Valores por defecto de cada indicador (el escenario puede declarar otros)
     INITIAL_INDICATOR_VALUE = 50
-    MAX_PHASES = 5
     CRITICAL_THRESHOLD = 20
+    WARNING_THRESHOLD = 50
     FAILURE_THRESHOLD = 5
+    INDICATOR_WEIGHT = 1.0
 
 class GameConfig:
     """Configuración del juego"""
     
-    INITIAL_INDICATORS = {
-        IndicatorType.LIQUIDEZ.value: UIConfig.INITIAL_INDICATOR_VALUE,
-        IndicatorType.RENTABILIDAD.value: UIConfig.INITIAL_INDICATOR_VALUE,
-        IndicatorType.REPUTACION.value: UIConfig.INITIAL_INDICATOR_VALUE,
-        IndicatorType.RIESGO_ACUMULADO.value: UIConfig.INITIAL_INDICATOR_VALUE,
-        IndicatorType.SOSTENIBILIDAD_ESTRATEGICA.value: UIConfig.INITIAL_INDICATOR_VALUE
-    }
\ No newline at end of file
+    # Autoguardado (recuperación tras apagones en los equipos de laboratorio)
+    AUTOSAVE_FILE = os.path.join(os.path.expanduser('~'), '.rincon_de_amaru', 'autosave.json')
+    AUTOSAVE_BATCH_DELAY = 0.25  # Segundos para agrupar guardados consecutivos en una sola escritura
+    
+    # Recarga en caliente de phases.json (modo --watch para autores de contenido)
+    HOT_RELOAD_INTERVAL_MS = 500
+    
+    # Almacén local de resultados (SQLite)
+    RESULTS_DB = os.path.join(os.path.expanduser('~'), '.rincon_de_amaru', 'results.db')
+    RESULTS_BATCH_SIZE = 500       # Filas máximas por transacción
+    RESULTS_FLUSH_INTERVAL = 1.0   # Segundos máximos que una fila espera en la cola
+    RESULTS_RETRY_DELAY = 0.5      # Espera inicial antes de reintentar un lote fallido (se duplica hasta 30 s)
+    RESULTS_CLOSE_RETRIES = 3      # Intentos finales al cerrar antes de dar el lote por perdido
+    
+    # Sesiones del servicio de juego (logic.session_manager): las inactivas se guardan en disco
+    SESSIONS_DB = os.path.join(os.path.expanduser('~'), '.rincon_de_amaru', 'sessions.db')
+    MAX_ACTIVE_SESSIONS = 500        # Motores en memoria antes de guardar en disco los menos usados
+    SESSION_IDLE_SECONDS = 300       # Inactividad tras la cual una sesión sale de memoria
+    SESSION_SWEEP_INTERVAL = 15      # Segundos entre barridos de sesiones inactivas
+    SESSION_RETENTION_DAYS = 30      # Sesiones guardadas sin uso que se borran del disco
+
+    # Tabla de transposición de resultados compartida entre sesiones
+    OUTCOME_CACHE_SIZE = 200_000  # Estados máximos antes de desalojar los menos usados
+    OUTCOME_SEARCH_DEPTH = 8      # Fases hacia adelante que explora la búsqueda antes de estimar
+    OUTCOME_SEARCH_NODES = 5_000  # Estados expandidos como máximo por búsqueda
+    PREVIEW_SEARCH_NODES = 1_500  # Tope por proyección de opción (responde al pasar el mouse)
+    
+    # Versiones de escenario direccionadas por contenido (logic.scenario_versions)
+    SCENARIO_VERSIONS_DIR = os.path.join(os.path.expanduser('~'), '.rincon_de_amaru', 'scenarios')
+    SCENARIO_VERSION_CACHE_SIZE = 8  # Escenarios compilados en memoria antes de desalojar
+    SCENARIO_VERSIONS_MAX = 100      # Versiones en disco; al superarlo se borran las de uso más antiguo
+    
+    # Evaluador de caminos del ajuste de balance (logic.path_evaluator)
+    PATH_EVALUATOR_STATES = 200_000  # Estados (fase, historial, indicadores) por evaluación antes de abortar
+    
+    # Tabla precalculada de opciones disponibles por fase (logic.availability_table)
+    AVAILABILITY_TABLE_LIMIT = 50_000  # Estados máximos recorridos; después se tabulan todas las combinaciones
@@ -0,0 +1,156 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+from config.settings import GameConfig
+
+class AutosaveManager:
+    """Guarda la partida en segundo plano con escrituras atómicas (escribir y renombrar).
+
+    Los guardados se encolan sin bloquear el hilo de la interfaz; el hilo escritor agrupa
+    los que llegan dentro de AUTOSAVE_BATCH_DELAY y escribe solo el más reciente.
+    """
+
+    _DELETE = object()  # Marcador para borrar el autoguardado
+
+    def __init__(self, path: str = None, batch_delay: float = None):
+        self.path = path or GameConfig.AUTOSAVE_FILE
+        self.batch_delay = GameConfig.AUTOSAVE_BATCH_DELAY if batch_delay is None else batch_delay
+        self._condition = threading.Condition()
+        self._pending = None      # Último snapshot pendiente (o _DELETE)
+        self._busy = False        # El escritor está procesando un lote
+        self._closed = False
+        self._flushing = False    # Alguien espera en flush(): no demorar el lote
+        self._thread = threading.Thread(target=self._writer_loop, name='autosave', daemon=True)
+        self._thread.start()
+
+    def save(self, snapshot: Dict) -> None:
+        """Encola un snapshot para guardarlo; reemplaza a cualquier otro aún no escrito"""
+        with self._condition:
+            self._pending = snapshot
+            self._condition.notify()
+
+    def clear(self) -> None:
+        """Encola el borrado del autoguardado (partida terminada o nueva partida)"""
+        with self._condition:
+            self._pending = self._DELETE
+            self._condition.notify()
+
+    def load(self, timeout: float = 2.0) -> Optional[Dict]:
+        """Lee el autoguardado del disco; retorna None si no existe o está dañado"""
+        with self._condition:
+            # Un guardado o borrado que el escritor ya tomó pero no terminó cambiará el disco
+            self._condition.wait_for(lambda: self._pending is not None or not self._busy, timeout=timeout)
+            # Un guardado o borrado aún no escrito es más reciente que el disco
+            if self._pending is self._DELETE:
+                return None
+            if self._pending is not None:
+                return self._pending
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Autoguardado ilegible, se ignora: {e}")
+            return None
+
+        if not isinstance(snapshot, dict) or snapshot.get('version') != 1:
+            print("⚠️ Autoguardado con formato desconocido, se ignora")
+            return None
+        return snapshot
+
+    def flush(self, timeout: float = 2.0) -> bool:
+        """Espera a que se escriban los guardados pendientes (al cerrar el juego)"""
+        with self._condition:
+            self._flushing = True
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(
+                    lambda: self._pending is None and not self._busy, timeout=timeout
+                )
+            finally:
+                self._flushing = False
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        self.flush(timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _writer_loop(self):
+        """Hilo escritor: agrupa los guardados y escribe solo el último de cada lote"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None and self._closed:
+                    return
+                self._busy = True
+                # Dar tiempo a que lleguen más guardados y quedarse con el último
+                deadline = time.monotonic() + self.batch_delay
+                while not (self._closed or self._flushing):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                pending, self._pending = self._pending, None
+
+            try:
+                if pending is self._DELETE:
+                    self._delete()
+                elif pending is not None:
+                    self._write_atomic(pending)
+            except OSError as e:
+                print(f"⚠️ Error en autoguardado: {e}")
+            except Exception as e:
+                # P. ej. un snapshot no serializable: se descarta ese guardado, el hilo sigue vivo
+                print(f"⚠️ Autoguardado descartado ({type(e).__name__}): {e}")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write_atomic(self, snapshot: Dict) -> None:
+        """Escribe en un archivo temporal del mismo directorio, sincroniza y renombra"""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix='.autosave-', suffix='.tmp', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump(snapshot, file, ensure_ascii=False)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._fsync_directory(directory)
+
+    def _delete(self) -> None:
+        """Borra el autoguardado si existe"""
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            return
+        self._fsync_directory(os.path.dirname(self.path) or '.')
+
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        """Sincroniza el directorio para que el renombrado sobreviva a un apagón (POSIX)"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
@@ -1,7 +1,10 @@
 import json
 import os
-from typing import List, Dict
+import time
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from config.settings import IndicatorType, UIConfig
+from data.scenario_archive import ARCHIVE_EXTENSION, ArchiveError, ScenarioArchive, phase_digest
 
 @dataclass
 class Decision:
@@ -23,57 +26,238 @@ class Phase:
     title: str
     question: str
     decisions: List[Decision]
+    context: str = ""
+
+@dataclass(frozen=True)
+class IndicatorSpec:
+    """Declaración de un indicador del escenario: valor inicial, umbrales y peso en el puntaje"""
+    name: str
+    emoji: str = ""
+    description: str = ""
+    initial: float = UIConfig.INITIAL_INDICATOR_VALUE
+    critical: float = UIConfig.CRITICAL_THRESHOLD   # Bajo este valor: CRÍTICO (alerta al jugador)
+    warning: float = UIConfig.WARNING_THRESHOLD     # Bajo este valor: ALERTA
+    failure: float = UIConfig.FAILURE_THRESHOLD     # Bajo este valor: fin del juego
+    weight: float = UIConfig.INDICATOR_WEIGHT
+
+def default_indicator_specs() -> List[IndicatorSpec]:
+    """Indicadores del juego original, para escenarios que no declaran los suyos"""
+    return [IndicatorSpec(name=indicator.value) for indicator in IndicatorType]
+
+def parse_indicator_specs(indicators_json: Dict) -> List[IndicatorSpec]:
+    """Convierte la sección 'indicators' del escenario en IndicatorSpec, en el orden declarado"""
+    if not indicators_json:
+        return default_indicator_specs()
+    
+    specs = []
+    for name, data in indicators_json.items():
+        data = data or {}
+        spec = IndicatorSpec(
+            name=name,
+            emoji=data.get('emoji', ''),
+            description=data.get('description', ''),
+            initial=float(data.get('initial', UIConfig.INITIAL_INDICATOR_VALUE)),
+            critical=float(data.get('critical', UIConfig.CRITICAL_THRESHOLD)),
+            warning=float(data.get('warning', UIConfig.WARNING_THRESHOLD)),
+            failure=float(data.get('failure', UIConfig.FAILURE_THRESHOLD)),
+            weight=float(data.get('weight', UIConfig.INDICATOR_WEIGHT))
+        )
+        if not spec.failure <= spec.critical <= spec.warning:
+            raise ValueError(f"indicador '{name}': se requiere failure <= critical <= warning")
+        if spec.weight < 0:
+            raise ValueError(f"indicador '{name}': el peso no puede ser negativo")
+        specs.append(spec)
+    
+    if not any(spec.weight for spec in specs):
+        raise ValueError("al menos un indicador debe tener peso mayor a 0")
+    return specs
 
 class DataManager:
     """Gestiona la carga y manejo de datos del juego"""
     
-    def __init__(self):
+    def __init__(self, data_path: str = None):
+        self.data_path = data_path or os.path.join(os.path.dirname(__file__), 'phases.json')
         self.phases_data = None
+        self.game_intro = {}
+        self.indicator_specs = default_indicator_specs()
+        self._file_signature = None   # (mtime_ns, tamaño) del último archivo cargado
+        self._phase_digests = {}      # id de fase -> (hash del JSON de la fase, Phase)
+        self._archive = None          # ScenarioArchive del archivo cargado (solo .scn)
         self._load_phases()
     
     def _load_phases(self) -> None:
-        """Carga las fases desde el archivo JSON"""
+        """Carga las fases desde el archivo JSON o desde un archivo de escenario .scn"""
+        archive = None
         try:
-            data_path = os.path.join(os.path.dirname(__file__), 'phases.json')
-            with open(data_path, 'r', encoding='utf-8') as file:
-                data = json.load(file)
-                self.phases_data = self._parse_phases(data['phases'])
+            signature = self._get_file_signature()
+            self.game_intro, indicators_json, phases_json, archive = self._read_source()
+            self.indicator_specs = parse_indicator_specs(indicators_json)
+            self.phases_data = self._parse_phases(phases_json)
+            self._file_signature = signature
+            self._archive, archive = archive, None
         except FileNotFoundError:
             print("⚠️ Archivo phases.json no encontrado. Usando datos por defecto.")
             self.phases_data = self._get_default_phases()
         except json.JSONDecodeError as e:
             print(f"⚠️ Error al parsear JSON: {e}. Usando datos por defecto.")
             self.phases_data = self._get_default_phases()
+        except ArchiveError as e:
+            print(f"⚠️ Archivo de escenario inválido: {e}. Usando datos por defecto.")
+            self.indicator_specs = default_indicator_specs()
+            self.phases_data = self._get_default_phases()
+        except ValueError as e:
+            print(f"⚠️ Indicadores inválidos: {e}. Usando datos por defecto.")
+            self.indicator_specs = default_indicator_specs()
+            self.phases_data = self._get_default_phases()
+        finally:
+            if archive is not None:
+                archive.close()   # La carga falló: no queda nada que lea de este archivo
+    
+    def _read_source(self) -> Tuple[Dict, Dict, List[Dict], Optional[ScenarioArchive]]:
+        """Lee (game_intro, indicadores, fases, archivo .scn o None) según el formato.
+        
+        Desde un archivo .scn los textos narrativos llegan como LazyText y solo se
+        decodifican cuando una pantalla los muestra; quien llama conserva el archivo
+        mientras use esos datos y lo cierra al reemplazarlos.
+        """
+        if self.data_path.endswith(ARCHIVE_EXTENSION):
+            archive = ScenarioArchive(self.data_path)
+            return archive.game_intro, archive.indicators, archive.phases, archive
+        
+        with open(self.data_path, 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        return data.get('game_intro', {}), data.get('indicators', {}), data['phases'], None
+    
+    def close(self) -> None:
+        """Cierra el archivo .scn cargado (los textos ya entregados conservan una copia)"""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+    
+    def _get_file_signature(self):
+        """Retorna (mtime_ns, tamaño) del archivo de fases para detectar cambios"""
+        stat = os.stat(self.data_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    @staticmethod
+    def _phase_digest(phase_data: Dict) -> str:
+        """Hash del contenido de una fase (precalculado en los archivos .scn)"""
+        return phase_data.get('$digest') or phase_digest(phase_data)
     
     def _parse_phases(self, phases_json: List[Dict]) -> List[Phase]:
         """Convierte los datos JSON en objetos Phase"""
         phases = []
+        self._phase_digests = {}
         for phase_data in phases_json:
-            decisions = []
-            for dec in phase_data['decisions']:
-                decision = Decision(
-                    id=dec['id'],
-                    text=dec['text'],
-                    effects=dec['effects'],
-                    description=dec['description'],
-                    strategy_type=dec.get('strategy_type', ''),
-                    unlocks=dec.get('unlocks'),
-                    requires=dec.get('requires'),
-                    synergy_with=dec.get('synergy_with'),
-                    synergy_bonus=dec.get('synergy_bonus')
-                )
-                decisions.append(decision)
-            
-            phase = Phase(
-                id=phase_data['id'],
-                title=phase_data['title'],
-                question=phase_data['question'],
-                decisions=decisions
-            )
+            phase = self._parse_phase(phase_data)
+            self._phase_digests[phase.id] = (self._phase_digest(phase_data), phase)
             phases.append(phase)
         
         return phases
     
+    def _parse_phase(self, phase_data: Dict) -> Phase:
+        """Convierte los datos JSON de una fase en un objeto Phase"""
+        decisions = []
+        for dec in phase_data['decisions']:
+            decision = Decision(
+                id=dec['id'],
+                text=dec['text'],
+                effects=dec['effects'],
+                description=dec['description'],
+                strategy_type=dec.get('strategy_type', ''),
+                unlocks=dec.get('unlocks'),
+                requires=dec.get('requires'),
+                synergy_with=dec.get('synergy_with'),
+                synergy_bonus=dec.get('synergy_bonus')
+            )
+            decisions.append(decision)
+        
+        return Phase(
+            id=phase_data['id'],
+            title=phase_data['title'],
+            question=phase_data['question'],
+            decisions=decisions,
+            context=phase_data.get('context', '')
+        )
+    
+    def reload_if_changed(self, accept: Callable[[List[Phase], List[IndicatorSpec]], bool] = None
+                          ) -> Optional[List[int]]:
+        """Recarga el archivo de fases si cambió, re-parseando solo las fases modificadas.
+        
+        Si se pasa `accept`, recibe las fases e indicadores nuevos antes del intercambio y
+        puede rechazarlos; el cambio queda pendiente y se vuelve a intentar en la próxima
+        llamada.
+        Retorna los índices de las fases nuevas o modificadas, o None si el archivo no
+        cambió, no se pudo leer o fue rechazado (en ese caso se conservan los datos actuales).
+        """
+        try:
+            signature = self._get_file_signature()
+        except OSError:
+            return None
+        if signature == self._file_signature:
+            return None
+        
+        start = time.perf_counter()
+        archive = None
+        try:
+            game_intro, indicators_json, phases_json, archive = self._read_source()
+            indicator_specs = parse_indicator_specs(indicators_json)
+            changed = self._swap_phases(phases_json, indicator_specs, game_intro, signature, accept)
+        except ArchiveError as e:
+            print(f"⚠️ Archivo de escenario inválido al recargar {os.path.basename(self.data_path)}: {e}. "
+                  f"Se conservan los datos actuales.")
+            changed = None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Probablemente el archivo está a medio guardar: reintentar en el próximo cambio
+            print(f"⚠️ No se pudo recargar {os.path.basename(self.data_path)}: {e}. Se conservan los datos actuales.")
+            changed = None
+        if changed is None:
+            if archive is not None:
+                archive.close()
+            return None
+        
+        # Las fases sin cambios siguen leyendo textos del archivo anterior: al cerrarlo se copian
+        previous, self._archive = self._archive, archive
+        if previous is not None:
+            previous.close()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"♻️ phases.json recargado en {elapsed_ms:.1f} ms - fases modificadas: {[i + 1 for i in changed]}")
+        return changed
+    
+    def _swap_phases(self, phases_json: List[Dict], indicator_specs: List[IndicatorSpec], game_intro: Dict,
+                     signature: Tuple, accept: Callable = None) -> Optional[List[int]]:
+        """Reemplaza las fases reutilizando las que no cambiaron; None si alguna es inválida o se rechaza"""
+        new_phases = []
+        new_digests = {}
+        changed = []
+        try:
+            for index, phase_data in enumerate(phases_json):
+                digest = self._phase_digest(phase_data)
+                previous = self._phase_digests.get(phase_data['id'])
+                if previous is not None and previous[0] == digest:
+                    phase = previous[1]
+                else:
+                    phase = self._parse_phase(phase_data)
+                    changed.append(index)
+                new_digests[phase.id] = (digest, phase)
+                new_phases.append(phase)
+        except (KeyError, TypeError) as e:
+            print(f"⚠️ Fase inválida en phases.json: {e}. Se conservan los datos actuales.")
+            return None
+        
+        if len(new_phases) != len(self.phases_data) or indicator_specs != self.indicator_specs:
+            changed = list(range(len(new_phases)))
+        if accept is not None and not accept(new_phases, indicator_specs):
+            return None
+        
+        # Intercambio atómico: los lectores ven la lista vieja o la nueva, nunca una mezcla
+        self.phases_data = new_phases
+        self.indicator_specs = indicator_specs
+        self.game_intro = game_intro
+        self._phase_digests = new_digests
+        self._file_signature = signature
+        return changed
+    
     def _get_default_phases(self) -> List[Phase]:
         """Datos por defecto en caso de error al cargar JSON"""
         # Aquí incluirías una versión simplificada de las fases como fallback
@@ -97,6 +281,18 @@ class DataManager:
         """Retorna todas las fases del juego"""
         return self.phases_data
     
+    def get_game_intro(self) -> Dict:
+        """Retorna la introducción del juego (title, subtitle, story)"""
+        return self.game_intro
+    
+    def get_indicator_specs(self) -> List[IndicatorSpec]:
+        """Retorna los indicadores declarados por el escenario, en su orden fijo"""
+        return self.indicator_specs
+    
+    def get_initial_indicators(self) -> Dict[str, float]:
+        """Retorna los valores iniciales de los indicadores, en el orden declarado"""
+        return {spec.name: spec.initial for spec in self.indicator_specs}
+    
     def get_phase(self, phase_index: int) -> Phase:
         """Retorna una fase específica"""
         if 0 <= phase_index < len(self.phases_data):
@@ -0,0 +1,521 @@
+"""Registro binario compacto de partidas para guardar y repetir millones de sesiones.
+
+Formato (.rpl):
+    cabecera   MAGIC (8 bytes) | huella del escenario compilado (16 bytes) |
+               pasos entre checkpoints (u16, 0 = sin checkpoints) | cantidad de indicadores (u16) |
+               escala (u16) | indicadores iniciales (varints zigzag, valor × escala)
+    registros  largo (varint) | contenido
+
+Contenido de un registro:
+    flags          varint: estado final (bits 0-1), tiene session_id (bit 2), tiene checkpoints (bit 3)
+    decisiones     cantidad (varint) y el índice de la opción dentro de cada fase (varints);
+                   la fase es la posición en la lista
+    session_id     largo (varint) + UTF-8, opcional
+    checkpoints    indicadores tras cada `checkpoint_every` pasos y tras el último paso, como
+                   diferencias con el checkpoint anterior (varints zigzag, valor × escala), opcional
+
+La huella de la cabecera es la versión del escenario (logic.scenario_versions): la
+conversión a JSONL usa esa versión aunque phases.json haya cambiado. Los registros
+solo se agregan al final; un registro incompleto al final del archivo
+(escritura interrumpida) se ignora al leer y se descarta al volver a abrirlo para
+escribir. Con menos de 128 opciones por fase cada decisión ocupa un byte: una
+partida de 5 fases sin checkpoints usa 8 bytes. Si los indicadores iniciales y los
+efectos del escenario son enteros la escala es 1; si no, se guardan centésimas.
+
+Uso:
+    python -m data.replay_log to-jsonl partidas.rpl partidas.jsonl
+    python -m data.replay_log from-jsonl partidas.jsonl partidas.rpl [--checkpoints 2]
+    python -m data.replay_log benchmark --sessions 1000000
+"""
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
+from config.settings import GameState
+
+MAGIC = b'RAMRPL01'
+HEADER = struct.Struct('<8s16sHHH')
+REPLAY_EXTENSION = '.rpl'
+FRACTIONAL_SCALE = 100  # Escenarios con valores no enteros: centésimas
+
+STATUS_CODES = (GameState.PLAYING, GameState.GAME_OVER, GameState.COMPLETED)
+FLAG_STATUS = 0b0011
+FLAG_SESSION = 0b0100
+FLAG_CHECKPOINTS = 0b1000
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Agrega un entero no negativo en formato varint (7 bits por byte)"""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_varint(data, pos: int) -> Tuple[int, int]:
+    """Lee un varint y retorna (valor, posición siguiente)"""
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else (-value << 1) - 1
+
+def _unzigzag(value: int) -> int:
+    return (value >> 1) ^ -(value & 1)
+
+def scenario_scale(scenario) -> int:
+    """Escala de los indicadores: 1 si el escenario solo produce valores enteros"""
+    values = list(scenario.initial_indicators)
+    for options in scenario.phases:
+        for option in options:
+            values.extend(option.effects)
+            values.extend(option.synergy_bonus or ())
+    return 1 if all(float(value).is_integer() for value in values) else FRACTIONAL_SCALE
+
+def checkpoint_steps(decisions: int, checkpoint_every: int) -> List[int]:
+    """Cantidad de pasos tras los que se guarda un checkpoint (siempre incluye el último)"""
+    if not checkpoint_every or not decisions:
+        return []
+    steps = list(range(checkpoint_every, decisions, checkpoint_every))
+    return steps + [decisions]
+
+class ReplayRecord:
+    """Una partida del registro; los checkpoints leídos de un archivo se decodifican al usarlos"""
+    __slots__ = ('choices', 'status', 'session_id', '_checkpoints', '_packed')
+
+    def __init__(self, choices: Sequence[int], status: GameState = GameState.COMPLETED,
+                 session_id: Optional[str] = None, checkpoints: Tuple[Tuple[float, ...], ...] = ()):
+        self.choices = choices              # Índice de la opción dentro de cada fase
+        self.status = status
+        self.session_id = session_id
+        self._checkpoints = checkpoints     # Indicadores en los pasos de checkpoint_steps
+        self._packed = None                 # (bytes, iniciales, pasos entre checkpoints, escala)
+
+    @property
+    def checkpoints(self) -> Tuple[Tuple[float, ...], ...]:
+        if self._packed is not None:
+            self._checkpoints = _decode_checkpoints(len(self.choices), *self._packed)
+            self._packed = None
+        return self._checkpoints
+
+    @property
+    def indicators(self) -> Optional[Tuple[float, ...]]:
+        """Indicadores finales (si el registro tiene checkpoints)"""
+        checkpoints = self.checkpoints
+        return checkpoints[-1] if checkpoints else None
+
+    @classmethod
+    def from_result(cls, result, checkpoint_every: int = 0, session_id: str = None) -> 'ReplayRecord':
+        """Crea un registro a partir de un SimulationResult (logic.simulation)"""
+        outcomes = result.outcomes
+        return cls(
+            choices=tuple(outcome.option_index for outcome in outcomes),
+            status=result.state.status,
+            session_id=session_id,
+            checkpoints=tuple(outcomes[step - 1].indicators
+                              for step in checkpoint_steps(len(outcomes), checkpoint_every))
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ReplayRecord):
+            return NotImplemented
+        return (tuple(self.choices), self.status, self.session_id, self.checkpoints) == \
+               (tuple(other.choices), other.status, other.session_id, other.checkpoints)
+
+    def __repr__(self) -> str:
+        return (f"ReplayRecord(choices={tuple(self.choices)}, status={self.status.value}, "
+                f"session_id={self.session_id!r}, checkpoints={len(self.checkpoints)})")
+
+def encode_record(record: ReplayRecord, initial: Sequence[int], checkpoint_every: int, scale: int) -> bytes:
+    """Codifica un registro con su largo al frente; `initial` ya está multiplicado por la escala"""
+    flags = STATUS_CODES.index(record.status)
+    if record.session_id is not None:
+        flags |= FLAG_SESSION
+    checkpoints = record.checkpoints
+    if checkpoints:
+        flags |= FLAG_CHECKPOINTS
+
+    choices = record.choices
+    body = bytearray((flags,))
+    encode_varint(len(choices), body)
+    if all(choice < 0x80 for choice in choices):
+        body += bytes(choices)
+    else:
+        for choice in choices:
+            encode_varint(choice, body)
+
+    if record.session_id is not None:
+        raw = record.session_id.encode('utf-8')
+        encode_varint(len(raw), body)
+        body += raw
+
+    if checkpoints:
+        if len(checkpoints) != len(checkpoint_steps(len(choices), checkpoint_every)):
+            raise ValueError("La cantidad de checkpoints no coincide con checkpoint_every")
+        previous = initial
+        for checkpoint in checkpoints:
+            current = [round(value * scale) for value in checkpoint]
+            for old, new in zip(previous, current):
+                delta = new - old
+                delta = delta << 1 if delta >= 0 else (-delta << 1) - 1
+                if delta < 0x80:
+                    body.append(delta)
+                else:
+                    encode_varint(delta, body)
+            previous = current
+
+    frame = bytearray()
+    encode_varint(len(body), frame)
+    return bytes(frame + body)
+
+def decode_record(data, pos: int, end: int, initial: Sequence[int], checkpoint_every: int,
+                  scale: int) -> ReplayRecord:
+    """Decodifica el contenido de un registro que ocupa data[pos:end]"""
+    flags, pos = decode_varint(data, pos)
+    count, pos = decode_varint(data, pos)
+    choices = data[pos:pos + count]
+    if choices.isascii():
+        pos += count
+    else:
+        choices = []
+        for _ in range(count):
+            choice, pos = decode_varint(data, pos)
+            choices.append(choice)
+
+    session_id = None
+    if flags & FLAG_SESSION:
+        length, pos = decode_varint(data, pos)
+        session_id = bytes(data[pos:pos + length]).decode('utf-8')
+        pos += length
+
+    record = ReplayRecord(choices, STATUS_CODES[flags & FLAG_STATUS], session_id)
+    if flags & FLAG_CHECKPOINTS:
+        record._packed = (bytes(data[pos:end]), initial, checkpoint_every, scale)
+    elif pos != end:
+        raise ValueError("Registro de partida corrupto")
+    return record
+
+def _decode_checkpoints(decisions: int, data: bytes, initial: Sequence[int], checkpoint_every: int,
+                        scale: int) -> Tuple[Tuple[float, ...], ...]:
+    """Decodifica la sección de checkpoints de un registro"""
+    checkpoints = []
+    previous = initial
+    pos = 0
+    for _ in checkpoint_steps(decisions, checkpoint_every):
+        current = []
+        for old in previous:
+            delta = data[pos]
+            if delta < 0x80:
+                pos += 1
+            else:
+                delta, pos = decode_varint(data, pos)
+            current.append(old + ((delta >> 1) ^ -(delta & 1)))
+        checkpoints.append(tuple([value / scale for value in current]))
+        previous = current
+    if pos != len(data):
+        raise ValueError("Registro de partida corrupto")
+    return tuple(checkpoints)
+
+def _pack_header(fingerprint: bytes, checkpoint_every: int, scale: int, initial: Sequence[int]) -> bytes:
+    header = bytearray(HEADER.pack(MAGIC, fingerprint, checkpoint_every, len(initial), scale))
+    for value in initial:
+        encode_varint(_zigzag(value), header)
+    return bytes(header)
+
+class ReplayReader:
+    """Lector de registros .rpl mediante mmap"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"Registro de partidas truncado: {path}")
+        magic, self.fingerprint, self.checkpoint_every, indicator_count, self.scale = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"No es un registro de partidas válido: {path}")
+
+        pos = HEADER.size
+        initial = []
+        for _ in range(indicator_count):
+            value, pos = decode_varint(self._mm, pos)
+            initial.append(_unzigzag(value))
+        self.initial = tuple(initial)       # Multiplicados por la escala
+        self.data_offset = pos
+
+    @property
+    def version(self) -> str:
+        """Versión del escenario con el que se jugaron las partidas (logic.scenario_versions)"""
+        return self.fingerprint.hex()
+
+    def _frames(self) -> Iterator[Tuple[int, int]]:
+        """(inicio, fin) del contenido de cada registro completo"""
+        data = self._mm
+        size = len(data)
+        pos = self.data_offset
+        while pos < size:
+            length = data[pos]
+            if length < 0x80:
+                start = pos + 1
+            else:
+                try:
+                    length, start = decode_varint(data, pos)
+                except IndexError:
+                    return
+            end = start + length
+            if end > size:
+                return   # Registro incompleto: escritura interrumpida
+            yield start, end
+            pos = end
+
+    def __iter__(self) -> Iterator[ReplayRecord]:
+        for start, end in self._frames():
+            yield decode_record(self._mm, start, end, self.initial, self.checkpoint_every, self.scale)
+
+    def iter_choices(self) -> Iterator[Sequence[int]]:
+        """Solo las decisiones de cada partida (bytes cuando todas caben en un byte)"""
+        data = self._mm
+        for start, end in self._frames():
+            count = data[start + 1]
+            if count < 0x80:
+                choices = data[start + 2:start + 2 + count]
+                if choices.isascii():
+                    yield choices
+                    continue
+            yield decode_record(data, start, end, self.initial, self.checkpoint_every, self.scale).choices
+
+    def valid_end(self) -> int:
+        """Offset donde termina el último registro completo"""
+        end = self.data_offset
+        for _, end in self._frames():
+            pass
+        return end
+
+    def close(self) -> None:
+        """Libera el mapeo en memoria"""
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class ReplayWriter:
+    """Agrega partidas al final de un registro .rpl (lo crea con la cabecera si no existe)"""
+
+    def __init__(self, path: str, scenario, checkpoint_every: int = 0):
+        self.path = path
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with ReplayReader(path) as reader:
+                if reader.fingerprint != scenario.fingerprint:
+                    raise ValueError(f"El registro {path} pertenece a otro escenario")
+                self.checkpoint_every = reader.checkpoint_every
+                self.scale = reader.scale
+                self.initial = reader.initial
+                valid_end = reader.valid_end()
+            self._file = open(path, 'r+b')
+            self._file.truncate(valid_end)     # Descarta un registro incompleto
+            self._file.seek(valid_end)
+        else:
+            self.checkpoint_every = checkpoint_every
+            self.scale = scenario_scale(scenario)
+            self.initial = tuple(round(value * self.scale) for value in scenario.initial_indicators)
+            self._file = open(path, 'wb')
+            self._file.write(_pack_header(scenario.fingerprint, checkpoint_every, self.scale, self.initial))
+        self.written = 0
+
+    def append(self, record: ReplayRecord) -> None:
+        self._file.write(encode_record(record, self.initial, self.checkpoint_every, self.scale))
+        self.written += 1
+
+    def append_result(self, result, session_id: str = None) -> None:
+        """Agrega un SimulationResult con los checkpoints configurados"""
+        self.append(ReplayRecord.from_result(result, self.checkpoint_every, session_id))
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def record_to_json(record: ReplayRecord, scenario) -> dict:
+    """Registro -> dict de una línea JSONL con claves isla_X_Y"""
+    line = {
+        'scenario_version': scenario.fingerprint.hex(),
+        'session_id': record.session_id,
+        'path': [scenario.phases[phase_index][choice].key for phase_index, choice in enumerate(record.choices)],
+        'status': record.status.value
+    }
+    if record.checkpoints:
+        line['indicators'] = dict(zip(scenario.indicator_names, record.indicators))
+    return line
+
+def _load_scenario(scenario_path: Optional[str]):
+    """Compila el escenario y registra su versión para poder repetir sus registros más adelante"""
+    # Import local: el formato no depende del motor; solo la CLI compila el escenario
+    from data.data_manager import DataManager
+    from logic.compiled_scenario import CompiledScenario
+    from logic.scenario_versions import get_scenario_versions
+    data_manager = DataManager(scenario_path)
+    scenario = CompiledScenario.from_phases(data_manager.get_phases(), data_manager.get_indicator_specs())
+    get_scenario_versions().register(scenario)
+    return scenario
+
+def _scenario_version(version: str, current):
+    """Escenario compilado de una versión: el actual o uno guardado en logic.scenario_versions"""
+    if version is None or version == current.fingerprint.hex():
+        return current
+    from logic.scenario_versions import get_scenario_versions
+    try:
+        return get_scenario_versions().get(version)
+    except KeyError:
+        raise ValueError(f"Versión de escenario desconocida: {version}") from None
+
+def _first_jsonl_version(jsonl_path: str) -> Optional[str]:
+    with open(jsonl_path, 'r', encoding='utf-8') as source:
+        for line in source:
+            if line.strip():
+                return json.loads(line).get('scenario_version')
+    return None
+
+def log_versions(path: str) -> Set[str]:
+    """Versiones de escenario que usa un registro (.rpl o JSONL); logic.scenario_versions las conserva"""
+    if path.endswith(REPLAY_EXTENSION):
+        with ReplayReader(path) as reader:
+            return {reader.version}
+    versions = set()
+    with open(path, 'r', encoding='utf-8') as source:
+        for line in source:
+            if line.strip():
+                version = json.loads(line).get('scenario_version')
+                if version:
+                    versions.add(version)
+    return versions
+
+def to_jsonl(replay_path: str, output_path: str, scenario) -> int:
+    """Convierte un registro .rpl a JSONL; retorna la cantidad de partidas"""
+    count = 0
+    with ReplayReader(replay_path) as reader, open(output_path, 'w', encoding='utf-8') as output:
+        if reader.fingerprint != scenario.fingerprint:
+            raise ValueError(f"El registro {replay_path} pertenece a otro escenario")
+        for record in reader:
+            output.write(json.dumps(record_to_json(record, scenario), ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def from_jsonl(jsonl_path: str, replay_path: str, scenario, checkpoint_every: int = 0) -> int:
+    """Convierte JSONL (session_id, path) a .rpl repitiendo cada partida; retorna la cantidad"""
+    from logic.simulation import simulate
+
+    count = 0
+    with open(jsonl_path, 'r', encoding='utf-8') as source, \
+            ReplayWriter(replay_path, scenario, checkpoint_every) as writer:
+        for line_number, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            version = data.get('scenario_version')
+            if version is not None and version != scenario.fingerprint.hex():
+                raise ValueError(f"{jsonl_path}:{line_number}: partida de otra versión del escenario "
+                                 f"({version}); un registro .rpl guarda una sola versión")
+            try:
+                result = simulate(scenario, data['path'])
+            except ValueError as e:
+                raise ValueError(f"{jsonl_path}:{line_number}: {e}") from None
+            writer.append_result(result, data.get('session_id'))
+            count += 1
+    return count
+
+def benchmark(scenario, sessions: int, checkpoint_every: int, path: str) -> dict:
+    """Mide tamaño y velocidad de codificación y decodificación con partidas al azar"""
+    import random
+    from logic.simulation import SimulationResult, available_choices, initial_state, step
+
+    rng = random.Random(0)
+    pool = []
+    for _ in range(min(sessions, 2000)):
+        state, outcomes = initial_state(scenario), []
+        while not state.finished:
+            state, outcome = step(scenario, state, rng.randrange(len(available_choices(scenario, state))))
+            outcomes.append(outcome)
+        result = SimulationResult(state, tuple(outcomes), scenario.score(state.indicators))
+        pool.append(ReplayRecord.from_result(result, checkpoint_every))
+
+    if os.path.exists(path):
+        os.unlink(path)
+    started = time.perf_counter()
+    with ReplayWriter(path, scenario, checkpoint_every) as writer:
+        for i in range(sessions):
+            writer.append(pool[i % len(pool)])
+    encoded = time.perf_counter()
+    with ReplayReader(path) as reader:
+        decoded_count = sum(1 for _ in reader)
+        decoded = time.perf_counter()
+        choices_count = sum(1 for _ in reader.iter_choices())
+        choices_done = time.perf_counter()
+    return {
+        'sessions': sessions,
+        'bytes': os.path.getsize(path),
+        'encode_per_second': sessions / (encoded - started),
+        'decode_per_second': decoded_count / (decoded - encoded),
+        'choices_per_second': choices_count / (choices_done - decoded)
+    }
+
+def main(argv: List[str]) -> int:
+    """Convierte registros de partidas entre .rpl y JSONL o mide su rendimiento"""
+    parser = argparse.ArgumentParser(description="Registro binario compacto de partidas")
+    parser.add_argument('command', choices=('to-jsonl', 'from-jsonl', 'benchmark'))
+    parser.add_argument('paths', nargs='*', help="entrada y salida")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--checkpoints', type=int, default=0,
+                        help="pasos entre checkpoints de indicadores (0 = sin checkpoints)")
+    parser.add_argument('--sessions', type=int, default=1_000_000, help="partidas para benchmark")
+    args = parser.parse_intermixed_args(argv)
+
+    scenario = _load_scenario(args.scenario)
+    try:
+        if args.command == 'benchmark':
+            path = args.paths[0] if args.paths else f"/tmp/benchmark{REPLAY_EXTENSION}"
+            stats = benchmark(scenario, args.sessions, args.checkpoints, path)
+            print(f"💾 {stats['sessions']:,} partidas en {stats['bytes'] / 1_000_000:.1f} MB "
+                  f"({stats['bytes'] / stats['sessions']:.1f} bytes por partida)")
+            print(f"⚡ Codificación: {stats['encode_per_second']:,.0f} partidas/s")
+            print(f"⚡ Decodificación: {stats['decode_per_second']:,.0f} partidas/s "
+                  f"(solo decisiones: {stats['choices_per_second']:,.0f} partidas/s)")
+            return 0
+
+        if len(args.paths) != 2:
+            parser.error("se necesitan un archivo de entrada y uno de salida")
+        source, output = args.paths
+        # Cada registro se interpreta con la versión del escenario con la que se jugó
+        if args.command == 'to-jsonl':
+            with ReplayReader(source) as reader:
+                version = reader.version
+            count = to_jsonl(source, output, _scenario_version(version, scenario))
+        else:
+            version = _first_jsonl_version(source)
+            count = from_jsonl(source, output, _scenario_version(version, scenario), args.checkpoints)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ {count:,} partidas convertidas: {output} ({os.path.getsize(output):,} bytes)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,334 @@
+"""Almacén local de resultados y tabla de posiciones (SQLite en modo WAL).
+
+Las partidas terminadas se encolan sin bloquear a quien las registra; un hilo
+escritor las inserta por lotes en una sola transacción. Si la base está bloqueada
+o falla el disco, el lote queda pendiente y se reintenta. Los índices por cohorte y
+por escenario permiten obtener el top-N rápidamente aun con millones de filas.
+
+Uso:
+    python -m data.results_store --top 10 [--cohort 2025-A] [--scenario phases.json]
+"""
+import argparse
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterator, List
+from config.settings import GameConfig
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    cohort TEXT NOT NULL DEFAULT '',
+    scenario TEXT NOT NULL DEFAULT '',
+    scenario_version TEXT,
+    session_id TEXT,
+    path TEXT NOT NULL,
+    indicators TEXT NOT NULL,
+    avg_score REAL NOT NULL,
+    category TEXT NOT NULL,
+    game_over INTEGER NOT NULL DEFAULT 0,
+    started_at REAL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_score ON results (game_over, avg_score DESC);
+CREATE INDEX IF NOT EXISTS idx_results_cohort_score ON results (cohort, game_over, avg_score DESC);
+CREATE INDEX IF NOT EXISTS idx_results_scenario_score ON results (scenario, game_over, avg_score DESC);
+"""
+
+INSERT = """
+INSERT INTO results (cohort, scenario, scenario_version, session_id, path, indicators,
+                     avg_score, category, game_over, started_at, finished_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Columnas agregadas después de la primera versión del esquema
+MIGRATIONS = (
+    ('scenario_version', "ALTER TABLE results ADD COLUMN scenario_version TEXT"),
+)
+
+# Índices sobre columnas migradas: se crean cuando la columna ya existe
+MIGRATION_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_results_version_cohort ON results (scenario_version, cohort);
+"""
+
+class ResultsStore:
+    """Registro de partidas terminadas con escritura por lotes en segundo plano"""
+
+    _STOP = object()
+
+    def __init__(self, path: str = None, batch_size: int = None, flush_interval: float = None):
+        self.path = path or GameConfig.RESULTS_DB
+        self.batch_size = batch_size or GameConfig.RESULTS_BATCH_SIZE
+        self.flush_interval = GameConfig.RESULTS_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = self._connect()
+        try:
+            connection.executescript(SCHEMA)
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(results)")}
+            for column, statement in MIGRATIONS:
+                if column not in columns:
+                    connection.execute(statement)
+            connection.commit()
+            connection.executescript(MIGRATION_INDEXES)
+        finally:
+            connection.close()
+
+        self._lock = threading.Lock()
+        self._closed = False
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer_loop, name='results-writer', daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Abre una conexión en modo WAL (lectores y escritor no se bloquean entre sí)"""
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record(self, results: Dict, cohort: str = '', scenario: str = '',
+               session_id: str = None) -> None:
+        """Encola una partida terminada (resultado de GameEngine.get_final_results).
+
+        RuntimeError si el almacén ya se cerró: la fila no llegaría a escribirse.
+        """
+        row = (
+            cohort or '',
+            scenario or '',
+            results.get('scenario_version'),
+            session_id,
+            ','.join(results.get('path', [])),
+            json.dumps(results['indicators'], ensure_ascii=False),
+            float(results['avg_score']),
+            results['category'],
+            1 if results.get('game_over') else 0,
+            results.get('started_at'),
+            results.get('finished_at') or time.time()
+        )
+        self._put(row)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Espera a que se escriban todas las partidas encoladas (False si siguen pendientes)"""
+        done = threading.Event()
+        self._put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Escribe lo pendiente y detiene el hilo escritor"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put_nowait(self._STOP)
+        self._thread.join(timeout)
+
+    def _put(self, item) -> None:
+        """Encola bajo el lock: nada entra a la cola después de la marca de cierre"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("El almacén de resultados está cerrado")
+            self._queue.put_nowait(item)
+
+    def _writer_loop(self):
+        """Hilo escritor: junta filas hasta batch_size o flush_interval y las inserta juntas.
+
+        Si la escritura falla, el lote (y quienes esperan en flush) queda pendiente y se
+        reintenta con una conexión nueva y espera creciente; las filas que llegan
+        mientras tanto se suman al lote.
+        """
+        connection = None
+        batch, events, stop = [], [], False
+        retry_delay, retry_at, close_attempts = 0.0, None, 0
+        try:
+            while True:
+                if not stop:
+                    timeout = None if retry_at is None else max(0.0, retry_at - time.monotonic())
+                    try:
+                        item = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        item = None
+                    deadline = time.monotonic() + self.flush_interval
+                    while item is not None:
+                        if item is self._STOP:
+                            stop = True
+                        elif isinstance(item, threading.Event):
+                            events.append(item)
+                        else:
+                            batch.append(item)
+                        if stop or events or len(batch) >= self.batch_size:
+                            break
+                        try:
+                            item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                        except queue.Empty:
+                            break
+                    if retry_at is not None and not stop and time.monotonic() < retry_at:
+                        continue   # Seguir juntando filas hasta el próximo reintento
+
+                if batch:
+                    try:
+                        if connection is None:
+                            connection = self._connect()
+                        self._write(connection, batch)
+                    except sqlite3.Error as e:
+                        if connection is not None:
+                            connection.close()
+                            connection = None
+                        retry_delay = min(max(retry_delay * 2, GameConfig.RESULTS_RETRY_DELAY), 30.0)
+                        if stop:
+                            close_attempts += 1
+                            if close_attempts >= GameConfig.RESULTS_CLOSE_RETRIES:
+                                print(f"❌ Se pierden {len(batch)} resultados sin guardar al cerrar: {e}")
+                                return
+                            time.sleep(min(retry_delay, 1.0))
+                        else:
+                            print(f"⚠️ Error guardando {len(batch)} resultados, se reintenta en "
+                                  f"{retry_delay:.1f} s: {e}")
+                            retry_at = time.monotonic() + retry_delay
+                        continue
+                    batch, retry_delay, retry_at = [], 0.0, None
+                for event in events:
+                    event.set()
+                events = []
+                if stop:
+                    return
+        finally:
+            if connection is not None:
+                connection.close()
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, batch: List) -> None:
+        """Inserta el lote en una sola transacción.
+
+        Los errores operativos (base bloqueada, disco lleno o ilegible) se propagan para
+        reintentar el lote completo. Si el lote es rechazado por los datos de una fila,
+        se inserta fila por fila en la misma transacción y solo se descartan las inválidas.
+        """
+        try:
+            with connection:
+                connection.executemany(INSERT, batch)
+            return
+        except sqlite3.OperationalError:
+            raise
+        except sqlite3.Error:
+            pass
+        with connection:
+            for row in batch:
+                try:
+                    connection.execute(INSERT, row)
+                except sqlite3.OperationalError:
+                    raise
+                except sqlite3.Error as e:
+                    print(f"⚠️ Resultado descartado por datos inválidos ({e}): {row[4]!r}")
+
+    def top(self, limit: int = 10, cohort: str = None, scenario: str = None) -> List[Dict]:
+        """Mejores partidas completadas, opcionalmente filtradas por cohorte o escenario"""
+        # Un filtro de igualdad por columna indexada + ORDER BY avg_score DESC usa el índice
+        conditions, params = ["game_over = 0"], []
+        if cohort is not None:
+            conditions.append("cohort = ?")
+            params.append(cohort)
+        if scenario is not None:
+            conditions.append("scenario = ?")
+            params.append(scenario)
+        sql = (f"SELECT cohort, scenario, session_id, path, indicators, avg_score, category, "
+               f"started_at, finished_at, scenario_version FROM results WHERE {' AND '.join(conditions)} "
+               f"ORDER BY avg_score DESC LIMIT ?")
+        params.append(limit)
+
+        connection = self._connect()
+        try:
+            rows = connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+        return [
+            {
+                'cohort': row[0],
+                'scenario': row[1],
+                'session_id': row[2],
+                'path': row[3].split(',') if row[3] else [],
+                'indicators': json.loads(row[4]),
+                'avg_score': row[5],
+                'category': row[6],
+                'started_at': row[7],
+                'finished_at': row[8],
+                'scenario_version': row[9]
+            }
+            for row in rows
+        ]
+
+    def paths(self, cohort: str = None, scenario: str = None,
+              scenario_version: str = None) -> Iterator[List[str]]:
+        """Caminos (claves isla_X_Y) de todas las partidas registradas, en orden de registro"""
+        conditions, params = [], []
+        if cohort is not None:
+            conditions.append("cohort = ?")
+            params.append(cohort)
+        if scenario is not None:
+            conditions.append("scenario = ?")
+            params.append(scenario)
+        if scenario_version is not None:
+            conditions.append("scenario_version = ?")
+            params.append(scenario_version)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        connection = self._connect()
+        try:
+            for (path,) in connection.execute(f"SELECT path FROM results{where} ORDER BY id", params):
+                yield path.split(',') if path else []
+        finally:
+            connection.close()
+
+    def scenario_versions(self, cohort: str = None) -> Dict[str, int]:
+        """Cantidad de partidas por versión de escenario ('' si no se registró la versión)"""
+        where, params = ("WHERE cohort = ?", [cohort]) if cohort is not None else ("", [])
+        connection = self._connect()
+        try:
+            return {
+                version or '': count
+                for version, count in connection.execute(
+                    f"SELECT scenario_version, COUNT(*) FROM results {where} "
+                    f"GROUP BY scenario_version ORDER BY COUNT(*) DESC", params)
+            }
+        finally:
+            connection.close()
+
+    def count(self, cohort: str = None, scenario: str = None) -> int:
+        """Cantidad de partidas registradas"""
+        conditions, params = [], []
+        if cohort is not None:
+            conditions.append("cohort = ?")
+            params.append(cohort)
+        if scenario is not None:
+            conditions.append("scenario = ?")
+            params.append(scenario)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        connection = self._connect()
+        try:
+            return connection.execute(f"SELECT COUNT(*) FROM results{where}", params).fetchone()[0]
+        finally:
+            connection.close()
+
+def main(argv: List[str]) -> int:
+    """Muestra la tabla de posiciones"""
+    parser = argparse.ArgumentParser(description="Tabla de posiciones de partidas completadas")
+    parser.add_argument('--db', default=None, help="base de datos de resultados")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--cohort', default=None)
+    parser.add_argument('--scenario', default=None)
+    args = parser.parse_args(argv)
+
+    store = ResultsStore(args.db)
+    for position, row in enumerate(store.top(args.top, args.cohort, args.scenario), 1):
+        print(f"{position:>3}. {row['avg_score']:6.1f}  {row['category']:<14} "
+              f"[{row['cohort'] or '-'}] {' → '.join(row['path'])}")
+    store.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
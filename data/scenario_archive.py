@@ -0,0 +1,242 @@
+"""Archivo de escenarios con índice de offsets, leído mediante mmap.
+
+Formato (.scn):
+    cabecera   MAGIC (8 bytes) | largo del índice (u32) | offset de la sección de textos (u64)
+    índice     JSON UTF-8 con los datos estructurales (ids, efectos, reglas, títulos)
+    textos     cadenas UTF-8 concatenadas; el índice las referencia como [offset, largo]
+
+Los textos narrativos largos (context, description y game_intro.story) solo se
+decodifican cuando una pantalla los muestra, por lo que la memoria residente no
+crece con el tamaño de la biblioteca de escenarios. Al cerrar el archivo (close o
+bloque with), los LazyText que siguen en uso copian su texto antes de liberar el
+mapeo, así que cerrarlo nunca rompe una pantalla que aún los muestra.
+
+Uso:
+    python -m data.scenario_archive data/phases.json data/phases.scn
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import weakref
+from typing import Dict, List, Tuple
+
+MAGIC = b'RAMARU01'
+MAGIC_PREFIX = b'RAMARU'   # Los dos últimos bytes de MAGIC son la versión del formato
+HEADER = struct.Struct('<8sIQ')
+ARCHIVE_EXTENSION = '.scn'
+
+# Campos narrativos que se guardan en la sección de textos
+LAZY_PHASE_FIELDS = ('context',)
+LAZY_DECISION_FIELDS = ('description',)
+LAZY_INTRO_FIELDS = ('story',)
+
+def phase_digest(phase_data: Dict) -> str:
+    """Hash del contenido JSON de una fase, usado para detectar qué fases cambiaron"""
+    raw = json.dumps(phase_data, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+class ArchiveError(ValueError):
+    """Archivo .scn dañado, truncado o de otra versión del formato"""
+
+class LazyText:
+    """Referencia a un texto del archivo que se decodifica solo al convertirlo a str"""
+    __slots__ = ('_archive', '_offset', '_length', '_text', '__weakref__')
+
+    def __init__(self, archive: 'ScenarioArchive', offset: int, length: int):
+        self._archive = archive
+        self._offset = offset
+        self._length = length
+        self._text = None
+
+    def __str__(self) -> str:
+        if self._archive is None:
+            return self._text
+        return self._archive.read_text(self._offset, self._length)
+
+    def _detach(self) -> None:
+        """Copia el texto y suelta el archivo (antes de que este se cierre)"""
+        if self._archive is not None:
+            self._text = self._archive.read_text(self._offset, self._length)
+            self._archive = None
+
+    def __bool__(self) -> bool:
+        return self._length > 0
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, LazyText):
+            return str(self) == str(other)
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __repr__(self) -> str:
+        return f"LazyText(offset={self._offset}, bytes={self._length})"
+
+class _TextSectionBuilder:
+    """Acumula los textos narrativos y retorna su referencia [offset, largo]"""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self._seen = {}  # Textos repetidos se guardan una sola vez
+
+    def add(self, text: str) -> List[int]:
+        if text in self._seen:
+            return self._seen[text]
+        raw = text.encode('utf-8')
+        ref = [self.size, len(raw)]
+        self.chunks.append(raw)
+        self.size += len(raw)
+        self._seen[text] = ref
+        return ref
+
+def _extract_lazy(data: Dict, fields: Tuple[str, ...], texts: _TextSectionBuilder) -> Dict:
+    """Copia un dict reemplazando los campos narrativos por referencias a la sección de textos"""
+    result = dict(data)
+    for field in fields:
+        if field in result and isinstance(result[field], str):
+            result[field] = {'$text': texts.add(result[field])}
+    return result
+
+def build_archive(scenario: Dict, output_path: str) -> None:
+    """Escribe un escenario (estructura de phases.json) en formato .scn de forma atómica"""
+    texts = _TextSectionBuilder()
+    phases = []
+    for phase_data in scenario['phases']:
+        phase = _extract_lazy(phase_data, LAZY_PHASE_FIELDS, texts)
+        phase['decisions'] = [
+            _extract_lazy(decision, LAZY_DECISION_FIELDS, texts)
+            for decision in phase_data['decisions']
+        ]
+        # El hash del JSON original permite la recarga incremental también desde el archivo
+        phase['$digest'] = phase_digest(phase_data)
+        phases.append(phase)
+
+    index = {
+        'game_intro': _extract_lazy(scenario.get('game_intro', {}), LAZY_INTRO_FIELDS, texts),
+        'indicators': scenario.get('indicators', {}),
+        'phases': phases
+    }
+    index_bytes = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    text_offset = HEADER.size + len(index_bytes)
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.scenario-', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, len(index_bytes), text_offset))
+            file.write(index_bytes)
+            for chunk in texts.chunks:
+                file.write(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class ScenarioArchive:
+    """Lector de archivos .scn: índice en memoria, textos bajo demanda a través de mmap.
+
+    Lanza ArchiveError si el archivo está dañado o es de otra versión del formato.
+    Se usa como context manager o se cierra con close().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._texts = weakref.WeakSet()   # LazyText entregados que siguen vivos
+        with open(path, 'rb') as file:
+            try:
+                self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise ArchiveError(f"Archivo de escenario vacío: {path}") from None
+        try:
+            self._load_index()
+        except BaseException:
+            self.close()
+            raise
+
+    def _load_index(self) -> None:
+        path = self.path
+        if len(self._mm) < HEADER.size:
+            raise ArchiveError(f"Archivo de escenario truncado: {path}")
+        magic, index_length, text_offset = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            if magic.startswith(MAGIC_PREFIX):
+                raise ArchiveError(f"Versión de archivo de escenario no soportada "
+                                   f"({magic[len(MAGIC_PREFIX):].decode('ascii', 'replace')}): {path}")
+            raise ArchiveError(f"No es un archivo de escenario válido: {path}")
+        if HEADER.size + index_length > len(self._mm) or text_offset > len(self._mm):
+            raise ArchiveError(f"Archivo de escenario truncado: {path}")
+
+        self._text_offset = text_offset
+        try:
+            index = json.loads(self._mm[HEADER.size:HEADER.size + index_length].decode('utf-8'))
+            self.game_intro = self._resolve(index.get('game_intro', {}))
+            self.indicators = index.get('indicators', {})
+            self.phases = [self._resolve(phase) for phase in index['phases']]
+        except (UnicodeDecodeError, json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+            raise ArchiveError(f"Índice dañado en {path}: {e}") from None
+
+    def _resolve(self, data: Dict) -> Dict:
+        """Reemplaza las referencias {'$text': [offset, largo]} por objetos LazyText"""
+        result = {}
+        for key, value in data.items():
+            if isinstance(value, dict) and '$text' in value:
+                offset, length = value['$text']
+                text = result[key] = LazyText(self, offset, length)
+                self._texts.add(text)
+            elif key == 'decisions':
+                result[key] = [self._resolve(decision) for decision in value]
+            else:
+                result[key] = value
+        return result
+
+    def read_text(self, offset: int, length: int) -> str:
+        """Decodifica un texto de la sección de textos"""
+        start = self._text_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    @property
+    def closed(self) -> bool:
+        return self._mm.closed
+
+    def close(self) -> None:
+        """Libera el mapeo en memoria; los LazyText aún en uso conservan una copia de su texto"""
+        if self._mm.closed:
+            return
+        for text in list(self._texts):
+            text._detach()
+        self._texts.clear()
+        self._mm.close()
+
+    def __enter__(self) -> 'ScenarioArchive':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+def main(argv: List[str]) -> int:
+    """Convierte un phases.json en un archivo .scn"""
+    if len(argv) != 2:
+        print("Uso: python -m data.scenario_archive <phases.json> <salida.scn>")
+        return 2
+
+    source, output = argv
+    with open(source, 'r', encoding='utf-8') as file:
+        scenario = json.load(file)
+    build_archive(scenario, output)
+    print(f"✅ Archivo de escenario creado: {output} ({os.path.getsize(output)} bytes, "
+          f"{len(scenario['phases'])} fases)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,205 @@
+"""Generador de escenarios sintéticos para pruebas de escala y de estrés.
+
+Emite archivos con la misma estructura que phases.json (o .scn) y con cantidad
+configurable de fases, opciones por fase, indicadores y densidad de
+requires/unlocks y sinergias. La misma semilla produce siempre el mismo archivo.
+
+Uso:
+    python -m data.scenario_generator --phases 500 --options 5 --seed 7 --output /tmp/x100.json
+    python -m data.scenario_generator --scale 1000 --output /tmp/x1000.scn
+"""
+import argparse
+import json
+import os
+import random
+import string
+import sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+from config.settings import IndicatorType
+from data.scenario_archive import ARCHIVE_EXTENSION, build_archive
+
+# Tamaño del escenario actual, base para --scale
+BASE_PHASES = 5
+BASE_OPTIONS = 5
+
+_WORDS = (
+    "café cooperativa clientes proveedor mercado precio calidad cultura barrio feria "
+    "delivery competencia margen inversión riesgo contrato temporada comunidad marca "
+    "productores local música arte alquiler personal turno menú cosecha reputación "
+    "crédito alianza estrategia demanda oferta sostenible innovación experiencia"
+).split()
+
+STRATEGY_TYPES = (
+    "🛡️ Estrategia Preventiva",
+    "⚡ Estrategia Reactiva",
+    "🔄 Estrategia Adaptativa",
+    "🚀 Estrategia Proactiva"
+)
+
+@dataclass
+class GeneratorConfig:
+    """Parámetros del escenario sintético"""
+    phases: int = BASE_PHASES
+    options: int = BASE_OPTIONS
+    indicators: int = len(IndicatorType)
+    requires_density: float = 0.15   # Fracción de opciones que requieren una decisión anterior
+    synergy_density: float = 0.15    # Fracción de opciones con sinergia con una decisión anterior
+    max_effect: int = 10
+    effects_per_option: int = 3
+    text_words: int = 80             # Largo aproximado de cada description/context
+    seed: int = 0
+
+def option_id(index: int) -> str:
+    """A, B, ..., Z, AA, AB, ... para fases con muchas opciones"""
+    letters = string.ascii_uppercase
+    result = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        result = letters[remainder] + result
+    return result
+
+def indicator_names(count: int) -> List[str]:
+    """Los indicadores del juego y, si se piden más, indicadores sintéticos"""
+    names = [indicator.value for indicator in IndicatorType][:count]
+    names += [f"Indicador {i + 1}" for i in range(len(names), count)]
+    return names
+
+def _text(rng: random.Random, words: int) -> str:
+    sentence = " ".join(rng.choice(_WORDS) for _ in range(max(words, 1)))
+    return sentence[0].upper() + sentence[1:] + "."
+
+def generate_scenario(config: GeneratorConfig) -> Dict:
+    """Genera un escenario válido y reproducible con la estructura de phases.json"""
+    rng = random.Random(config.seed)
+    names = indicator_names(config.indicators)
+    previous_options = []   # (clave isla_X_Y, dict de la decisión) de fases anteriores
+
+    phases = []
+    for phase_index in range(config.phases):
+        phase_id = phase_index + 1
+        decisions = []
+        for option_index in range(config.options):
+            decision_id = option_id(option_index)
+            key = f"isla_{phase_id}_{decision_id}"
+            chosen = rng.sample(names, min(config.effects_per_option, len(names)))
+            decision = {
+                'id': decision_id,
+                'text': f"{decision_id}) {_text(rng, 6)}",
+                'strategy_type': rng.choice(STRATEGY_TYPES),
+                'effects': {name: rng.randint(-config.max_effect, config.max_effect) or 1 for name in chosen},
+                'description': _text(rng, config.text_words)
+            }
+
+            # La primera opción nunca tiene requisitos: toda fase tiene al menos una opción disponible
+            if option_index > 0 and previous_options and rng.random() < config.requires_density:
+                required = rng.sample(previous_options, min(len(previous_options), rng.choice((1, 1, 1, 2))))
+                keys = [required_key for required_key, _ in required]
+                decision['requires'] = keys[0] if len(keys) == 1 else keys
+                for required_key, required_decision in required:
+                    required_decision.setdefault('unlocks', key)
+
+            if previous_options and rng.random() < config.synergy_density:
+                partner_key, _ = rng.choice(previous_options)
+                decision['synergy_with'] = partner_key
+                decision['synergy_bonus'] = {rng.choice(names): rng.randint(1, max(config.max_effect // 2, 1))}
+
+            decisions.append(decision)
+
+        phases.append({
+            'id': phase_id,
+            'title': f"🏝️ ISLA {phase_id}: {_text(rng, 4)}",
+            'context': _text(rng, config.text_words * 2),
+            'question': f"¿{_text(rng, 8)[:-1]}?",
+            'decisions': decisions
+        })
+        previous_options.extend(
+            (f"isla_{phase_id}_{decision['id']}", decision) for decision in decisions
+        )
+
+    return {
+        'game_intro': {
+            'title': "☕ Escenario sintético ☕",
+            'subtitle': f"{config.phases} fases · {config.options} opciones · semilla {config.seed}",
+            'story': _text(rng, config.text_words * 3)
+        },
+        'indicators': {
+            name: {'emoji': "📊", 'description': _text(rng, 12)} for name in names
+        },
+        'phases': phases
+    }
+
+def validate_scenario(scenario: Dict) -> List[str]:
+    """Verifica ids únicos y que requires/unlocks/synergy_with apunten a opciones existentes"""
+    problems = []
+    keys = set()
+    for phase in scenario['phases']:
+        ids = [decision['id'] for decision in phase['decisions']]
+        if len(ids) != len(set(ids)):
+            problems.append(f"Fase {phase['id']}: ids de opción repetidos")
+        if not any(not decision.get('requires') for decision in phase['decisions']):
+            problems.append(f"Fase {phase['id']}: ninguna opción está siempre disponible")
+        keys.update(f"isla_{phase['id']}_{decision_id}" for decision_id in ids)
+
+    for phase in scenario['phases']:
+        for decision in phase['decisions']:
+            requires = decision.get('requires') or []
+            references = [requires] if isinstance(requires, str) else list(requires)
+            references += [decision[field] for field in ('unlocks', 'synergy_with') if decision.get(field)]
+            for reference in references:
+                if reference not in keys:
+                    problems.append(f"isla_{phase['id']}_{decision['id']}: referencia desconocida {reference}")
+    return problems
+
+def write_scenario(scenario: Dict, output_path: str, compact: bool = False) -> None:
+    """Escribe el escenario como JSON o, si la extensión es .scn, como archivo mmap"""
+    if output_path.endswith(ARCHIVE_EXTENSION):
+        build_archive(scenario, output_path)
+        return
+    with open(output_path, 'w', encoding='utf-8') as file:
+        json.dump(scenario, file, ensure_ascii=False, indent=None if compact else 2)
+
+def main(argv: List[str]) -> int:
+    """Genera un escenario sintético"""
+    parser = argparse.ArgumentParser(description="Generador de escenarios sintéticos")
+    parser.add_argument('--output', required=True, help="archivo de salida (.json o .scn)")
+    parser.add_argument('--scale', type=int, default=None,
+                        help="multiplica la cantidad de fases del escenario actual (p. ej. 100 o 1000)")
+    parser.add_argument('--phases', type=int, default=BASE_PHASES)
+    parser.add_argument('--options', type=int, default=BASE_OPTIONS)
+    parser.add_argument('--indicators', type=int, default=len(IndicatorType))
+    parser.add_argument('--requires-density', type=float, default=0.15)
+    parser.add_argument('--synergy-density', type=float, default=0.15)
+    parser.add_argument('--max-effect', type=int, default=10)
+    parser.add_argument('--text-words', type=int, default=80)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--compact', action='store_true', help="JSON sin sangría")
+    args = parser.parse_args(argv)
+
+    config = GeneratorConfig(
+        phases=args.phases * args.scale if args.scale else args.phases,
+        options=args.options,
+        indicators=args.indicators,
+        requires_density=args.requires_density,
+        synergy_density=args.synergy_density,
+        max_effect=args.max_effect,
+        text_words=args.text_words,
+        seed=args.seed
+    )
+    scenario = generate_scenario(config)
+    problems = validate_scenario(scenario)
+    if problems:
+        for problem in problems[:20]:
+            print(f"❌ {problem}")
+        return 1
+
+    write_scenario(scenario, args.output, compact=args.compact)
+    options = sum(len(phase['decisions']) for phase in scenario['phases'])
+    print(f"✅ Escenario generado: {args.output} ({config.phases} fases, {options} opciones, "
+          f"{config.indicators} indicadores, {os.path.getsize(args.output)} bytes)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+"""Almacén en disco de las sesiones inactivas del servicio de juego (SQLite en modo WAL).
+
+Guarda el snapshot de cada sesión (GameEngine.get_snapshot) por session_id. El
+administrador de sesiones (logic.session_manager) escribe aquí las que saca de
+memoria y las lee al rehidratarlas, de modo que la memoria del servicio no depende
+de cuántas sesiones se guardaron. Las sesiones que nadie retoma en
+SESSION_RETENTION_DAYS se borran con purge.
+
+Uso:
+    python -m data.session_store [--db ~/.rincon_de_amaru/sessions.db] [--purge-days 30]
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from config.settings import GameConfig
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    snapshot TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at);
+"""
+
+UPSERT = """
+INSERT INTO sessions (session_id, snapshot, updated_at) VALUES (?, ?, ?)
+ON CONFLICT (session_id) DO UPDATE SET snapshot = excluded.snapshot, updated_at = excluded.updated_at
+"""
+
+class SessionStore:
+    """Snapshots de sesiones por session_id; seguro para usar desde varios hilos"""
+
+    def __init__(self, path: str = None):
+        self.path = path or GameConfig.SESSIONS_DB
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Una sola conexión compartida: las escrituras son pocas y cortas (una por desalojo)
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def save(self, session_id: str, snapshot: Dict) -> None:
+        self.save_many([(session_id, snapshot)])
+
+    def save_many(self, items: Iterable[Tuple[str, Dict]]) -> int:
+        """Guarda varios snapshots en una sola transacción; retorna cuántos"""
+        now = time.time()
+        rows = [(session_id, json.dumps(snapshot, ensure_ascii=False), now) for session_id, snapshot in items]
+        with self._lock, self._connection:
+            self._connection.executemany(UPSERT, rows)
+        return len(rows)
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        """Snapshot guardado de una sesión, o None si no está en el disco"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT snapshot FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            ).rowcount > 0
+
+    def purge(self, older_than_days: float = None) -> int:
+        """Borra las sesiones sin uso desde hace más de `older_than_days`; retorna cuántas"""
+        days = GameConfig.SESSION_RETENTION_DAYS if older_than_days is None else older_than_days
+        with self._lock, self._connection:
+            return self._connection.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (time.time() - days * 86400,)
+            ).rowcount
+
+    def scenario_versions(self) -> Set[str]:
+        """Versiones de escenario de las sesiones guardadas (logic.scenario_versions las conserva)"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT DISTINCT json_extract(snapshot, '$.scenario_version') FROM sessions"
+            ).fetchall()
+        return {version for version, in rows if version}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+def main(argv: List[str]) -> int:
+    """Muestra cuántas sesiones hay guardadas y opcionalmente borra las viejas"""
+    parser = argparse.ArgumentParser(description="Sesiones inactivas guardadas por el servicio de juego")
+    parser.add_argument('--db', default=None, help="base de sesiones guardadas")
+    parser.add_argument('--purge-days', type=float, default=None, help="borra las sesiones sin uso hace más de N días")
+    args = parser.parse_args(argv)
+
+    store = SessionStore(args.db)
+    if args.purge_days is not None:
+        print(f"🧹 {store.purge(args.purge_days):,} sesiones borradas")
+    print(f"💾 {len(store):,} sesiones guardadas en {store.path}")
+    store.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
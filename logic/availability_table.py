@@ -0,0 +1,217 @@
+"""Tabla precalculada de opciones disponibles por fase.
+
+Las opciones disponibles en una fase dependen solo de cuáles de las decisiones que
+piden sus requires se tomaron antes. Para cada fase el historial se proyecta sobre
+esas claves (una máscara de bits) y la tabla guarda, para cada proyección alcanzable,
+la tupla de opciones disponibles; consultar la disponibilidad es una búsqueda en un
+diccionario. La alcanzabilidad considera solo requires, no el game over.
+
+La construcción recorre las fases hacia adelante guardando de cada historial solo
+las claves que alguna fase posterior todavía pide, de modo que historiales
+equivalentes se cuentan una vez. Si los estados superan GameConfig.AVAILABILITY_TABLE_LIMIT,
+las fases restantes tabulan todas las combinaciones de sus claves requeridas (alcanzables
+o no), que siguen siendo pocas porque cada fase pide pocas claves.
+
+Uso:
+    python -m logic.availability_table [--scenario data/phases.json] [--option isla_4_E]
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+from config.settings import GameConfig
+
+# Claves requeridas máximas por fase para tabular todas sus combinaciones (2^n entradas)
+MAX_LOCAL_KEYS = 10
+
+@dataclass(frozen=True)
+class PhaseAvailability:
+    """Disponibilidad de las opciones de una fase según las claves requeridas tomadas"""
+    required_keys: Tuple[str, ...]          # Claves que piden las opciones (bit i = required_keys[i])
+    table: Dict[int, Tuple[int, ...]]       # Máscara de claves tomadas -> índices de opciones disponibles
+    exact: bool = True                      # False: la tabla incluye combinaciones no alcanzables
+
+    def mask(self, history) -> int:
+        """Proyección del historial sobre las claves requeridas de la fase"""
+        mask = 0
+        for bit, key in enumerate(self.required_keys):
+            if key in history:
+                mask |= 1 << bit
+        return mask
+
+    def keys_for(self, mask: int) -> FrozenSet[str]:
+        """Claves requeridas tomadas que representa una máscara"""
+        return frozenset(key for bit, key in enumerate(self.required_keys) if mask >> bit & 1)
+
+class AvailabilityTable:
+    """Disponibilidad precalculada de todas las fases de un escenario compilado"""
+
+    def __init__(self, phases: Tuple[PhaseAvailability, ...], option_keys: Tuple[Tuple[str, ...], ...],
+                 states: int, exact_phases: int):
+        self.phases = phases
+        self.option_keys = option_keys      # Claves isla_X_Y por fase, para el índice inverso
+        self.states = states                # Estados distintos recorridos al construir
+        self.exact_phases = exact_phases    # Fases iniciales con solo historiales alcanzables
+
+    @property
+    def complete(self) -> bool:
+        """Todas las fases tienen solo historiales alcanzables"""
+        return self.exact_phases == len(self.phases)
+
+    @classmethod
+    def build(cls, scenario, limit: int = None) -> 'AvailabilityTable':
+        """Construye la tabla de un CompiledScenario (o de cualquier objeto con phases)"""
+        limit = limit or GameConfig.AVAILABILITY_TABLE_LIMIT
+        phases = scenario.phases
+        required = [tuple(dict.fromkeys(key for option in options for key in option.requires))
+                    for options in phases]
+        option_masks = [
+            [sum(1 << keys.index(key) for key in set(option.requires)) for option in options]
+            for options, keys in zip(phases, required)
+        ]
+
+        def available_for(phase_index: int, local: int) -> Tuple[int, ...]:
+            return tuple(i for i, mask in enumerate(option_masks[phase_index]) if local & mask == mask)
+
+        # Bit global de cada clave requerida en alguna fase
+        global_bits = {}
+        for keys in required:
+            for key in keys:
+                global_bits.setdefault(key, 1 << len(global_bits))
+
+        # needed[p]: claves que piden las fases p en adelante (las demás se olvidan)
+        needed = [0] * (len(phases) + 1)
+        for phase_index in range(len(phases) - 1, -1, -1):
+            needed[phase_index] = needed[phase_index + 1] | sum(global_bits[key] for key in required[phase_index])
+
+        built = []
+        states = {0}
+        total_states = 1
+        for phase_index, options in enumerate(phases):
+            if total_states > limit:
+                break
+            local_bits = [(1 << bit, global_bits[key]) for bit, key in enumerate(required[phase_index])]
+            option_bits = [global_bits.get(option.key, 0) & needed[phase_index + 1] for option in options]
+
+            table = {}
+            next_states = set()
+            for state in states:
+                local = 0
+                for local_bit, global_bit in local_bits:
+                    if state & global_bit:
+                        local |= local_bit
+                available = table.get(local)
+                if available is None:
+                    available = table[local] = available_for(phase_index, local)
+                kept = state & needed[phase_index + 1]
+                for option_index in available:
+                    next_states.add(kept | option_bits[option_index])
+
+            built.append(PhaseAvailability(required_keys=required[phase_index], table=table))
+            states = next_states
+            total_states += len(states)
+
+        # Fases fuera del límite: todas las combinaciones de sus claves requeridas,
+        # alcanzables o no (se omiten las fases con demasiadas claves)
+        exact_phases = len(built)
+        for phase_index in range(exact_phases, len(phases)):
+            keys = required[phase_index]
+            table = {}
+            if len(keys) <= MAX_LOCAL_KEYS:
+                table = {local: available_for(phase_index, local) for local in range(1 << len(keys))}
+            built.append(PhaseAvailability(required_keys=keys, table=table, exact=False))
+
+        option_keys = tuple(tuple(option.key for option in options) for options in phases)
+        return cls(tuple(built), option_keys, total_states, exact_phases)
+
+    def lookup(self, phase_index: int, history) -> Optional[Tuple[int, ...]]:
+        """Opciones disponibles para el historial, o None si la tabla no cubre el caso"""
+        phase = self.phases[phase_index]
+        if not phase.required_keys:
+            return phase.table.get(0)
+        return phase.table.get(phase.mask(history))
+
+    def reverse_index(self) -> Dict[str, Tuple[FrozenSet[str], ...]]:
+        """Clave de opción -> combinaciones de claves requeridas tomadas que la hacen disponible.
+
+        Una opción sin requisitos alcanzable aparece con la combinación vacía; una opción
+        inalcanzable, con una tupla vacía. En las fases no exactas las combinaciones
+        pueden no ser alcanzables.
+        """
+        index = {}
+        for phase, keys in zip(self.phases, self.option_keys):
+            histories = [[] for _ in keys]
+            for mask in sorted(phase.table):
+                for option_index in phase.table[mask]:
+                    histories[option_index].append(phase.keys_for(mask))
+            for key, option_histories in zip(keys, histories):
+                index[key] = tuple(option_histories)
+        return index
+
+    def unreachable_options(self) -> List[str]:
+        """Opciones que ningún historial alcanzable hace disponibles (fases exactas)"""
+        reverse = self.reverse_index()
+        return [key for keys in self.option_keys[:self.exact_phases] for key in keys if not reverse[key]]
+
+    @property
+    def entry_count(self) -> int:
+        return sum(len(phase.table) for phase in self.phases)
+
+    def memory_bytes(self) -> int:
+        """Tamaño aproximado de las tablas en memoria"""
+        total = 0
+        for phase in self.phases:
+            total += sys.getsizeof(phase.table) + sys.getsizeof(phase.required_keys)
+            total += sum(sys.getsizeof(mask) + sys.getsizeof(available) for mask, available in phase.table.items())
+        return total
+
+    def format_report(self, phase_ids: Sequence[int] = None) -> str:
+        """Resumen por fase del tamaño de la tabla"""
+        phase_ids = phase_ids or range(1, len(self.option_keys) + 1)
+        lines = [f"{'Fase':>6} {'Claves req.':>12} {'Entradas':>9} {'Opciones':>9}  Exacta"]
+        for phase_id, phase, keys in zip(phase_ids, self.phases, self.option_keys):
+            lines.append(f"{phase_id:>6} {len(phase.required_keys):>12} {len(phase.table):>9} {len(keys):>9}  "
+                         f"{'sí' if phase.exact else 'no'}")
+        lines.append(f"📊 {self.entry_count} entradas, {self.states} estados recorridos, "
+                     f"~{self.memory_bytes() / 1024:.1f} KiB")
+        if not self.complete:
+            lines.append(f"⚠️ Se superó el límite de estados: desde la fase {self.exact_phases + 1} la tabla "
+                         f"incluye todas las combinaciones de claves requeridas, alcanzables o no")
+        return "\n".join(lines)
+
+def main(argv: List[str]) -> int:
+    """Imprime el tamaño de la tabla de disponibilidad y el índice inverso de un escenario"""
+    # Import local: la CLI necesita DataManager, la tabla solo el escenario compilado
+    from data.data_manager import DataManager
+    from logic.compiled_scenario import CompiledScenario
+
+    parser = argparse.ArgumentParser(description="Tabla de disponibilidad de opciones por fase")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--option', action='append', default=[],
+                        help="clave isla_X_Y: muestra qué decisiones previas la hacen disponible")
+    parser.add_argument('--limit', type=int, default=None, help="estados máximos al construir")
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.scenario)
+    scenario = CompiledScenario.from_phases(data_manager.get_phases(), data_manager.get_indicator_specs())
+    table = AvailabilityTable.build(scenario, args.limit)
+    print(table.format_report(scenario.phase_ids))
+
+    unreachable = table.unreachable_options()
+    if unreachable:
+        print(f"🚫 Opciones inalcanzables: {', '.join(unreachable)}")
+
+    reverse = table.reverse_index()
+    for key in args.option:
+        if key not in reverse:
+            print(f"❓ {key}: opción desconocida")
+            continue
+        print(f"🔎 {key}:")
+        if not reverse[key]:
+            print("   ninguna combinación de decisiones la hace disponible")
+        for keys in reverse[key]:
+            print(f"   {' + '.join(sorted(keys)) if keys else '(sin requisitos)'}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,370 @@
+"""Ajuste automático de dificultad y balance de un escenario.
+
+Busca cambios pequeños en las magnitudes de los efectos y bonus de sinergia
+(conservando su signo) hasta cumplir objetivos como:
+
+    --max-game-over 0.10        ≤10% de game over jugando al azar
+    --min-excellent-paths 3     EXCELENTE alcanzable por al menos 3 caminos
+    --no-dominant-path          ningún camino supera al resto por más de --dominance-margin
+
+Cada candidato se evalúa con PathTreeEvaluator sobre todos los caminos legales;
+si el escenario supera GameConfig.PATH_EVALUATOR_STATES estados, la CLI termina
+con un error en lugar de quedarse evaluando.
+El resultado es una lista de cambios y un diff del escenario propuesto.
+
+Uso:
+    python -m logic.balance_tuner --min-excellent-paths 3 --diff propuesta.diff
+"""
+import argparse
+import copy
+import difflib
+import json
+import math
+import os
+import random
+import re
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from logic.compiled_scenario import CompiledScenario
+from logic.path_evaluator import EvaluationBudgetError, PathStats, PathTreeEvaluator
+from logic.score_calculator import ScoreCalculator
+
+MAX_ABS_EFFECT = 30        # Magnitud máxima que puede proponer el ajuste
+CHANGE_PENALTY = 0.01      # Costo por punto modificado: prefiere propuestas con pocos cambios
+
+@dataclass
+class BalanceTargets:
+    """Propiedades objetivo del escenario (None = sin restricción)"""
+    max_random_game_over: Optional[float] = None
+    min_excellent_paths: Optional[int] = None
+    no_dominant_path: bool = False
+    dominance_margin: float = 0.5
+
+    def violation(self, stats: PathStats) -> float:
+        """Cuánto se incumplen los objetivos (0 = todos cumplidos)"""
+        total = 0.0
+        if self.max_random_game_over is not None:
+            total += max(0.0, stats.random_game_over_probability - self.max_random_game_over) * 100
+        if self.min_excellent_paths is not None:
+            missing = max(0, self.min_excellent_paths - stats.excellent_paths)
+            if missing:
+                # Distancia al umbral de los mejores caminos, para guiar la búsqueda
+                ranked = stats.top_scores(self.min_excellent_paths)
+                needed = ranked[-1] if len(ranked) == self.min_excellent_paths else 0.0
+                total += missing + max(0.0, ScoreCalculator.EXCELLENT_SCORE - needed)
+        if self.no_dominant_path:
+            total += max(0.0, stats.dominance_gap - self.dominance_margin)
+        return total
+
+@dataclass
+class EffectChange:
+    """Cambio propuesto sobre un efecto o bonus de sinergia"""
+    phase_id: int
+    decision_id: str
+    field: str              # 'effects' o 'synergy_bonus'
+    indicator: str
+    old_value: int
+    new_value: int
+
+    def __str__(self) -> str:
+        return (f"isla_{self.phase_id}_{self.decision_id}.{self.field}[{self.indicator}]: "
+                f"{self.old_value:+d} → {self.new_value:+d}")
+
+@dataclass
+class TuningResult:
+    """Resultado de la búsqueda"""
+    changes: List[EffectChange]
+    before: PathStats
+    after: PathStats
+    violation: float
+    evaluations: int
+    elapsed: float
+    ms_per_evaluation: float = field(init=False)
+
+    def __post_init__(self):
+        self.ms_per_evaluation = self.elapsed * 1000 / max(self.evaluations, 1)
+
+    @property
+    def satisfied(self) -> bool:
+        return self.violation == 0
+
+class BalanceTuner:
+    """Búsqueda local (recocido simulado) sobre las magnitudes de efectos y sinergias"""
+
+    def __init__(self, scenario: CompiledScenario, targets: BalanceTargets, seed: int = 0):
+        self.scenario = scenario
+        self.targets = targets
+        self.evaluator = PathTreeEvaluator(scenario)
+        self.rng = random.Random(seed)
+        # Parámetros ajustables: (fase, opción, 0=efectos/1=sinergia, indicador); solo valores no nulos
+        self.parameters = []
+        for phase_index, options in enumerate(scenario.phases):
+            for option_index, option in enumerate(options):
+                for slot, vector in ((0, option.effects), (1, option.synergy_bonus)):
+                    for indicator_index, value in enumerate(vector or ()):
+                        if value:
+                            self.parameters.append((phase_index, option_index, slot, indicator_index))
+
+    def _loss(self, table, base_table) -> Tuple[float, float, PathStats]:
+        stats = self.evaluator.evaluate(table)
+        violation = self.targets.violation(stats)
+        changed = sum(
+            abs(table[phase][option][slot][indicator] - base_table[phase][option][slot][indicator])
+            for phase, option, slot, indicator in self.parameters
+        )
+        return violation * 1000 + changed * CHANGE_PENALTY, violation, stats
+
+    def tune(self, iterations: int = 3000, temperature: float = 0.02) -> TuningResult:
+        """Busca una tabla de efectos que cumpla los objetivos con la menor cantidad de cambios"""
+        start = time.perf_counter()
+        base_table = self.evaluator.base_effect_table()
+        current = [[list(entry) for entry in options] for options in base_table]
+        current_loss, violation, before = self._loss(current, base_table)
+        best, best_loss, best_violation, best_stats = copy.deepcopy(current), current_loss, violation, before
+        evaluations = 1
+
+        for iteration in range(iterations):
+            if best_violation == 0 or not self.parameters:
+                break
+            phase, option, slot, indicator = self.rng.choice(self.parameters)
+            vector = list(current[phase][option][slot])
+            old_value = vector[indicator]
+            sign = 1 if old_value > 0 else -1
+            magnitude = abs(old_value) + self.rng.choice((-2, -1, 1, 2))
+            vector[indicator] = sign * max(1, min(MAX_ABS_EFFECT, magnitude))
+            if vector[indicator] == old_value:
+                continue
+
+            previous = current[phase][option][slot]
+            current[phase][option][slot] = tuple(vector)
+            loss, violation, stats = self._loss(current, base_table)
+            evaluations += 1
+
+            # Recocido: acepta empeoramientos con probabilidad decreciente
+            heat = temperature * (1 - iteration / iterations) + 1e-9
+            if loss <= current_loss or self.rng.random() < math.exp((current_loss - loss) / heat):
+                current_loss = loss
+                if loss < best_loss:
+                    best, best_loss, best_violation, best_stats = copy.deepcopy(current), loss, violation, stats
+            else:
+                current[phase][option][slot] = previous
+
+        if best_violation == 0:
+            best, best_stats, pruned = self._prune(best, base_table, best_stats)
+            evaluations += pruned
+        
+        elapsed = time.perf_counter() - start
+        return TuningResult(
+            changes=self._collect_changes(best, base_table),
+            before=before,
+            after=best_stats,
+            violation=best_violation,
+            evaluations=evaluations,
+            elapsed=elapsed
+        )
+
+    def _prune(self, table, base_table, stats: PathStats) -> Tuple[list, PathStats, int]:
+        """Revierte uno a uno los cambios que no hacen falta para cumplir los objetivos"""
+        evaluations = 0
+        for phase, option, slot, indicator in self.parameters:
+            current = table[phase][option][slot]
+            original = base_table[phase][option][slot][indicator]
+            if current[indicator] == original:
+                continue
+            reverted = list(current)
+            reverted[indicator] = original
+            table[phase][option][slot] = tuple(reverted)
+            candidate = self.evaluator.evaluate(table)
+            evaluations += 1
+            if self.targets.violation(candidate) == 0:
+                stats = candidate
+            else:
+                table[phase][option][slot] = current
+        return table, stats, evaluations
+    
+    def _collect_changes(self, table, base_table) -> List[EffectChange]:
+        changes = []
+        for phase, option, slot, indicator in self.parameters:
+            old_value = base_table[phase][option][slot][indicator]
+            new_value = table[phase][option][slot][indicator]
+            if new_value != old_value:
+                changes.append(EffectChange(
+                    phase_id=self.scenario.phase_ids[phase],
+                    decision_id=self.scenario.phases[phase][option].decision_id,
+                    field='effects' if slot == 0 else 'synergy_bonus',
+                    indicator=self.scenario.indicator_names[indicator],
+                    old_value=old_value,
+                    new_value=new_value
+                ))
+        return changes
+
+def apply_changes(scenario_json: Dict, changes: List[EffectChange]) -> Dict:
+    """Retorna una copia del JSON del escenario con los cambios aplicados"""
+    proposed = copy.deepcopy(scenario_json)
+    phases = {phase['id']: phase for phase in proposed['phases']}
+    for change in changes:
+        decision = next(d for d in phases[change.phase_id]['decisions'] if d['id'] == change.decision_id)
+        decision.setdefault(change.field, {})[change.indicator] = change.new_value
+    return proposed
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r'\s*')
+
+def _skip_whitespace(text: str, index: int) -> int:
+    return _WHITESPACE.match(text, index).end()
+
+def _child_start(text: str, index: int, key) -> Optional[int]:
+    """Inicio del valor `key` (clave o posición) del objeto o lista que empieza en index"""
+    opening = text[index]
+    if opening not in '{[':
+        return None
+    index = _skip_whitespace(text, index + 1)
+    position = 0
+    while text[index] not in '}]':
+        if opening == '{':
+            name, index = _DECODER.raw_decode(text, index)
+            index = _skip_whitespace(text, _skip_whitespace(text, index) + 1)   # Saltar ':'
+            if name == key:
+                return index
+        elif position == key:
+            return index
+        _, index = _DECODER.raw_decode(text, index)
+        index = _skip_whitespace(text, index)
+        if text[index] == ',':
+            index = _skip_whitespace(text, index + 1)
+        position += 1
+    return None
+
+def _locate(text: str, path: List) -> Tuple[int, int, int]:
+    """(inicio, fin, pasos) del valor en `path`, o del ancestro más profundo que existe"""
+    start = _skip_whitespace(text, 0)
+    depth = 0
+    for key in path:
+        child = _child_start(text, start, key)
+        if child is None:
+            break
+        start, depth = child, depth + 1
+    _, end = _DECODER.raw_decode(text, start)
+    return start, end, depth
+
+def _format_like(value, text: str, start: int, end: int) -> str:
+    """Serializa un valor con el estilo (una línea o sangría) del que reemplaza en el archivo"""
+    if '\n' not in text[start:end]:
+        return json.dumps(value, ensure_ascii=False)
+    line_start = text.rfind('\n', 0, start) + 1
+    indent = text[line_start:_skip_whitespace(text, line_start)]
+    next_line = text.index('\n', start) + 1
+    unit = len(text[next_line:_skip_whitespace(text, next_line)]) - len(indent)
+    return json.dumps(value, ensure_ascii=False, indent=max(unit, 1)).replace('\n', '\n' + indent)
+
+def apply_changes_to_text(source: str, changes: List[EffectChange]) -> str:
+    """Aplica los cambios sobre el texto de phases.json conservando su formato.
+    
+    Solo se reescriben los números modificados; si un efecto no existía en el archivo,
+    se reescribe el objeto más cercano que lo contiene.
+    """
+    original = json.loads(source)
+    proposed = apply_changes(original, changes)
+    edits = {}
+    for change in changes:
+        phase = next(i for i, p in enumerate(original['phases']) if p['id'] == change.phase_id)
+        decision = next(i for i, d in enumerate(original['phases'][phase]['decisions'])
+                        if d['id'] == change.decision_id)
+        path = ['phases', phase, 'decisions', decision, change.field, change.indicator]
+        start, end, depth = _locate(source, path)
+        value = proposed
+        for key in path[:depth]:
+            value = value[key]
+        edits[start, end] = _format_like(value, source, start, end)
+
+    # Un cambio dentro de un objeto que se reescribe entero ya está en su nuevo valor
+    outer = []
+    for (start, end), replacement in sorted(edits.items(), key=lambda edit: (edit[0][0], -edit[0][1])):
+        if outer and end <= outer[-1][1]:
+            continue
+        outer.append((start, end, replacement))
+    text = source
+    for start, end, replacement in reversed(outer):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+def scenario_diff(original: str, proposed: str, name: str = 'phases.json') -> str:
+    """Diff unificado entre el texto de phases.json en disco y el propuesto"""
+    before = original.splitlines(keepends=True)
+    after = proposed.splitlines(keepends=True)
+    return ''.join(difflib.unified_diff(before, after, fromfile=f"a/{name}", tofile=f"b/{name}"))
+
+def _describe(stats: PathStats) -> str:
+    best = "-" if stats.best_score is None else f"{stats.best_score:.1f}"
+    return (f"game over al azar {stats.random_game_over_probability:.1%} · "
+            f"caminos EXCELENTE {stats.excellent_paths} · mejor {best} · "
+            f"ventaja del mejor camino {stats.dominance_gap:.2f}")
+
+def main(argv: List[str]) -> int:
+    """Propone un ajuste del escenario según los objetivos indicados"""
+    # Import local: la CLI necesita DataManager, la búsqueda solo el escenario compilado
+    from data.data_manager import DataManager
+    from data.scenario_archive import ARCHIVE_EXTENSION
+
+    parser = argparse.ArgumentParser(description="Ajuste automático de balance del escenario")
+    parser.add_argument('--scenario', default='data/phases.json', help="phases.json a ajustar")
+    parser.add_argument('--max-game-over', type=float, default=None)
+    parser.add_argument('--min-excellent-paths', type=int, default=None)
+    parser.add_argument('--no-dominant-path', action='store_true')
+    parser.add_argument('--dominance-margin', type=float, default=0.5)
+    parser.add_argument('--iterations', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--diff', default=None, help="archivo donde escribir el diff propuesto")
+    parser.add_argument('--output', default=None, help="archivo donde escribir el escenario propuesto")
+    args = parser.parse_args(argv)
+
+    # El diff conserva el formato del texto JSON: un .scn no tiene un texto que ajustar
+    if args.scenario.endswith(ARCHIVE_EXTENSION):
+        parser.error(f"{args.scenario} es un archivo de escenario {ARCHIVE_EXTENSION}; "
+                     f"ajusta el phases.json del que se generó")
+    try:
+        with open(args.scenario, 'r', encoding='utf-8', newline='') as file:   # Conservar los finales de línea
+            original = file.read()
+        json.loads(original)
+    except (OSError, ValueError) as e:
+        parser.error(f"{args.scenario} no es un phases.json legible: {e}")
+
+    targets = BalanceTargets(
+        max_random_game_over=args.max_game_over,
+        min_excellent_paths=args.min_excellent_paths,
+        no_dominant_path=args.no_dominant_path,
+        dominance_margin=args.dominance_margin
+    )
+    data_manager = DataManager(args.scenario)
+    scenario = CompiledScenario.from_phases(data_manager.get_phases(), data_manager.get_indicator_specs())
+    try:
+        result = BalanceTuner(scenario, targets, seed=args.seed).tune(iterations=args.iterations)
+    except EvaluationBudgetError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"📊 Antes:   {_describe(result.before)}")
+    print(f"📊 Después: {_describe(result.after)}")
+    print(f"⏱️ {result.evaluations} evaluaciones en {result.elapsed:.2f} s "
+          f"({result.ms_per_evaluation:.2f} ms por candidato)")
+    print("✅ Objetivos cumplidos" if result.satisfied else f"⚠️ Objetivos no cumplidos (desvío {result.violation:.2f})")
+    for change in result.changes:
+        print(f"   • {change}")
+
+    proposed = apply_changes_to_text(original, result.changes)
+    diff = scenario_diff(original, proposed, os.path.basename(args.scenario))
+    if args.diff:
+        with open(args.diff, 'w', encoding='utf-8', newline='') as file:
+            file.write(diff)
+        print(f"📝 Diff propuesto escrito en {args.diff}")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            file.write(proposed)
+        print(f"📝 Escenario propuesto escrito en {args.output}")
+    return 0 if result.satisfied else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
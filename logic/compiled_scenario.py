@@ -0,0 +1,195 @@
+import hashlib
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Optional, Sequence, Tuple
+from data.data_manager import IndicatorSpec, default_indicator_specs
+from logic.availability_table import AvailabilityTable
+
+@dataclass(frozen=True)
+class CompiledOption:
+    """Opción de una fase con sus efectos como vectores en el orden fijo de indicadores"""
+    key: str                               # Clave de historial: isla_{fase}_{opción}
+    decision_id: str
+    effects: Tuple[int, ...]
+    requires: Tuple[str, ...] = ()
+    synergy_with: Optional[str] = None
+    synergy_bonus: Optional[Tuple[int, ...]] = None
+    unlocks: Optional[str] = None
+
+@dataclass(frozen=True)
+class CompiledScenario:
+    """Escenario inmutable y serializable, listo para simulaciones masivas.
+
+    Reproduce las reglas de GameEngine (efectos base, sinergias y límites 0-100
+    aplicados por separado, game over bajo el umbral de fracaso de cada indicador)
+    sobre tuplas en el orden declarado por el escenario, sin logging ni estado
+    compartido, de modo que puede enviarse a otros procesos.
+    """
+    indicator_names: Tuple[str, ...]
+    initial_indicators: Tuple[float, ...]
+    phase_ids: Tuple[int, ...]
+    phases: Tuple[Tuple[CompiledOption, ...], ...]
+    failure_thresholds: Tuple[float, ...]
+    critical_thresholds: Tuple[float, ...]
+    weights: Tuple[float, ...]
+
+    @classmethod
+    def from_phases(cls, phases, indicator_specs: Sequence[IndicatorSpec] = None) -> 'CompiledScenario':
+        """Compila una lista de Phase e IndicatorSpec (DataManager) en un escenario vectorizado"""
+        indicator_specs = indicator_specs or default_indicator_specs()
+        names = tuple(spec.name for spec in indicator_specs)
+
+        def to_vector(effects: Dict[str, int]) -> Tuple[int, ...]:
+            # Los indicadores desconocidos se ignoran, igual que en apply_decision_effects
+            return tuple(effects.get(name, 0) for name in names)
+
+        compiled_phases = []
+        for phase in phases:
+            options = []
+            for decision in phase.decisions:
+                requires = decision.requires or ()
+                if isinstance(requires, str):
+                    requires = (requires,)
+                has_synergy = bool(decision.synergy_with and decision.synergy_bonus)
+                options.append(CompiledOption(
+                    key=f"isla_{phase.id}_{decision.id}",
+                    decision_id=decision.id,
+                    effects=to_vector(decision.effects),
+                    requires=tuple(requires),
+                    synergy_with=decision.synergy_with if has_synergy else None,
+                    synergy_bonus=to_vector(decision.synergy_bonus) if has_synergy else None,
+                    unlocks=decision.unlocks or None
+                ))
+            compiled_phases.append(tuple(options))
+
+        return cls(
+            indicator_names=names,
+            initial_indicators=tuple(float(spec.initial) for spec in indicator_specs),
+            phase_ids=tuple(phase.id for phase in phases),
+            phases=tuple(compiled_phases),
+            failure_thresholds=tuple(float(spec.failure) for spec in indicator_specs),
+            critical_thresholds=tuple(float(spec.critical) for spec in indicator_specs),
+            weights=tuple(float(spec.weight) for spec in indicator_specs)
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representación JSON del escenario compilado (ver logic.scenario_versions)"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompiledScenario':
+        """Reconstruye un escenario de to_dict con los mismos tipos (y la misma huella)"""
+        def vector(values):
+            return tuple(values) if values is not None else None
+
+        return cls(
+            indicator_names=tuple(data['indicator_names']),
+            initial_indicators=tuple(data['initial_indicators']),
+            phase_ids=tuple(data['phase_ids']),
+            phases=tuple(
+                tuple(
+                    CompiledOption(
+                        key=option['key'],
+                        decision_id=option['decision_id'],
+                        effects=tuple(option['effects']),
+                        requires=tuple(option['requires']),
+                        synergy_with=option['synergy_with'],
+                        synergy_bonus=vector(option['synergy_bonus']),
+                        unlocks=option['unlocks']
+                    )
+                    for option in options
+                )
+                for options in data['phases']
+            ),
+            failure_thresholds=tuple(data['failure_thresholds']),
+            critical_thresholds=tuple(data['critical_thresholds']),
+            weights=tuple(data['weights'])
+        )
+
+    @property
+    def max_phases(self) -> int:
+        return len(self.phases)
+
+    @cached_property
+    def option_index(self) -> Dict[str, Tuple[int, int]]:
+        """Clave isla_X_Y -> (índice de fase, índice de opción)"""
+        return {
+            option.key: (phase_index, option_index)
+            for phase_index, options in enumerate(self.phases)
+            for option_index, option in enumerate(options)
+        }
+
+    @cached_property
+    def last_needed(self) -> Dict[str, int]:
+        """Clave -> última fase cuyas opciones la piden (requires o synergy_with)"""
+        result = {}
+        for phase_index, options in enumerate(self.phases):
+            for option in options:
+                for key in option.requires:
+                    result[key] = phase_index
+                if option.synergy_with:
+                    result[option.synergy_with] = phase_index
+        return result
+
+    def relevant_history(self, phase_index: int, history: FrozenSet[str]) -> FrozenSet[str]:
+        """Parte del historial que todavía influye desde una fase (historiales equivalentes coinciden)"""
+        last_needed = self.last_needed
+        return frozenset(key for key in history if last_needed.get(key, -1) >= phase_index)
+
+    @cached_property
+    def availability(self) -> AvailabilityTable:
+        """Opciones disponibles precalculadas por fase para cada historial alcanzable"""
+        return AvailabilityTable.build(self)
+
+    @cached_property
+    def uniform_weights(self) -> bool:
+        """Todos los indicadores pesan igual (el puntaje es el promedio simple)"""
+        return len(set(self.weights)) <= 1
+
+    @cached_property
+    def fingerprint(self) -> bytes:
+        """Hash del contenido compilado; distingue escenarios en cachés compartidas"""
+        return hashlib.blake2b(repr(self).encode('utf-8'), digest_size=16).digest()
+
+    @property
+    def version(self) -> str:
+        """Versión del escenario: la huella en hexadecimal.
+
+        Solo cambia si cambian las reglas (efectos, requisitos, sinergias, umbrales,
+        pesos); editar textos narrativos no invalida partidas ni registros.
+        """
+        return self.fingerprint.hex()
+
+    def indicator_vector(self, indicators: Dict[str, float]) -> Tuple[float, ...]:
+        """Convierte un dict de indicadores (GameEngine) al orden fijo del escenario"""
+        return tuple(float(indicators[name]) for name in self.indicator_names)
+
+    def available_options(self, phase_index: int, history: FrozenSet[str]) -> Sequence[int]:
+        """Índices de las opciones cuyos requisitos cumple el historial"""
+        available = self.availability.lookup(phase_index, history)
+        if available is not None:
+            return available
+        # Historial fuera de la tabla (no alcanzable o tabla incompleta)
+        return [
+            index for index, option in enumerate(self.phases[phase_index])
+            if all(req in history for req in option.requires)
+        ]
+
+    def apply_option(self, indicators: Tuple[float, ...], history: FrozenSet[str],
+                     phase_index: int, option_index: int) -> Tuple[Tuple[float, ...], bool]:
+        """Aplica una opción y retorna (nuevos indicadores, game over)"""
+        option = self.phases[phase_index][option_index]
+        values = tuple(clamp_indicator(v + e) for v, e in zip(indicators, option.effects))
+        if option.synergy_with is not None and option.synergy_with in history:
+            values = tuple(clamp_indicator(v + e) for v, e in zip(values, option.synergy_bonus))
+        return values, any(v < t for v, t in zip(values, self.failure_thresholds))
+
+    def score(self, indicators: Sequence[float]) -> float:
+        """Puntaje final: promedio ponderado, como ScoreCalculator.calculate_final_score"""
+        if self.uniform_weights:
+            return sum(indicators) / len(indicators)
+        return sum(w * v for w, v in zip(self.weights, indicators)) / sum(self.weights)
+
+def clamp_indicator(value: float) -> float:
+    """Limita un indicador al rango 0-100"""
+    return max(0, min(100, value))
@@ -0,0 +1,259 @@
+"""Panel en vivo para instructores: contadores agregados de toda la clase.
+
+DashboardAggregator se suscribe a los eventos de decisión de cada GameEngine
+(add_listener) y mantiene contadores e histogramas con un costo constante por
+evento: cuántos estudiantes hay en cada isla, frecuencia de elección de cada
+opción, game overs, partidas completadas, promedio de indicadores y distribución
+de puntajes. Un refresco del panel solo lee un snapshot, sin recorrer las sesiones.
+
+El endpoint HTTP sin interfaz sirve el snapshot como JSON en /dashboard.
+
+Uso (clase simulada para probar el panel):
+    python -m logic.dashboard --students 120 [--port 8765]
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from config.settings import GameState
+from logic.compiled_scenario import CompiledScenario
+from logic.simulation import SimulationState, StepOutcome
+
+HISTOGRAM_BINS = 10  # Tramos de 10 puntos entre 0 y 100
+
+def _bin(value: float) -> int:
+    return min(max(int(value // 10), 0), HISTOGRAM_BINS - 1)
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Estado agregado de la clase en un instante"""
+    taken_at: float
+    events: int
+    active: int                                     # Partidas en curso
+    completed: int
+    game_overs: int
+    abandoned: int                                  # Reiniciadas o cerradas sin terminar
+    students_per_phase: Dict[int, int]              # id de isla -> estudiantes jugando en ella
+    pick_rates: Dict[str, float]                    # isla_X_Y -> fracción de elecciones en su fase
+    picks: Dict[str, int]
+    average_indicators: Dict[str, float]            # Promedio de las partidas en curso
+    indicator_histograms: Dict[str, List[int]]      # Partidas en curso por tramo de 10 puntos
+    average_final_score: Optional[float]
+    score_histogram: List[int]                      # Partidas terminadas por tramo de puntaje
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    def format_text(self) -> str:
+        """Resumen legible para la terminal"""
+        lines = [f"👥 En curso: {self.active}  ✅ Completadas: {self.completed}  "
+                 f"💀 Game over: {self.game_overs}  🚪 Abandonadas: {self.abandoned}"]
+        lines.append("🏝️ Por isla: " + "  ".join(f"{phase_id}: {count}"
+                                                 for phase_id, count in self.students_per_phase.items()))
+        if self.average_indicators:
+            lines.append("📊 Promedios: " + "  ".join(f"{name}: {value:.1f}"
+                                                      for name, value in self.average_indicators.items()))
+        if self.average_final_score is not None:
+            lines.append(f"🏆 Puntaje final promedio: {self.average_final_score:.1f}  "
+                         f"histograma: {self.score_histogram}")
+        top = sorted(self.pick_rates.items(), key=lambda item: -item[1])[:5]
+        if top:
+            lines.append("🔝 Más elegidas: " + "  ".join(f"{key} {rate:.0%}" for key, rate in top))
+        return "\n".join(lines)
+
+class DashboardAggregator:
+    """Contadores en vivo de una clase, actualizados en O(1) por evento (por escenario fijo).
+
+    Seguro entre hilos: los motores de varios estudiantes pueden notificar en paralelo
+    mientras la UI o el endpoint HTTP leen snapshots.
+    """
+
+    def __init__(self, scenario: CompiledScenario):
+        self.scenario = scenario
+        indicator_count = len(scenario.indicator_names)
+        self._lock = threading.Lock()
+        self._sessions = {}                 # session_id -> (fase, indicadores) de partidas en curso
+        self.events = 0
+        self.completed = 0
+        self.game_overs = 0
+        self.abandoned = 0
+        self._on_phase = [0] * scenario.max_phases
+        self._picks = [[0] * len(options) for options in scenario.phases]
+        self._phase_picks = [0] * scenario.max_phases
+        self._active_sums = [0.0] * indicator_count
+        self._active_histograms = [[0] * HISTOGRAM_BINS for _ in range(indicator_count)]
+        self._score_sum = 0.0
+        self._score_histogram = [0] * HISTOGRAM_BINS
+
+    def _add_active(self, session_id: str, phase_index: int, indicators: Tuple[float, ...]) -> None:
+        self._sessions[session_id] = (phase_index, indicators)
+        self._on_phase[phase_index] += 1
+        for i, value in enumerate(indicators):
+            self._active_sums[i] += value
+            self._active_histograms[i][_bin(value)] += 1
+
+    def _remove_active(self, session_id: str) -> Optional[Tuple[int, Tuple[float, ...]]]:
+        entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            phase_index, indicators = entry
+            self._on_phase[phase_index] -= 1
+            for i, value in enumerate(indicators):
+                self._active_sums[i] -= value
+                self._active_histograms[i][_bin(value)] -= 1
+        return entry
+
+    def on_session_start(self, session_id: str, state: SimulationState) -> None:
+        """Una partida comienza (la anterior de la sesión, si no terminó, se abandona)"""
+        with self._lock:
+            self.events += 1
+            if self._remove_active(session_id) is not None:
+                self.abandoned += 1
+            if not state.finished and state.phase_index < self.scenario.max_phases:
+                self._add_active(session_id, state.phase_index, state.indicators)
+
+    def on_session_restored(self, session_id: str, state: SimulationState) -> None:
+        """Una partida se reanuda desde un snapshot: se reubica sin contarla como abandonada"""
+        with self._lock:
+            self.events += 1
+            self._remove_active(session_id)
+            if not state.finished and state.phase_index < self.scenario.max_phases:
+                self._add_active(session_id, state.phase_index, state.indicators)
+
+    def on_step(self, session_id: str, outcome: StepOutcome) -> None:
+        """Un estudiante tomó una decisión"""
+        with self._lock:
+            self.events += 1
+            phase_index = outcome.phase_index
+            if phase_index >= self.scenario.max_phases or \
+                    outcome.option_index >= len(self._picks[phase_index]):
+                return   # Evento de otra versión del escenario
+            self._picks[phase_index][outcome.option_index] += 1
+            self._phase_picks[phase_index] += 1
+            self._remove_active(session_id)
+
+            if outcome.status == GameState.PLAYING:
+                self._add_active(session_id, phase_index + 1, outcome.indicators)
+                return
+            if outcome.status == GameState.GAME_OVER:
+                self.game_overs += 1
+            else:
+                self.completed += 1
+            score = self.scenario.score(outcome.indicators)
+            self._score_sum += score
+            self._score_histogram[_bin(score)] += 1
+
+    def on_session_end(self, session_id: str) -> None:
+        """El estudiante cerró el juego sin terminar la partida"""
+        with self._lock:
+            self.events += 1
+            if self._remove_active(session_id) is not None:
+                self.abandoned += 1
+
+    def snapshot(self) -> DashboardSnapshot:
+        """Copia consistente de los contadores (costo proporcional al tamaño del escenario)"""
+        scenario = self.scenario
+        with self._lock:
+            active = len(self._sessions)
+            picks = {}
+            pick_rates = {}
+            for phase_index, options in enumerate(scenario.phases):
+                total = self._phase_picks[phase_index]
+                for option, count in zip(options, self._picks[phase_index]):
+                    picks[option.key] = count
+                    pick_rates[option.key] = count / total if total else 0.0
+            finished = self.completed + self.game_overs
+            return DashboardSnapshot(
+                taken_at=time.time(),
+                events=self.events,
+                active=active,
+                completed=self.completed,
+                game_overs=self.game_overs,
+                abandoned=self.abandoned,
+                students_per_phase=dict(zip(scenario.phase_ids, self._on_phase)),
+                pick_rates=pick_rates,
+                picks=picks,
+                average_indicators={
+                    name: total / active for name, total in zip(scenario.indicator_names, self._active_sums)
+                } if active else {},
+                indicator_histograms={
+                    name: list(histogram)
+                    for name, histogram in zip(scenario.indicator_names, self._active_histograms)
+                },
+                average_final_score=self._score_sum / finished if finished else None,
+                score_histogram=list(self._score_histogram)
+            )
+
+def start_http_endpoint(aggregator: DashboardAggregator, host: str = '127.0.0.1',
+                        port: int = 8765) -> ThreadingHTTPServer:
+    """Sirve el snapshot del panel como JSON en GET /dashboard (hilo en segundo plano)"""
+
+    class DashboardHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') != '/dashboard':
+                self.send_error(404)
+                return
+            body = aggregator.snapshot().to_json().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass   # Sin una línea de log por cada refresco
+
+    server = ThreadingHTTPServer((host, port), DashboardHandler)
+    threading.Thread(target=server.serve_forever, name='dashboard-http', daemon=True).start()
+    return server
+
+def main(argv: List[str]) -> int:
+    """Simula una clase jugando y muestra el panel en vivo"""
+    # Import local: el agregador solo necesita el escenario compilado
+    from logic.game_engine import GameEngine
+
+    parser = argparse.ArgumentParser(description="Panel en vivo para instructores (clase simulada)")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--students', type=int, default=60)
+    parser.add_argument('--port', type=int, default=None, help="sirve el panel en http://127.0.0.1:PUERTO/dashboard")
+    parser.add_argument('--delay', type=float, default=0.0, help="segundos entre decisiones simuladas")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    engines = [GameEngine(args.scenario, session_id=f"estudiante-{i + 1}") for i in range(args.students)]
+    aggregator = DashboardAggregator(engines[0].get_compiled_scenario())
+    for engine in engines:
+        engine.add_listener(aggregator)
+
+    server = start_http_endpoint(aggregator, port=args.port) if args.port else None
+    if server:
+        print(f"🌐 Panel en http://127.0.0.1:{args.port}/dashboard")
+
+    # Cada ronda, los estudiantes que siguen jugando toman una decisión en orden aleatorio
+    started = time.perf_counter()
+    playing = list(engines)
+    round_number = 0
+    while playing:
+        round_number += 1
+        rng.shuffle(playing)
+        for engine in playing:
+            engine.make_decision(rng.randrange(len(engine.get_current_phase().decisions)))
+            if args.delay:
+                time.sleep(args.delay)
+        playing = [engine for engine in playing if engine.game_state == GameState.PLAYING]
+        print(f"\n⏱️ Ronda {round_number}")
+        print(aggregator.snapshot().format_text())
+    elapsed = time.perf_counter() - started
+    print(f"\n⚡ {aggregator.events:,} eventos en {elapsed:.2f} s")
+    if server:
+        input("Presiona Enter para cerrar el panel...")
+        server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
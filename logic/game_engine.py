@@ -1,237 +1,464 @@
-from typing import Dict, List
-from config.settings import GameConfig, GameState
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set, Tuple
+from config.settings import GameState
 from logic.score_calculator import ScoreCalculator
-from data.data_manager import DataManager, Phase
+from data.data_manager import DataManager, Phase, Decision, IndicatorSpec
+from logic.compiled_scenario import CompiledScenario
+from logic.outcome_cache import GameTreeSolver, OutcomeCache, OutcomeEntry, get_shared_outcome_cache
+from logic.scenario_versions import ScenarioVersions, get_scenario_versions
+from logic.simulation import SimulationState, StepOutcome, initial_state, simulate, step
+
+class DecisionResult:
+    """Resultado de make_decision con los datos numéricos del paso.
+    
+    El texto para el jugador (format_effects) solo se arma cuando la UI o un log lo
+    piden; en partidas simuladas por lotes no se formatea nada.
+    """
+    __slots__ = ('success', 'message', 'decision_text', 'option_key', 'indicator_names',
+                 'previous_indicators', 'indicators', 'base_effects', 'synergy_effects',
+                 'critical', 'failed', 'status')
+    
+    def __init__(self, success: bool = True, message: str = '', decision_text: str = '',
+                 option_key: str = '', indicator_names: Tuple[str, ...] = (),
+                 previous_indicators: Tuple[float, ...] = (), indicators: Tuple[float, ...] = (),
+                 base_effects: Dict[str, int] = None, synergy_effects: Dict[str, int] = None,
+                 critical: Tuple[int, ...] = (), failed: Tuple[int, ...] = (),
+                 status: GameState = GameState.PLAYING):
+        self.success = success
+        self.message = message                          # Motivo cuando success es False
+        self.decision_text = decision_text
+        self.option_key = option_key                    # Clave isla_X_Y de la decisión
+        self.indicator_names = indicator_names
+        self.previous_indicators = previous_indicators  # En el orden de indicator_names
+        self.indicators = indicators
+        self.base_effects = base_effects or {}          # Compartidos con la Decision: solo lectura
+        self.synergy_effects = synergy_effects or {}    # Vacío si no se activó la sinergia
+        self.critical = critical                        # Índices bajo el umbral crítico
+        self.failed = failed                            # Índices bajo el umbral de fracaso
+        self.status = status
+    
+    @classmethod
+    def failure(cls, message: str) -> 'DecisionResult':
+        return cls(success=False, message=message)
+    
+    @property
+    def game_over(self) -> bool:
+        return self.success and self.status == GameState.GAME_OVER
+    
+    @property
+    def game_completed(self) -> bool:
+        return self.success and self.status == GameState.COMPLETED
+    
+    @property
+    def critical_indicators(self) -> List[str]:
+        return [self.indicator_names[i] for i in self.critical]
+    
+    @property
+    def failed_indicators(self) -> List[str]:
+        return [self.indicator_names[i] for i in self.failed]
+    
+    def deltas(self) -> Dict[str, float]:
+        """Cambio real de cada indicador modificado (después de limitar a 0-100)"""
+        return {
+            name: new - old
+            for name, old, new in zip(self.indicator_names, self.previous_indicators, self.indicators)
+            if new != old
+        }
+    
+    def format_effects(self) -> List[str]:
+        """Líneas de efectos para mostrar al jugador, incluyendo sinergias"""
+        old_indicators = dict(zip(self.indicator_names, self.previous_indicators))
+        new_indicators = dict(zip(self.indicator_names, self.indicators))
+        
+        # Combinar efectos base y de sinergia
+        all_effects = dict(self.base_effects)
+        for indicator, value in self.synergy_effects.items():
+            all_effects[indicator] = all_effects.get(indicator, 0) + value
+        
+        effects_list = []
+        for indicator, change in all_effects.items():
+            if indicator not in old_indicators:
+                continue
+            old_value = old_indicators[indicator]
+            new_value = new_indicators[indicator]
+            
+            synergy_note = ""
+            if indicator in self.synergy_effects:
+                synergy_note = f" (✨+{self.synergy_effects[indicator]} sinergia)"
+            
+            if change > 0:
+                effects_list.append(f"📈 {indicator}: +{change}% ({old_value:.1f}% → {new_value:.1f}%){synergy_note}")
+            elif change < 0:
+                effects_list.append(f"📉 {indicator}: {change}% ({old_value:.1f}% → {new_value:.1f}%){synergy_note}")
+        return effects_list
+
+class DecisionLog:
+    """Listener que escribe cada decisión como texto legible (consola del juego, --verbose).
+    
+    El motor no imprime nada por decisión: las interfaces que quieren este log lo
+    instalan con engine.add_listener(DecisionLog(engine)).
+    """
+    
+    def __init__(self, engine: 'GameEngine', out=None):
+        self.engine = engine
+        self.out = out                  # None: sys.stdout del momento de cada escritura
+    
+    def on_session_start(self, session_id: str, state: SimulationState) -> None:
+        pass
+    
+    def on_step(self, session_id: str, outcome: StepOutcome) -> None:
+        option = self.engine.get_compiled_scenario().phases[outcome.phase_index][outcome.option_index]
+        print(f"📝 Decisión guardada: {outcome.option_key}", file=self.out)
+        if option.unlocks:
+            print(f"🔓 Desbloqueado: {option.unlocks}", file=self.out)
+        if outcome.synergy_applied:
+            print(f"✨ Sinergia activada: {option.synergy_with} + {outcome.option_key}", file=self.out)
 
 class GameEngine:
-    """Maneja toda la lógica del juego"""
-    
-    def __init__(self):
-        self.data_manager = DataManager()
-        self.score_calculator = ScoreCalculator()
-        self.indicators = {}
-        self.current_phase = 0
-        self.game_state = GameState.PLAYING
+    """Maneja la sesión de juego: guarda el estado y delega las reglas en logic.simulation.
+    
+    El estado de la partida es un SimulationState inmutable; indicators, current_phase,
+    game_state y decision_history son vistas de solo lectura sobre él. Los listeners
+    (p. ej. logic.dashboard.DashboardAggregator) reciben on_session_start(session_id, state)
+    y on_step(session_id, outcome) en cada cambio de estado, y on_session_restored(session_id,
+    state) si lo definen cuando la sesión se reanuda desde un snapshot.
+    
+    Seguro entre hilos: los cambios de estado y las lecturas de varios campos
+    (get_snapshot, get_final_results...) se serializan con el lock reentrante de la
+    sesión (self.lock); las vistas leen una sola vez la referencia al estado, así que
+    nunca ven uno a medio reemplazar. Lo compartido entre sesiones (caché de
+    resultados, versiones de escenario) tiene su propio lock.
+    """
+    
+    def __init__(self, data_path: str = None, outcome_cache: OutcomeCache = None, session_id: str = None,
+                 scenario_versions: ScenarioVersions = None):
+        self.session_id = session_id or os.urandom(16).hex()   # Sin uuid: evita importar platform al iniciar
+        self.lock = threading.RLock()
+        self.listeners = []
+        self.scenario_versions = scenario_versions if scenario_versions is not None else get_scenario_versions()
+        self.data_manager = DataManager(data_path)
+        self.indicator_specs = self.data_manager.get_indicator_specs()
+        self.score_calculator = ScoreCalculator(self.indicator_specs)
+        self.outcome_cache = outcome_cache if outcome_cache is not None else get_shared_outcome_cache()
+        self._compiled = None          # (fases, indicadores, escenario compilado): se reemplaza entero
+        self._rejected_version = None  # Última versión recargada cuyo camino jugado no era válido
         self.phases = []
         self.max_phases = 0
-        self.decision_history = {}
-        self.unlocked_options = set()
-        self.applied_synergies = set()
+        self.state = None
+        self.started_at = None
         self.reset_game()
     
     def reset_game(self):
         """Resetea el juego al estado inicial"""
-        self.indicators = GameConfig.INITIAL_INDICATORS.copy()
-        self.current_phase = 0
-        self.game_state = GameState.PLAYING
+        with self.lock:
+            self._reset_state()
+            self._notify_start()
+    
+    def _reset_state(self) -> None:
+        """Vuelve al estado inicial con los datos actuales, sin avisar a los listeners"""
+        self._set_indicator_specs(self.data_manager.get_indicator_specs())
         self.phases = self.data_manager.get_phases()
         self.max_phases = len(self.phases)
-        self.decision_history = {}  # Tracking de decisiones por fase: {fase_id: opcion_id}
-        self.unlocked_options = set()  # Opciones desbloqueadas: {"isla_4_E", "isla_4_F"}
-        self.applied_synergies = set()   # Sinergias ya aplicadas para evitar duplicados
+        self.state = initial_state(self.get_compiled_scenario())
+        self.started_at = time.time()
     
-    def get_current_phase(self) -> Phase:
-        """Retorna la fase actual con opciones filtradas según los unlocks"""
-        if self.current_phase < self.max_phases:
-            original_phase = self.phases[self.current_phase]
-            
-            # Filtrar decisiones según requirements y unlocks
-            filtered_decisions = []
-            for decision in original_phase.decisions:
-                if self._is_decision_available(decision):
-                    filtered_decisions.append(decision)
+    def add_listener(self, listener) -> None:
+        """Suscribe un listener de eventos y le informa la partida en curso"""
+        with self.lock:
+            self.listeners.append(listener)
+            listener.on_session_start(self.session_id, self.state)
+    
+    def remove_listener(self, listener) -> None:
+        """Cancela la suscripción (el listener da la partida por abandonada si no terminó)"""
+        with self.lock:
+            if listener in self.listeners:
+                self.listeners.remove(listener)
+                if hasattr(listener, 'on_session_end'):
+                    listener.on_session_end(self.session_id)
+    
+    def _notify_start(self) -> None:
+        for listener in self.listeners:
+            listener.on_session_start(self.session_id, self.state)
+    
+    def _notify_restored(self) -> None:
+        for listener in self.listeners:
+            if hasattr(listener, 'on_session_restored'):
+                listener.on_session_restored(self.session_id, self.state)
+            else:
+                listener.on_session_start(self.session_id, self.state)
+    
+    @property
+    def indicators(self) -> Dict[str, float]:
+        with self.lock:   # Nombres y valores de la misma versión aunque otro hilo recargue
+            return dict(zip(self.get_compiled_scenario().indicator_names, self.state.indicators))
+    
+    @property
+    def current_phase(self) -> int:
+        return self.state.phase_index
+    
+    @property
+    def game_state(self) -> GameState:
+        return self.state.status
+    
+    @property
+    def decision_history(self) -> Dict[str, bool]:
+        """Decisiones tomadas en orden (formato: {isla_X_Y: True})"""
+        return dict.fromkeys(self.state.history, True)
+    
+    @property
+    def unlocked_options(self) -> Set[str]:
+        """Opciones desbloqueadas por las decisiones tomadas: {"isla_4_E", "isla_4_F"}"""
+        scenario = self.get_compiled_scenario()
+        unlocked = set()
+        for key in self.state.history:
+            position = scenario.option_index.get(key)
+            if position is not None and scenario.phases[position[0]][position[1]].unlocks:
+                unlocked.add(scenario.phases[position[0]][position[1]].unlocks)
+        return unlocked
+    
+    @property
+    def applied_synergies(self) -> Set[str]:
+        """Sinergias activadas en la partida: {"isla_1_A_with_isla_3_B"}"""
+        scenario = self.get_compiled_scenario()
+        history = self.state.history
+        applied = set()
+        for position_in_history, key in enumerate(history):
+            position = scenario.option_index.get(key)
+            if position is None:
+                continue
+            option = scenario.phases[position[0]][position[1]]
+            if option.synergy_with is not None and option.synergy_with in history[:position_in_history]:
+                applied.add(f"{option.synergy_with}_with_{key}")
+        return applied
+    
+    def reload_phases(self) -> Optional[List[int]]:
+        """Aplica cambios de phases.json en caliente sin perder la partida en curso.
+        
+        El camino jugado se vuelve a jugar con la nueva versión (como en restore_snapshot)
+        antes de que el DataManager la adopte, así los indicadores nunca mezclan reglas de
+        dos versiones. Si el camino ya no es válido, el DataManager y la sesión siguen con
+        la versión actual y el cambio se aplica en una recarga posterior (tras reiniciar).
+        Retorna los índices de las fases modificadas, o None si no se aplicaron cambios.
+        """
+        with self.lock:
+            replayed = {}
             
-            # Crear nueva fase con decisiones filtradas
-            filtered_phase = Phase(
-                id=original_phase.id,
-                title=original_phase.title,
-                question=original_phase.question,
-                decisions=filtered_decisions
-            )
+            def accept(phases: List[Phase], indicator_specs: List[IndicatorSpec]) -> bool:
+                compiled = self._compile(phases, indicator_specs)
+                scenario = compiled[2]
+                try:
+                    replayed['state'] = simulate(scenario, self.state.history).state
+                except ValueError as e:
+                    if scenario.version != self._rejected_version:
+                        self._rejected_version = scenario.version
+                        print(f"⚠️ El camino jugado no es válido en la nueva versión ({scenario.version[:8]}): {e}. "
+                              f"La partida sigue con la versión {self.scenario_version[:8]} hasta reiniciar")
+                    return False
+                replayed['compiled'] = compiled
+                return True
             
-            return filtered_phase
-        return None
-    
-    def _is_decision_available(self, decision) -> bool:
-        """Verifica si una decisión está disponible según los requisitos"""
-        # Verificar si tiene requires y si se cumple
-        if hasattr(decision, 'requires') and decision.requires:
-            if isinstance(decision.requires, str):
-                # Formato: "isla_1_D"
-                available = decision.requires in self.decision_history
-                print(f"🔍 Opción {decision.id} requiere '{decision.requires}' - {'✅ Disponible' if available else '❌ Bloqueada'}")
-                print(f"   Historial actual: {list(self.decision_history.keys())}")
-                return available
-            elif isinstance(decision.requires, list):
-                # Formato: ["isla_2_C", "isla_3_B"]
-                missing_requirements = [req for req in decision.requires if req not in self.decision_history]
-                available = len(missing_requirements) == 0
-                print(f"🔍 Opción {decision.id} requiere {decision.requires}")
-                print(f"   Historial actual: {list(self.decision_history.keys())}")
-                if missing_requirements:
-                    print(f"   ❌ Bloqueada - Faltan: {missing_requirements}")
-                else:
-                    print("   ✅ Disponible - Todos los requisitos cumplidos")
-                return available
+            changed = self.data_manager.reload_if_changed(accept)
+            if changed is None:
+                return None
         
-        return True  # Si no tiene requires, está disponible
+            compiled, state = replayed['compiled'], replayed['state']
+            phases, indicator_specs = compiled[0], compiled[1]
+            self._rejected_version = None
+            self._set_indicator_specs(indicator_specs)
+            self.phases = phases
+            self.max_phases = len(phases)
+            self._compiled = compiled
+            self.state = state
+            return changed
     
-    def make_decision(self, decision_index: int) -> Dict:
-        """Procesa una decisión y retorna el resultado"""
-        if self.game_state != GameState.PLAYING:
-            return {'success': False, 'message': 'Juego no está activo'}
-        
-        current_phase = self.get_current_phase()
-        if not current_phase or decision_index >= len(current_phase.decisions):
-            return {'success': False, 'message': 'Decisión inválida'}
-        
-        selected_decision = current_phase.decisions[decision_index]
-        
-        # Aplicar efectos base
-        old_indicators = self.indicators.copy()
-        self.indicators = self.score_calculator.apply_decision_effects(
-            self.indicators, selected_decision.effects
-        )
-        
-        # Guardar decisión en historial (formato: isla_X_Y)
-        phase_key = f"isla_{current_phase.id}_{selected_decision.id}"
-        self.decision_history[phase_key] = True
-        print(f"📝 Decisión guardada: {phase_key}")
-        print(f"📋 Historial actual: {list(self.decision_history.keys())}")
-        
-        # Verificar y activar unlocks
-        self._check_unlocks(selected_decision)
-        
-        # Verificar y aplicar sinergias
-        synergy_effects = self._check_synergies(selected_decision)
-        if synergy_effects:
-            self.indicators = self.score_calculator.apply_decision_effects(
-                self.indicators, synergy_effects
-            )
-        
-        # Calcular cambios para mostrar
-        effects_list = self._calculate_effects_display(old_indicators, selected_decision.effects, synergy_effects)
-        
-        # Verificar estado del juego
-        critical_indicators, failed_indicators = self.score_calculator.check_critical_indicators(self.indicators)
-        
-        result = {
-            'success': True,
-            'decision_text': selected_decision.text,
-            'effects_list': effects_list,
-            'critical_indicators': critical_indicators,
-            'failed_indicators': failed_indicators
-        }
-        
-        # Verificar game over
-        if failed_indicators:
-            self.game_state = GameState.GAME_OVER
-            result['game_over'] = True
-            return result
-        
-        # Verificar si se completó el juego ANTES de incrementar la fase
-        if self.current_phase + 1 >= self.max_phases:
-            self.game_state = GameState.COMPLETED
-            result['game_completed'] = True
-        else:
-            # Solo avanzar fase si no se completó el juego
-            self.current_phase += 1
-        
-        return result
-    
-    def _check_unlocks(self, decision):
-        """Verifica y activa unlocks basados en la decisión"""
-        if hasattr(decision, 'unlocks') and decision.unlocks:
-            unlock_key = decision.unlocks
-            self.unlocked_options.add(unlock_key)
-            print(f"🔓 Desbloqueado: {unlock_key}")
-            print(f"📋 Opciones desbloqueadas actuales: {list(self.unlocked_options)}")
-        else:
-            print(f"📝 Decisión {decision.id} no tiene unlocks")
-    
-    def _check_synergies(self, decision) -> Dict[str, int]:
-        """Verifica y activa sinergias si aplican según las reglas específicas"""
-        synergy_effects = {}
-        current_phase_id = self.current_phase + 1
-        decision_id = decision.id
-        
-        print(f"🔍 Verificando sinergias para isla_{current_phase_id}_{decision_id}")
-        
-        # Verificar sinergia definida en JSON (sistema principal)
-        if hasattr(decision, 'synergy_with') and hasattr(decision, 'synergy_bonus'):
-            synergy_key = decision.synergy_with
-            print(f"   Buscando sinergia con: {synergy_key}")
-            print(f"   Decisiones en historial: {list(self.decision_history.keys())}")
+    def _set_indicator_specs(self, indicator_specs: List[IndicatorSpec]) -> None:
+        """Aplica la declaración de indicadores del escenario a los cálculos de puntaje"""
+        self.indicator_specs = indicator_specs
+        self.score_calculator.set_indicator_specs(indicator_specs)
+    
+    def get_compiled_scenario(self) -> CompiledScenario:
+        """Escenario compilado de las fases actuales (se recompila tras una recarga)"""
+        compiled = self._compiled
+        if compiled is None or compiled[0] is not self.phases or compiled[1] is not self.indicator_specs:
+            with self.lock:
+                phases, indicator_specs = self.phases, self.indicator_specs
+                compiled = self._compiled
+                if compiled is None or compiled[0] is not phases or compiled[1] is not indicator_specs:
+                    compiled = self._compile(phases, indicator_specs)
+                    self._compiled = compiled
+        return compiled[2]
+    
+    def _compile(self, phases: List[Phase], indicator_specs: List[IndicatorSpec]) -> Tuple:
+        """Compila (fases, indicadores, escenario) y registra la versión"""
+        compiled = (phases, indicator_specs, CompiledScenario.from_phases(phases, indicator_specs))
+        try:
+            self.scenario_versions.register(compiled[2])
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar la versión del escenario: {e}")
+        return compiled
+    
+    @property
+    def scenario_version(self) -> str:
+        """Versión (hash de contenido) del escenario con el que se juega"""
+        return self.get_compiled_scenario().version
+    
+    def get_state_outcome(self) -> OutcomeEntry:
+        """Opciones, estados siguientes y mejor/peor puntaje alcanzable desde el estado actual (aproximado si outcome.complete es False)"""
+        with self.lock:
+            scenario, state = self.get_compiled_scenario(), self.state
+        # La búsqueda corre sin el lock: no demora las decisiones de la sesión
+        return GameTreeSolver(scenario, self.outcome_cache).solve(state.phase_index, state.history_set, state.indicators)
+    
+    def get_current_phase(self) -> Phase:
+        """Retorna la fase actual con opciones filtradas según los requisitos"""
+        with self.lock:
+            if self.current_phase < self.max_phases:
+                original_phase = self.phases[self.current_phase]
+                available = self.get_compiled_scenario().available_options(self.current_phase, self.state.history_set)
             
-            # Verificar si la condición de sinergia se cumple
-            if synergy_key in self.decision_history:
-                synergy_id = f"{synergy_key}_with_isla_{current_phase_id}_{decision_id}"
-                
-                # Aplicar sinergia solo una vez
-                if synergy_id not in self.applied_synergies:
-                    synergy_effects = decision.synergy_bonus.copy()
-                    self.applied_synergies.add(synergy_id)
-                    print(f"✨ Sinergia activada: {synergy_key} + isla_{current_phase_id}_{decision_id}")
-                    print(f"   Efectos: {synergy_effects}")
-                else:
-                    print(f"⚠️ Sinergia {synergy_id} ya fue aplicada anteriormente")
-            else:
-                print(f"❌ Sinergia NO activada: {synergy_key} no encontrado en historial")
-        else:
-            print("   No tiene sinergia definida")
+                # Crear nueva fase con decisiones filtradas
+                return Phase(
+                    id=original_phase.id,
+                    title=original_phase.title,
+                    question=original_phase.question,
+                    decisions=[original_phase.decisions[index] for index in available],
+                    context=original_phase.context
+                )
+            return None
+    
+    def get_available_decisions(self, phase_index: int, history) -> List[Decision]:
+        """Retorna las decisiones disponibles de una fase para un historial dado, sin modificar el estado"""
+        with self.lock:
+            if not 0 <= phase_index < len(self.phases):
+                return []
+            available = self.get_compiled_scenario().available_options(phase_index, frozenset(history))
+            return [self.phases[phase_index].decisions[index] for index in available]
+    
+    def project_decision(self, indicators: Dict[str, float], history, phase_index: int,
+                         decision: Decision) -> Tuple[Dict[str, float], frozenset, Dict[str, int], List[str]]:
+        """Proyecta una decisión con las mismas reglas que make_decision (logic.simulation.step).
+        
+        Retorna (indicadores proyectados, historial proyectado, efectos de sinergia, indicadores fallidos)
+        sin modificar el estado del juego.
+        """
+        scenario = self.get_compiled_scenario()
+        state = SimulationState(phase_index, scenario.indicator_vector(indicators), tuple(history))
+        new_state, outcome = step(scenario, state, decision.id)
         
-        return synergy_effects
+        names = scenario.indicator_names
+        synergy_effects = decision.synergy_bonus.copy() if outcome.synergy_applied else {}
+        failed_indicators = [names[i] for i in outcome.failed]
+        return dict(zip(names, new_state.indicators)), new_state.history_set, synergy_effects, failed_indicators
     
-    def _calculate_effects_display(self, old_indicators: Dict[str, float], 
-                                 base_effects: Dict[str, int], 
-                                 synergy_effects: Dict[str, int] = None) -> List[str]:
-        """Calcula la lista de efectos para mostrar, incluyendo sinergias"""
-        effects_list = []
+    def make_decision(self, decision_index: int) -> 'DecisionResult':
+        """Procesa una decisión y retorna el resultado"""
+        with self.lock:
+            if self.game_state != GameState.PLAYING:
+                return DecisionResult.failure('Juego no está activo')
         
-        # Combinar efectos base y de sinergia
-        all_effects = base_effects.copy()
-        if synergy_effects:
-            for indicator, value in synergy_effects.items():
-                all_effects[indicator] = all_effects.get(indicator, 0) + value
+            scenario = self.get_compiled_scenario()
+            try:
+                self.state, outcome = step(scenario, self.state, decision_index)
+            except ValueError:
+                return DecisionResult.failure('Decisión inválida')
+            for listener in self.listeners:
+                listener.on_step(self.session_id, outcome)
         
-        for indicator, change in all_effects.items():
-            if indicator in old_indicators:
-                old_value = old_indicators[indicator]
-                new_value = self.indicators[indicator]
-                
-                synergy_note = ""
-                if synergy_effects and indicator in synergy_effects:
-                    synergy_change = synergy_effects[indicator]
-                    synergy_note = f" (✨+{synergy_change} sinergia)"
-                
-                if change > 0:
-                    effects_list.append(f"📈 {indicator}: +{change}% ({old_value:.1f}% → {new_value:.1f}%){synergy_note}")
-                elif change < 0:
-                    effects_list.append(f"📉 {indicator}: {change}% ({old_value:.1f}% → {new_value:.1f}%){synergy_note}")
+            selected_decision = self.phases[outcome.phase_index].decisions[outcome.option_index]
         
-        return effects_list
+            return DecisionResult(
+                decision_text=selected_decision.text,
+                option_key=outcome.option_key,
+                indicator_names=scenario.indicator_names,
+                previous_indicators=outcome.previous_indicators,
+                indicators=outcome.indicators,
+                base_effects=selected_decision.effects,
+                synergy_effects=selected_decision.synergy_bonus if outcome.synergy_applied else {},
+                critical=outcome.critical,
+                failed=outcome.failed,
+                status=outcome.status
+            )
     
     def get_final_results(self) -> Dict:
         """Calcula y retorna los resultados finales"""
-        avg_score, category, message, color = self.score_calculator.calculate_final_score(self.indicators)
+        with self.lock:
+            avg_score, category, message, color = self.score_calculator.calculate_final_score(self.indicators)
         
-        return {
-            'avg_score': avg_score,
-            'category': category,
-            'message': message,
-            'color': color,
-            'indicators': self.indicators.copy()
-        }
+            return {
+                'avg_score': avg_score,
+                'category': category,
+                'message': message,
+                'color': color,
+                'indicators': self.indicators,
+                'path': list(self.state.history),
+                'game_over': self.game_state == GameState.GAME_OVER,
+                'scenario_version': self.scenario_version,
+                'started_at': self.started_at,
+                'finished_at': time.time()
+            }
+    
+    def get_snapshot(self) -> Dict:
+        """Retorna una copia serializable del estado de la partida (para autoguardado)"""
+        with self.lock:
+            return {
+                'version': 1,
+                'scenario_version': self.scenario_version,
+                'indicators': self.indicators,
+                'current_phase': self.current_phase,
+                'game_state': self.game_state.value,
+                'decision_history': list(self.state.history),
+                'unlocked_options': sorted(self.unlocked_options),
+                'applied_synergies': sorted(self.applied_synergies),
+                'started_at': self.started_at
+            }
+    
+    def restore_snapshot(self, snapshot: Dict) -> None:
+        """Restaura el estado de una partida a partir de un snapshot de get_snapshot.
+        
+        Si el snapshot se tomó con otra versión del escenario, el camino se vuelve a
+        jugar con la versión actual (ValueError si ya no es válido), para que la partida
+        nunca mezcle reglas de dos versiones.
+        """
+        with self.lock:
+            self._reset_state()
+            scenario = self.get_compiled_scenario()
+            saved_version = snapshot.get('scenario_version')
+            if saved_version is not None and saved_version != scenario.version:
+                print(f"⚠️ La partida guardada usa otra versión del escenario ({saved_version[:8]}); "
+                      f"se vuelve a jugar con la actual ({scenario.version[:8]})")
+                try:
+                    self.state = simulate(scenario, snapshot['decision_history']).state
+                except ValueError as e:
+                    self._notify_start()   # No se reanuda: queda una partida nueva
+                    raise ValueError(f"El camino guardado no es válido en la versión actual: {e}") from None
+            else:
+                saved = snapshot['indicators']
+                # unlocked_options y applied_synergies se derivan del historial
+                self.state = SimulationState(
+                    phase_index=min(snapshot['current_phase'], self.max_phases),
+                    indicators=tuple(
+                        float(saved.get(name, initial))
+                        for name, initial in zip(scenario.indicator_names, scenario.initial_indicators)
+                    ),
+                    history=tuple(snapshot['decision_history']),
+                    status=GameState(snapshot['game_state'])
+                )
+            self.started_at = snapshot.get('started_at', self.started_at)
+            self._notify_restored()
     
     def get_indicators(self) -> Dict[str, float]:
         """Retorna los indicadores actuales"""
-        return self.indicators.copy()
+        return self.indicators
     
     def get_game_info(self) -> Dict:
         """Retorna información general del juego"""
-        return {
-            'current_phase': self.current_phase,
-            'max_phases': self.max_phases,
-            'game_state': self.game_state,
-            'indicators': self.get_indicators()
-        }
\ No newline at end of file
+        with self.lock:
+            return {
+                'current_phase': self.current_phase,
+                'max_phases': self.max_phases,
+                'game_state': self.game_state,
+                'indicators': self.get_indicators(),
+                'indicator_specs': self.indicator_specs
+            }
@@ -0,0 +1,270 @@
+"""Servicio de juego sin interfaz: sesiones de GameEngine detrás de una API JSON por HTTP.
+
+Endpoints (cuerpos y respuestas en JSON):
+    POST   /sessions                   crea una sesión y retorna su estado
+    GET    /sessions/<id>              fase actual, opciones disponibles e indicadores
+    GET    /sessions/<id>/preview      indicadores proyectados de cada opción disponible
+    POST   /sessions/<id>/decision     {"index": n} (posición entre las disponibles)
+    GET    /sessions/<id>/results      resultados finales (get_final_results)
+    DELETE /sessions/<id>              cierra la sesión
+    GET    /stats                      sesiones en memoria y en disco, solicitudes y memoria del proceso
+
+Las sesiones viven en un logic.session_manager.SessionManager: solo las recientes
+quedan en memoria y las inactivas se guardan en disco y se rehidratan en la
+siguiente solicitud. Cada sesión tiene su propio lock: las solicitudes a una misma
+sesión se atienden en orden y las de sesiones distintas en paralelo (un hilo por
+conexión). Las conexiones son HTTP/1.1 persistentes, así que un cliente puede
+reutilizarlas.
+
+Uso:
+    python -m logic.game_service [--port 8770] [--scenario data/phases.json] [--max-active 500] [--idle 300]
+"""
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from config.settings import GameState
+from data.session_store import SessionStore
+from logic.game_engine import GameEngine
+from logic.session_manager import SessionManager, UnknownSessionError
+
+DEFAULT_PORT = 8770
+
+def process_memory() -> Optional[int]:
+    """Memoria residente actual del proceso en bytes (None si la plataforma no la informa)"""
+    try:
+        with open('/proc/self/statm', 'rb') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None   # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024   # Máximo, no actual: aproximación
+
+class GameService:
+    """Sesiones de juego servidas como dicts serializables (logic.session_manager).
+
+    Los métodos lanzan UnknownSessionError si la sesión no existe y ValueError si la
+    solicitud no es válida. Los motores no escriben nada por decisión; el log de
+    decisiones (--verbose) lo instala el SessionManager con decision_log.
+    """
+
+    def __init__(self, data_path: str = None, sessions: SessionManager = None):
+        self.sessions = sessions if sessions is not None else SessionManager(data_path)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def create_session(self) -> Dict:
+        with self.sessions.session(self.sessions.create()) as engine:
+            return self._state(engine)
+
+    def get_state(self, session_id: str) -> Dict:
+        with self.sessions.session(session_id) as engine:
+            return self._state(engine)
+
+    def preview(self, session_id: str) -> Dict:
+        """Proyección de cada opción disponible con las reglas de make_decision"""
+        with self.sessions.session(session_id) as engine:
+            if engine.game_state != GameState.PLAYING:
+                raise ValueError("La partida ya terminó")
+            scenario = engine.get_compiled_scenario()
+            history = engine.state.history_set
+            options = []
+            for decision in engine.get_current_phase().decisions:
+                indicators, _, _, failed = engine.project_decision(
+                    engine.indicators, history, engine.current_phase, decision
+                )
+                options.append({
+                    'id': decision.id,
+                    'indicators': indicators,
+                    'score': scenario.score(scenario.indicator_vector(indicators)),
+                    'game_over': bool(failed)
+                })
+            return {'session_id': session_id, 'options': options}
+
+    def decide(self, session_id: str, index: int) -> Dict:
+        if not isinstance(index, int) or isinstance(index, bool):
+            raise ValueError("'index' debe ser un entero")
+        with self.sessions.session(session_id) as engine:
+            result = engine.make_decision(index)
+            if not result.success:
+                raise ValueError(result.message)
+            return {
+                'decision': result.decision_text,
+                'effects': result.format_effects(),
+                'critical': result.critical_indicators,
+                'failed': result.failed_indicators,
+                'state': self._state(engine)
+            }
+
+    def results(self, session_id: str) -> Dict:
+        with self.sessions.session(session_id) as engine:
+            return engine.get_final_results()
+
+    def close_session(self, session_id: str) -> Dict:
+        self.sessions.close(session_id)
+        return {'session_id': session_id, 'closed': True}
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def stats(self) -> Dict:
+        return {
+            **self.sessions.stats(),
+            'requests': self.requests,
+            'memory_bytes': process_memory(),
+            'threads': threading.active_count()
+        }
+
+    @staticmethod
+    def _state(engine: GameEngine) -> Dict:
+        phase = engine.get_current_phase() if engine.game_state == GameState.PLAYING else None
+        return {
+            'session_id': engine.session_id,
+            'status': engine.game_state.value,
+            'phase_index': engine.current_phase,
+            'max_phases': engine.max_phases,
+            'indicators': engine.indicators,
+            'phase': {
+                'title': phase.title,
+                'question': phase.question,
+                'options': [{'id': decision.id, 'text': decision.text, 'strategy_type': decision.strategy_type}
+                            for decision in phase.decisions]
+            } if phase else None
+        }
+
+class _GameServer(ThreadingHTTPServer):
+    request_queue_size = 1024   # Muchos jugadores conectándose a la vez en la prueba de carga
+
+def start_game_server(service: GameService, host: str = '127.0.0.1', port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Sirve la API del servicio (hilo en segundo plano); port=0 elige un puerto libre"""
+
+    class GameServiceHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'   # Conexiones persistentes
+        # Encabezados y cuerpo salen en un solo envío y sin Nagle: en una conexión
+        # persistente, escribirlos por separado esperaba el ACK diferido del cliente (~40 ms)
+        disable_nagle_algorithm = True
+        wbufsize = 64 * 1024
+
+        def _reply(self, status: int, payload: Dict) -> None:
+            body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _body(self) -> Dict:
+            try:
+                payload = json.loads(self._raw_body or b'{}')
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                raise ValueError("Cuerpo JSON inválido") from None
+            if not isinstance(payload, dict):
+                raise ValueError("Se esperaba un objeto JSON")
+            return payload
+
+        def _dispatch(self, method: str, parts: List[str]) -> Optional[Dict]:
+            if parts == ['stats'] and method == 'GET':
+                return service.stats()
+            if parts == ['sessions'] and method == 'POST':
+                return service.create_session()
+            if parts[:1] != ['sessions'] or len(parts) not in (2, 3):
+                return None
+            session_id, action = parts[1], parts[2] if len(parts) == 3 else ''
+            if (method, action) == ('GET', ''):
+                return service.get_state(session_id)
+            if (method, action) == ('DELETE', ''):
+                return service.close_session(session_id)
+            if (method, action) == ('GET', 'preview'):
+                return service.preview(session_id)
+            if (method, action) == ('GET', 'results'):
+                return service.results(session_id)
+            if (method, action) == ('POST', 'decision'):
+                body = self._body()
+                if 'index' not in body:
+                    raise ValueError("Falta 'index'")
+                return service.decide(session_id, body['index'])
+            return None
+
+        def _route(self, method: str) -> None:
+            service.count_request()
+            # El cuerpo se lee siempre: en una conexión persistente lo que quede sin
+            # leer se mezclaría con la solicitud siguiente
+            self._raw_body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            try:
+                payload = self._dispatch(method, [part for part in self.path.split('?', 1)[0].split('/') if part])
+            except UnknownSessionError as e:
+                self._reply(404, {'error': f"Sesión desconocida: {e.session_id}"})
+            except ValueError as e:
+                self._reply(400, {'error': str(e)})
+            except Exception as e:
+                self._reply(500, {'error': f"{type(e).__name__}: {e}"})
+            else:
+                if payload is None:
+                    self._reply(404, {'error': f"Ruta desconocida: {method} {self.path}"})
+                else:
+                    self._reply(200, payload)
+
+        def do_GET(self):
+            self._route('GET')
+
+        def do_POST(self):
+            self._route('POST')
+
+        def do_DELETE(self):
+            self._route('DELETE')
+
+        def log_message(self, format, *args):
+            pass   # Sin una línea de log por solicitud
+
+    server = _GameServer((host, port), GameServiceHandler)
+    threading.Thread(target=server.serve_forever, name='game-service-http', daemon=True).start()
+    return server
+
+def main(argv: List[str]) -> int:
+    """Aloja sesiones de juego por HTTP hasta que se interrumpe el proceso"""
+    parser = argparse.ArgumentParser(description="Servicio de juego sin interfaz (API JSON por HTTP)")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="0 elige un puerto libre")
+    parser.add_argument('--max-active', type=int, default=None, help="sesiones máximas en memoria")
+    parser.add_argument('--idle', type=float, default=None, help="segundos sin solicitudes antes de guardar una sesión en disco")
+    parser.add_argument('--sessions-db', default=None, help="base de sesiones guardadas (data.session_store)")
+    parser.add_argument('--verbose', action='store_true', help="muestra los logs de cada decisión")
+    args = parser.parse_args(argv)
+
+    sessions = SessionManager(args.scenario, SessionStore(args.sessions_db), args.max_active, args.idle,
+                              decision_log=args.verbose)
+    service = GameService(sessions=sessions)
+    service.close_session(service.create_session()['session_id'])   # Compila el escenario antes de atender
+    sessions.start_sweeper()
+    server = start_game_server(service, args.host, args.port)
+    host, port = server.server_address[:2]
+    print(f"🌐 Servicio de juego en http://{host}:{port}", flush=True)
+    # Al terminar (Ctrl+C o SIGTERM) las sesiones en memoria se guardan para retomarlas
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        while True:
+            time.sleep(3600)
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.shutdown()
+        saved = sessions.shutdown(persist=True)
+    print(f"👋 Servicio detenido ({saved:,} sesiones guardadas para retomarlas)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
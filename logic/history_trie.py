@@ -0,0 +1,295 @@
+"""Almacén de historiales de una cohorte como trie de prefijos compartidos.
+
+Cada nodo es una decisión tomada tras un prefijo de decisiones; los estudiantes que
+comparten prefijo comparten nodos, de modo que la memoria crece con la cantidad de
+caminos distintos y no con la cantidad de sesiones. Cada nodo guarda los
+indicadores a los que lleva su prefijo (calculados una vez al crearlo) y totales de
+las partidas terminadas que pasan por él (cantidad, game overs, suma de puntajes y
+de indicadores finales), así que consultas como "resultados de todos los que
+eligieron isla_1_D y luego isla_3_A" solo visitan los nodos hasta la última fase
+consultada.
+
+Uso:
+    python -m logic.history_trie --db ~/.rincon_de_amaru/results.db --cohort 2025-A --query isla_1_D isla_3_A
+    python -m logic.history_trie --replay partidas.rpl --next isla_1_D
+    python -m logic.history_trie --simulate 100000 --query isla_1_D isla_3_A
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from logic.compiled_scenario import CompiledScenario
+
+class _TrieNode:
+    """Decisión tomada tras el prefijo del nodo padre"""
+    __slots__ = ('children', 'indicators', 'failed', 'sessions', 'finished',
+                 'game_overs', 'score_sum', 'indicator_sums')
+
+    def __init__(self, indicators: Tuple[float, ...], failed: bool = False):
+        self.children = {}                  # Índice de opción en la fase siguiente -> nodo
+        self.indicators = indicators        # Indicadores tras el prefijo
+        self.failed = failed                # El prefijo termina en game over
+        self.sessions = 0                   # Sesiones cuyo camino pasa por el nodo
+        self.finished = 0                   # ...y ya terminaron (completadas o game over)
+        self.game_overs = 0
+        self.score_sum = 0.0                # Sumas de las partidas terminadas
+        self.indicator_sums = None
+
+@dataclass(frozen=True)
+class CohortOutcome:
+    """Resultados agregados de las sesiones que cumplen una consulta"""
+    sessions: int
+    finished: int
+    game_overs: int
+    average_score: Optional[float]
+    average_indicators: Dict[str, float]    # Indicadores finales promedio de las terminadas
+    matched_nodes: int
+
+    @property
+    def game_over_rate(self) -> float:
+        return self.game_overs / self.finished if self.finished else 0.0
+
+class HistoryTrie:
+    """Historiales de decisiones de una cohorte con prefijos compartidos"""
+
+    def __init__(self, scenario: CompiledScenario):
+        self.scenario = scenario
+        self.root = _TrieNode(scenario.initial_indicators)
+        self.node_count = 1
+        self.sessions = 0
+
+    def add(self, path: Sequence[str]) -> None:
+        """Agrega el camino de una sesión (claves isla_X_Y en orden)"""
+        choices = []
+        for phase_index, key in enumerate(path):
+            position = self.scenario.option_index.get(key)
+            if position is None or position[0] != phase_index:
+                raise ValueError(f"{key} no es una opción de la fase {phase_index + 1}")
+            choices.append(position[1])
+        self.add_choices(choices)
+
+    def add_choices(self, choices: Sequence[int]) -> None:
+        """Agrega un camino como índices de opción por fase (p. ej. un ReplayRecord)"""
+        scenario = self.scenario
+        node = self.root
+        nodes = [node]
+        history = frozenset()
+        for phase_index, option_index in enumerate(choices):
+            if node.failed or phase_index >= scenario.max_phases:
+                raise ValueError("El camino continúa después del final de la partida")
+            child = node.children.get(option_index)
+            if child is None:
+                if option_index not in scenario.available_options(phase_index, history):
+                    raise ValueError(f"Opción {option_index} no disponible en la fase {phase_index + 1}")
+                indicators, failed = scenario.apply_option(node.indicators, history, phase_index, option_index)
+                child = node.children[option_index] = _TrieNode(indicators, failed)
+                self.node_count += 1
+            history = history | {scenario.phases[phase_index][option_index].key}
+            node = child
+            nodes.append(node)
+
+        finished = node.failed or len(choices) == scenario.max_phases
+        score = scenario.score(node.indicators) if finished else 0.0
+        for visited in nodes:
+            visited.sessions += 1
+            if finished:
+                visited.finished += 1
+                visited.game_overs += node.failed
+                visited.score_sum += score
+                if visited.indicator_sums is None:
+                    visited.indicator_sums = list(node.indicators)
+                else:
+                    for i, value in enumerate(node.indicators):
+                        visited.indicator_sums[i] += value
+        self.sessions += 1
+
+    def add_many(self, paths: Iterable[Sequence[str]]) -> int:
+        """Agrega varios caminos; retorna cuántos se agregaron"""
+        count = 0
+        for path in paths:
+            self.add(path)
+            count += 1
+        return count
+
+    def _constraints(self, keys: Sequence[str]) -> Dict[int, int]:
+        constraints = {}
+        for key in keys:
+            position = self.scenario.option_index.get(key)
+            if position is None:
+                raise ValueError(f"Opción desconocida: {key}")
+            if constraints.get(position[0], position[1]) != position[1]:
+                return {}   # Dos opciones de la misma fase: ninguna sesión cumple
+            constraints[position[0]] = position[1]
+        return constraints
+
+    def matching_nodes(self, keys: Sequence[str]) -> List[_TrieNode]:
+        """Nodos de la última fase consultada cuyos caminos incluyen todas las claves"""
+        constraints = self._constraints(keys)
+        if not constraints and keys:
+            return []
+        last_phase = max(constraints, default=-1)
+        frontier = [self.root]
+        for phase_index in range(last_phase + 1):
+            option_index = constraints.get(phase_index)
+            if option_index is None:
+                frontier = [child for node in frontier for child in node.children.values()]
+            else:
+                frontier = [node.children[option_index] for node in frontier if option_index in node.children]
+        return frontier
+
+    def query(self, *keys: str) -> CohortOutcome:
+        """Resultados de las sesiones que eligieron todas las opciones dadas (en cualquier fase)"""
+        nodes = self.matching_nodes(keys)
+        sessions = sum(node.sessions for node in nodes)
+        finished = sum(node.finished for node in nodes)
+        indicator_sums = [0.0] * len(self.scenario.indicator_names)
+        for node in nodes:
+            if node.indicator_sums is not None:
+                for i, value in enumerate(node.indicator_sums):
+                    indicator_sums[i] += value
+        return CohortOutcome(
+            sessions=sessions,
+            finished=finished,
+            game_overs=sum(node.game_overs for node in nodes),
+            average_score=sum(node.score_sum for node in nodes) / finished if finished else None,
+            average_indicators={
+                name: total / finished for name, total in zip(self.scenario.indicator_names, indicator_sums)
+            } if finished else {},
+            matched_nodes=len(nodes)
+        )
+
+    def _prefix_node(self, path: Sequence[str]) -> Optional[_TrieNode]:
+        """Nodo de un prefijo exacto (fases 1..k en orden); None si nadie lo jugó"""
+        node = self.root
+        for phase_index, key in enumerate(path):
+            position = self.scenario.option_index.get(key)
+            if position is None or position[0] != phase_index:
+                raise ValueError(f"{key} no es una opción de la fase {phase_index + 1}: "
+                                 f"un prefijo exacto recorre las fases en orden")
+            node = node.children.get(position[1])
+            if node is None:
+                return None
+        return node
+
+    def indicators_after(self, path: Sequence[str]) -> Optional[Dict[str, float]]:
+        """Indicadores guardados en el nodo de un prefijo exacto (None si nadie lo jugó)"""
+        node = self._prefix_node(path)
+        return dict(zip(self.scenario.indicator_names, node.indicators)) if node is not None else None
+
+    def next_choices(self, path: Sequence[str] = ()) -> Dict[str, int]:
+        """Cuántas sesiones eligieron cada opción de la fase siguiente a un prefijo exacto"""
+        node = self._prefix_node(path)
+        if node is None:
+            return {}
+        phase_index = len(path)
+        return {
+            self.scenario.phases[phase_index][option_index].key: child.sessions
+            for option_index, child in sorted(node.children.items(), key=lambda item: -item[1].sessions)
+        }
+
+    def memory_bytes(self) -> int:
+        """Tamaño aproximado de los nodos en memoria"""
+        total = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            total += sys.getsizeof(node) + sys.getsizeof(node.children) + sys.getsizeof(node.indicators)
+            if node.indicator_sums is not None:
+                total += sys.getsizeof(node.indicator_sums)
+            stack.extend(node.children.values())
+        return total
+
+def _format_outcome(title: str, outcome: CohortOutcome) -> str:
+    lines = [f"🔎 {title}: {outcome.sessions:,} sesiones ({outcome.finished:,} terminadas, "
+             f"{outcome.game_over_rate:.1%} game over, {outcome.matched_nodes} nodos)"]
+    if outcome.average_score is not None:
+        lines.append(f"   🏆 Puntaje promedio: {outcome.average_score:.1f}")
+        lines.append("   📊 " + "  ".join(f"{name}: {value:.1f}" for name, value in outcome.average_indicators.items()))
+    return "\n".join(lines)
+
+def main(argv: List[str]) -> int:
+    """Carga los historiales de una cohorte y responde consultas por decisiones"""
+    # Import local: la CLI necesita las fuentes de datos, el trie solo el escenario compilado
+    import random
+    import time
+    from data.data_manager import DataManager
+    from data.replay_log import ReplayReader
+    from data.results_store import ResultsStore
+    from logic.scenario_versions import get_scenario_versions
+    from logic.simulation import available_choices, initial_state, step
+
+    parser = argparse.ArgumentParser(description="Historiales de una cohorte con prefijos compartidos")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--db', help="base de resultados (data.results_store)")
+    source.add_argument('--replay', help="registro de partidas .rpl (data.replay_log)")
+    source.add_argument('--simulate', type=int, help="cantidad de partidas al azar")
+    parser.add_argument('--cohort', default=None, help="filtra la base de resultados por cohorte")
+    parser.add_argument('--version', default=None,
+                        help="versión del escenario de las partidas de la base (por defecto, la actual)")
+    parser.add_argument('--query', nargs='+', default=None, help="claves isla_X_Y que deben estar en el camino")
+    parser.add_argument('--next', nargs='*', default=None, help="prefijo exacto: muestra la decisión siguiente")
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.scenario)
+    scenario = CompiledScenario.from_phases(data_manager.get_phases(), data_manager.get_indicator_specs())
+    versions = get_scenario_versions()
+    versions.register(scenario)
+
+    # Los caminos se interpretan con la versión del escenario con la que se jugaron
+    reader = store = None
+    version = scenario.version
+    if args.db:
+        store = ResultsStore(args.db)
+        version = args.version or version
+        others = {v: n for v, n in store.scenario_versions(args.cohort).items() if v != version}
+        if others:
+            print("ℹ️ Se omiten partidas de otras versiones: "
+                  + "  ".join(f"{v[:8] or 'sin versión'}: {n:,}" for v, n in others.items()))
+    elif args.replay:
+        reader = ReplayReader(args.replay)
+        version = reader.version
+    try:
+        trie = HistoryTrie(versions.get(version) if version != scenario.version else scenario)
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        return 1
+
+    started = time.perf_counter()
+    if store:
+        trie.add_many(store.paths(cohort=args.cohort, scenario_version=version))
+        store.close()
+    elif reader:
+        with reader:
+            for choices in reader.iter_choices():
+                trie.add_choices(choices)
+    else:
+        rng = random.Random(0)
+        for _ in range(args.simulate):
+            state = initial_state(trie.scenario)
+            choices = []
+            while not state.finished:
+                state, outcome = step(trie.scenario, state,
+                                      rng.randrange(len(available_choices(trie.scenario, state))))
+                choices.append(outcome.option_index)
+            trie.add_choices(choices)
+    elapsed = time.perf_counter() - started
+
+    print(f"🌳 Versión {version[:8]}: {trie.sessions:,} sesiones en {trie.node_count:,} nodos "
+          f"(~{trie.memory_bytes() / 1024:.0f} KiB, cargadas en {elapsed:.2f} s)")
+    print(_format_outcome("Todas", trie.query()))
+    if args.query:
+        print(_format_outcome(" + ".join(args.query), trie.query(*args.query)))
+    if args.next is not None:
+        prefix = " → ".join(args.next) or "inicio"
+        try:
+            choices = trie.next_choices(args.next)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+        print(f"➡️ Después de {prefix}: " + ("  ".join(f"{key}: {count:,}" for key, count in choices.items())
+                                           or "sin sesiones"))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
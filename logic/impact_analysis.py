@@ -0,0 +1,521 @@
+"""Atribución del impacto de cada decisión sobre el resultado final.
+
+Considera todos los caminos legales del escenario y calcula, para cada opción de
+cada isla:
+
+- Media condicional: puntaje medio y tasa de game over de los caminos que la
+  eligen, comparados con todos los caminos que llegan a esa isla.
+- Shapley: contribución marginal promedio de la opción al puntaje final y al
+  game over dentro de cada camino, promediada sobre los caminos que la eligen.
+
+Los caminos que terminan en game over puntúan con los indicadores que tenían al
+terminar. El trabajo se reparte por prefijos entre procesos.
+
+Las medias condicionales son exactas mientras el grafo de estados equivalentes
+(historial relevante e indicadores, como en GameTreeSolver) de cada tarea no
+supere su parte de IMPACT_STATE_BUDGET transiciones: los caminos que llegan a un
+mismo estado se cuentan juntos, fase por fase y sin recursión. Si la supera, la
+tarea estima las medias con recorridos aleatorios ponderados (IMPACT_SAMPLE_STEPS
+aplicaciones de opciones en total, al menos IMPACT_MIN_WALKS recorridos) y el
+reporte lo indica.
+
+Shapley cuesta 2^n coaliciones por camino, así que se calcula sobre una muestra
+de caminos (uniforme en el modo exacto, ponderada en el estimado) acotada por
+SHAPLEY_WORK_BUDGET; los caminos de la muestra se recorren ordenados y las
+coaliciones de cada prefijo común se calculan una sola vez.
+
+Uso:
+    python -m logic.impact_analysis [--scenario data/phases.json] [--workers 4]
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from logic.compiled_scenario import CompiledScenario
+
+SHAPLEY_EXACT_MAX = 10     # Hasta esta cantidad de decisiones por camino se calcula Shapley exacto
+SHAPLEY_SAMPLES = 64       # Permutaciones muestreadas para caminos más largos
+SHAPLEY_WORK_BUDGET = 600_000  # Aplicaciones de opciones para Shapley; define cuántos caminos se muestrean
+SHAPLEY_MIN_PATHS = 64     # Caminos muestreados como mínimo aunque el presupuesto no alcance
+IMPACT_STATE_BUDGET = 100_000  # Transiciones entre estados equivalentes para las medias exactas
+IMPACT_SAMPLE_STEPS = 200_000  # Aplicaciones de opciones para estimar las medias si no alcanza
+IMPACT_MIN_WALKS = 1_000   # Recorridos aleatorios como mínimo aunque el escenario sea muy largo
+METHODS = ('conditional', 'shapley', 'both')
+
+@dataclass
+class OptionImpact:
+    """Atribución de una opción de una isla"""
+    phase_index: int
+    option_key: str
+    decision_id: str
+    paths: int
+    mean_score: Optional[float]
+    score_delta: Optional[float]          # Media condicional vs. caminos que llegan a la isla
+    game_over_rate: Optional[float]
+    game_over_delta: Optional[float]
+    shapley_score: Optional[float] = None
+    shapley_game_over: Optional[float] = None
+
+@dataclass
+class ImpactReport:
+    """Resultado del análisis de impacto sobre todos los caminos legales"""
+    total_paths: int
+    mean_score: float
+    game_over_rate: float
+    options: List[OptionImpact] = field(default_factory=list)
+    elapsed: float = 0.0
+    exact: bool = True                    # False: medias estimadas con recorridos aleatorios
+    walks: int = 0
+    shapley_paths: int = 0
+
+    def format_table(self) -> str:
+        """Tabla legible con la atribución de cada opción"""
+        if self.exact:
+            bound = "medias exactas"
+        else:
+            bound = (f"medias estimadas con {self.walks} recorridos: el cálculo exacto supera "
+                     f"{IMPACT_STATE_BUDGET} transiciones")
+        lines = [
+            f"📊 {'' if self.exact else '≈'}{_fmt_count(self.total_paths)} caminos legales - puntaje medio "
+            f"{self.mean_score:.2f} - game over {self.game_over_rate:.1%} ({self.elapsed:.2f} s)",
+            f"   {bound}" + (f"; Shapley sobre una muestra de hasta {self.shapley_paths} caminos"
+                             if self.shapley_paths else ""),
+            f"{'Opción':<12}{'Caminos':>9}{'Puntaje':>9}{'Δ media':>9}{'GameOver':>10}"
+            f"{'Δ GO':>8}{'Shapley':>9}{'Sh. GO':>8}"
+        ]
+        for impact in self.options:
+            lines.append(
+                f"{impact.option_key:<12}{_fmt_count(impact.paths):>9}"
+                f"{_fmt(impact.mean_score, '.2f'):>9}{_fmt(impact.score_delta, '+.2f'):>9}"
+                f"{_fmt(impact.game_over_rate, '.1%'):>10}{_fmt(impact.game_over_delta, '+.1%'):>8}"
+                f"{_fmt(impact.shapley_score, '+.2f'):>9}{_fmt(impact.shapley_game_over, '+.2f'):>8}"
+            )
+        return "\n".join(lines)
+
+def _fmt(value: Optional[float], spec: str) -> str:
+    return "-" if value is None else format(value, spec)
+
+def _fmt_count(value: int) -> str:
+    """Cantidad de caminos; las enormes en notación científica (no caben en un float)"""
+    digits = len(str(value))
+    if digits <= 8:
+        return str(value)
+    return f"{value // 10 ** (digits - 3) / 100:.2f}e{digits - 1}"
+
+class _Accumulator:
+    """Cantidades y medias parciales combinables entre procesos.
+
+    Cada estadística es [caminos, puntaje medio, tasa de game over]; se guardan
+    medias en lugar de sumas porque la cantidad de caminos de un escenario largo
+    no cabe en un float.
+    """
+
+    def __init__(self):
+        self.total = [0, 0.0, 0.0]
+        self.phases = {}             # fase -> caminos que la alcanzan
+        # (fase, opción) -> caminos que la eligen + [peso de la muestra Shapley, shapley, shapley GO]
+        self.options = {}
+        self.exact = True            # False si alguna tarea estimó con recorridos aleatorios
+        self.walks = 0               # Recorridos aleatorios de las tareas estimadas
+
+    def add_path(self, path: Sequence[Tuple[int, int]], score: float, game_over: bool, weight: int = 1):
+        """Suma un camino terminado que representa a `weight` caminos"""
+        go = 1.0 if game_over else 0.0
+        _merge_stats(self.total, 0, weight, score, go)
+        for choice in path:
+            _merge_stats(self.phases.setdefault(choice[0], [0, 0.0, 0.0]), 0, weight, score, go)
+            _merge_stats(self._option(choice), 0, weight, score, go)
+
+    def add_shapley(self, path: Tuple[Tuple[int, int], ...], shapley: List[Tuple[float, float]], weight: int):
+        """Suma los valores de Shapley de un camino muestreado que representa a `weight` caminos"""
+        for choice, (score, go) in zip(path, shapley):
+            _merge_stats(self._option(choice), 3, weight, score, go)
+
+    def _option(self, choice: Tuple[int, int]) -> list:
+        return self.options.setdefault(choice, [0, 0.0, 0.0, 0, 0.0, 0.0])
+
+    def merge(self, other: '_Accumulator'):
+        _merge_stats(self.total, 0, *other.total)
+        for key, stats in other.phases.items():
+            _merge_stats(self.phases.setdefault(key, [0, 0.0, 0.0]), 0, *stats)
+        for key, stats in other.options.items():
+            target = self._option(key)
+            _merge_stats(target, 0, *stats[:3])
+            _merge_stats(target, 3, *stats[3:])
+        self.exact = self.exact and other.exact
+        self.walks += other.walks
+
+def _merge_stats(stats: list, offset: int, paths: int, score: float, go: float) -> None:
+    """Combina [caminos, media, tasa] en stats[offset:offset + 3] (división entera exacta)"""
+    if not paths:
+        return
+    total = stats[offset] + paths
+    share = paths / total
+    stats[offset + 1] += (score - stats[offset + 1]) * share
+    stats[offset + 2] += (go - stats[offset + 2]) * share
+    stats[offset] = total
+
+def _path_value(scenario: CompiledScenario, path, members: int) -> Tuple[float, float]:
+    """Valor de una coalición: aplica en orden solo las decisiones incluidas en la máscara"""
+    indicators = scenario.initial_indicators
+    history = frozenset()
+    game_over = False
+    for position, (phase_index, option_index) in enumerate(path):
+        if members & (1 << position):
+            indicators, failed = scenario.apply_option(indicators, history, phase_index, option_index)
+            history = history | {scenario.phases[phase_index][option_index].key}
+            game_over = game_over or failed
+    return scenario.score(indicators), (1.0 if game_over else 0.0)
+
+def _exact_shapley(coalition: List[Tuple[float, float]], n: int) -> List[Tuple[float, float]]:
+    """Valores de Shapley a partir del valor de cada coalición (índice = máscara de decisiones)"""
+    values = [[0.0, 0.0] for _ in range(n)]
+    weights = [math.factorial(k) * math.factorial(n - k - 1) / math.factorial(n) for k in range(n)]
+    for mask in range(1 << n):
+        size = bin(mask).count('1')
+        without_i = coalition[mask]
+        for i in range(n):
+            if not mask & (1 << i):
+                with_i = coalition[mask | (1 << i)]
+                values[i][0] += weights[size] * (with_i[0] - without_i[0])
+                values[i][1] += weights[size] * (with_i[1] - without_i[1])
+    return [tuple(v) for v in values]
+
+def _sampled_shapley(scenario: CompiledScenario, path, rng: random.Random) -> List[Tuple[float, float]]:
+    """Valores de Shapley estimados con permutaciones muestreadas (caminos largos)"""
+    n = len(path)
+    values = [[0.0, 0.0] for _ in range(n)]
+    order = list(range(n))
+    for _ in range(SHAPLEY_SAMPLES):
+        rng.shuffle(order)
+        mask = 0
+        previous = _path_value(scenario, path, mask)
+        for i in order:
+            mask |= 1 << i
+            current = _path_value(scenario, path, mask)
+            values[i][0] += (current[0] - previous[0]) / SHAPLEY_SAMPLES
+            values[i][1] += (current[1] - previous[1]) / SHAPLEY_SAMPLES
+            previous = current
+    return [tuple(v) for v in values]
+
+def _shapley_for_paths(scenario: CompiledScenario, sample, rng: random.Random):
+    """Genera (camino, peso, valores de Shapley) de una muestra de (camino, peso),
+    compartiendo las coaliciones de los prefijos comunes"""
+    # chain[k]: estados (indicadores, historial, game over) de cada subconjunto de las
+    # primeras k decisiones del camino actual; el bit k de la máscara es la decisión k
+    chain = [[(scenario.initial_indicators, frozenset(), False)]]
+    previous = ()
+    for path, weight in sorted(sample):
+        if len(path) > SHAPLEY_EXACT_MAX:
+            yield path, weight, _sampled_shapley(scenario, path, rng)
+            continue
+        common = 0
+        while common < min(len(path), len(previous)) and path[common] == previous[common]:
+            common += 1
+        del chain[common + 1:]
+        for phase_index, option_index in path[common:]:
+            key = scenario.phases[phase_index][option_index].key
+            states = chain[-1]
+            added = []
+            for indicators, history, game_over in states:
+                new_indicators, failed = scenario.apply_option(indicators, history, phase_index, option_index)
+                added.append((new_indicators, history | {key}, game_over or failed))
+            chain.append(states + added)
+        previous = path
+        coalition = [(scenario.score(indicators), 1.0 if game_over else 0.0)
+                     for indicators, _, game_over in chain[len(path)]]
+        yield path, weight, _exact_shapley(coalition, len(path))
+
+def shapley_sample_size(scenario: CompiledScenario) -> int:
+    """Caminos con Shapley que caben en SHAPLEY_WORK_BUDGET según el largo máximo de un camino"""
+    n = max(scenario.max_phases, 1)
+    cost = n * (1 << n) if n <= SHAPLEY_EXACT_MAX else SHAPLEY_SAMPLES * n * n
+    return max(SHAPLEY_MIN_PATHS, SHAPLEY_WORK_BUDGET // cost)
+
+def _exact_subtree(scenario: CompiledScenario, phase_index: int, indicators, history,
+                   budget: int) -> Optional[list]:
+    """Grafo de estados equivalentes desde una raíz, fase por fase (iterativo).
+
+    Un estado es (historial relevante, indicadores), como en GameTreeSolver: los
+    caminos que llegan al mismo estado comparten todo su futuro y se cuentan juntos.
+    Retorna las capas {estado: [caminos que llegan, aristas]}, donde cada arista es
+    (opción, estado hijo o None si el camino termina, puntaje, game over), o None
+    si las transiciones superan `budget`.
+    """
+    root = (scenario.relevant_history(phase_index, history), indicators)
+    layers = [{root: [1, []]}]
+    transitions = 0
+    while layers[-1] and phase_index < scenario.max_phases:
+        next_layer = {}
+        last_phase = phase_index + 1 >= scenario.max_phases
+        for (relevant, values), node in layers[-1].items():
+            for option_index in scenario.available_options(phase_index, relevant):
+                transitions += 1
+                if transitions > budget:
+                    return None
+                new_values, failed = scenario.apply_option(values, relevant, phase_index, option_index)
+                if failed or last_phase:
+                    node[1].append((option_index, None, scenario.score(new_values), failed))
+                    continue
+                key = scenario.phases[phase_index][option_index].key
+                child = (scenario.relevant_history(phase_index + 1, relevant | {key}), new_values)
+                child_node = next_layer.get(child)
+                if child_node is None:
+                    child_node = next_layer[child] = [0, []]
+                child_node[0] += node[0]
+                node[1].append((option_index, child, 0.0, False))
+        layers.append(next_layer)
+        phase_index += 1
+    return layers
+
+def _analyze_exact(scenario: CompiledScenario, prefix, layers: list, sample_size: int,
+                   rng: random.Random, acc: _Accumulator) -> list:
+    """Medias exactas desde el grafo de estados; retorna una muestra uniforme de (camino, peso)"""
+    root_phase = len(prefix)
+    # Hacia atrás: [caminos, puntaje medio, tasa de game over] desde cada estado hasta el final
+    totals = [{} for _ in layers]
+    for depth in range(len(layers) - 1, -1, -1):
+        for state, (_, edges) in layers[depth].items():
+            stats = [0, 0.0, 0.0]
+            for _, child, score, failed in edges:
+                if child is None:
+                    _merge_stats(stats, 0, 1, score, 1.0 if failed else 0.0)
+                else:
+                    _merge_stats(stats, 0, *totals[depth + 1][child])
+            totals[depth][state] = stats
+
+    (root, _), = layers[0].items()
+    root_stats = totals[0][root]
+    _merge_stats(acc.total, 0, *root_stats)
+    for choice in prefix:
+        _merge_stats(acc.phases.setdefault(choice[0], [0, 0.0, 0.0]), 0, *root_stats)
+        _merge_stats(acc._option(choice), 0, *root_stats)
+    for depth, layer in enumerate(layers):
+        phase_index = root_phase + depth
+        for state, (count, edges) in layer.items():
+            paths, score, go = totals[depth][state]
+            _merge_stats(acc.phases.setdefault(phase_index, [0, 0.0, 0.0]), 0, count * paths, score, go)
+            for option_index, child, score, failed in edges:
+                if child is None:
+                    child_stats = (1, score, 1.0 if failed else 0.0)
+                else:
+                    child_stats = totals[depth + 1][child]
+                _merge_stats(acc._option((phase_index, option_index)), 0,
+                             count * child_stats[0], child_stats[1], child_stats[2])
+
+    if not sample_size or not root_stats[0]:
+        return []
+    if root_stats[0] <= sample_size:
+        # Caben todos: se enumeran (pila explícita) y Shapley es exacto sobre la tarea
+        sample = []
+        stack = [(root, 0, tuple(prefix))]
+        while stack:
+            state, depth, path = stack.pop()
+            for option_index, child, _, _ in layers[depth][state][1]:
+                child_path = path + ((root_phase + depth, option_index),)
+                if child is None:
+                    sample.append((child_path, 1))
+                else:
+                    stack.append((child, depth + 1, child_path))
+        return sample
+
+    # Muestra uniforme de caminos: en cada estado se elige la arista según sus caminos
+    weight = max(1, root_stats[0] // sample_size)
+    sample = []
+    for _ in range(sample_size):
+        path = list(prefix)
+        state, depth = root, 0
+        while state is not None:
+            target = rng.randrange(totals[depth][state][0])
+            for option_index, child, _, _ in layers[depth][state][1]:
+                target -= 1 if child is None else totals[depth + 1][child][0]
+                if target < 0:
+                    break
+            path.append((root_phase + depth, option_index))
+            state, depth = child, depth + 1
+        sample.append((tuple(path), weight))
+    return sample
+
+def _analyze_sampled(scenario: CompiledScenario, prefix, phase_index: int, indicators, history,
+                     walks: int, sample_size: int, rng: random.Random, acc: _Accumulator) -> list:
+    """Medias estimadas con recorridos aleatorios; retorna una muestra de (camino, peso) para Shapley.
+
+    En cada fase se elige al azar una opción disponible y el camino pesa el producto
+    de las opciones disponibles en su recorrido (estimador de Knuth), de modo que las
+    medias estiman las de todos los caminos legales y no las de un jugador al azar.
+    """
+    local = _Accumulator()
+    sample = []
+    start_phase, start_history = phase_index, scenario.relevant_history(phase_index, history)
+    for _ in range(walks):
+        phase_index, values, relevant = start_phase, indicators, start_history
+        path = list(prefix)
+        weight = 1
+        failed = False
+        while True:
+            available = scenario.available_options(phase_index, relevant)
+            if not available:
+                path = None
+                break
+            weight *= len(available)
+            option_index = rng.choice(available)
+            values, failed = scenario.apply_option(values, relevant, phase_index, option_index)
+            path.append((phase_index, option_index))
+            if failed or phase_index + 1 >= scenario.max_phases:
+                break
+            key = scenario.phases[phase_index][option_index].key
+            phase_index += 1
+            relevant = scenario.relevant_history(phase_index, relevant | {key})
+        if path is None:
+            continue
+        path = tuple(path)
+        local.add_path(path, scenario.score(values), failed, weight)
+        if len(sample) < sample_size:
+            sample.append((path, max(1, weight // walks)))
+
+    # Cada recorrido representa weight / walks caminos de la tarea
+    for stats in (local.total, *local.phases.values(), *local.options.values()):
+        if stats[0]:
+            stats[0] = max(1, (stats[0] + walks // 2) // walks)
+    local.exact = False
+    local.walks = walks
+    acc.merge(local)
+    return sample
+
+def _analyze_prefix(args) -> _Accumulator:
+    """Tarea de un proceso: analiza los caminos que empiezan con un prefijo"""
+    scenario, prefix, state_budget, walks, sample_size, seed = args
+    rng = random.Random(seed)
+    acc = _Accumulator()
+
+    indicators = scenario.initial_indicators
+    history = frozenset()
+    path = ()
+    sample = []
+    for phase_index, option_index in prefix:
+        indicators, failed = scenario.apply_option(indicators, history, phase_index, option_index)
+        history = history | {scenario.phases[phase_index][option_index].key}
+        path += ((phase_index, option_index),)
+        if failed or phase_index + 1 >= scenario.max_phases:
+            acc.add_path(path, scenario.score(indicators), failed)
+            if sample_size:
+                sample = [(path, 1)]
+            break
+    else:
+        layers = _exact_subtree(scenario, len(prefix), indicators, history, state_budget)
+        if layers is not None:
+            sample = _analyze_exact(scenario, path, layers, sample_size, rng, acc)
+        else:
+            sample = _analyze_sampled(scenario, path, len(prefix), indicators, history,
+                                      walks, sample_size, rng, acc)
+
+    for sampled_path, weight, shapley in _shapley_for_paths(scenario, sample, rng):
+        acc.add_shapley(sampled_path, shapley, weight)
+    return acc
+
+def _split_prefixes(scenario: CompiledScenario, target: int) -> List[Tuple[Tuple[int, int], ...]]:
+    """Divide el árbol en prefijos hasta tener al menos `target` tareas"""
+    frontier = [((), scenario.initial_indicators, frozenset(), False)]
+    depth = 0
+    while len(frontier) < target and depth < scenario.max_phases - 1:
+        next_frontier = []
+        for prefix, indicators, history, done in frontier:
+            if done:
+                next_frontier.append((prefix, indicators, history, done))
+                continue
+            for option_index in scenario.available_options(depth, history):
+                new_indicators, failed = scenario.apply_option(indicators, history, depth, option_index)
+                key = scenario.phases[depth][option_index].key
+                next_frontier.append((prefix + ((depth, option_index),), new_indicators,
+                                      history | {key}, failed))
+        frontier = next_frontier
+        depth += 1
+    return [prefix for prefix, _, _, _ in frontier]
+
+def analyze_impact(scenario: CompiledScenario, method: str = 'both', workers: int = None,
+                   seed: int = 0) -> ImpactReport:
+    """Calcula la atribución de impacto de todas las opciones sobre todos los caminos legales"""
+    if method not in METHODS:
+        raise ValueError(f"Método desconocido: {method}. Usa uno de {METHODS}")
+    with_shapley = method in ('shapley', 'both')
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    prefixes = _split_prefixes(scenario, workers * 4) if workers > 1 else [()]
+    sample_size = -(-shapley_sample_size(scenario) // len(prefixes)) if with_shapley else 0
+    state_budget = max(1, IMPACT_STATE_BUDGET // len(prefixes))
+    walks = -(-max(IMPACT_MIN_WALKS, IMPACT_SAMPLE_STEPS // max(scenario.max_phases, 1)) // len(prefixes))
+    tasks = [(scenario, prefix, state_budget, walks, sample_size, seed + i)
+             for i, prefix in enumerate(prefixes)]
+
+    acc = _Accumulator()
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(_analyze_prefix, tasks):
+                acc.merge(partial)
+    else:
+        for task in tasks:
+            acc.merge(_analyze_prefix(task))
+
+    report = _build_report(scenario, acc, with_shapley, method != 'shapley')
+    report.shapley_paths = sample_size * len(prefixes)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+def _build_report(scenario: CompiledScenario, acc: _Accumulator, with_shapley: bool,
+                  with_conditional: bool) -> ImpactReport:
+    """Convierte las sumas acumuladas en medias y deltas por opción"""
+    total_paths, total_score, total_go = acc.total
+    report = ImpactReport(
+        total_paths=total_paths,
+        mean_score=total_score,
+        game_over_rate=total_go,
+        exact=acc.exact,
+        walks=acc.walks
+    )
+
+    for phase_index, options in enumerate(scenario.phases):
+        _, phase_score, phase_go = acc.phases.get(phase_index, (0, 0.0, 0.0))
+        for option_index, option in enumerate(options):
+            paths, score, go, shap_weight, shap_score, shap_go = acc.options.get(
+                (phase_index, option_index), (0, 0.0, 0.0, 0, 0.0, 0.0)
+            )
+            impact = OptionImpact(phase_index, option.key, option.decision_id, paths,
+                                  None, None, None, None)
+            if paths:
+                if with_conditional:
+                    impact.mean_score = score
+                    impact.score_delta = score - phase_score
+                    impact.game_over_rate = go
+                    impact.game_over_delta = go - phase_go
+                if with_shapley and shap_weight:
+                    impact.shapley_score = shap_score
+                    impact.shapley_game_over = shap_go
+            report.options.append(impact)
+    return report
+
+def main(argv: List[str]) -> int:
+    """Imprime la atribución de impacto de un escenario"""
+    # Import local: la CLI necesita DataManager, el análisis solo el escenario compilado
+    from data.data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Atribución de impacto por decisión")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--method', choices=METHODS, default='both')
+    parser.add_argument('--workers', type=int, default=None, help="procesos (por defecto, núcleos)")
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.scenario)
+    scenario = CompiledScenario.from_phases(data_manager.get_phases(), data_manager.get_indicator_specs())
+    report = analyze_impact(scenario, method=args.method, workers=args.workers)
+    print(report.format_table())
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,379 @@
+"""Prueba de carga del servicio de juego (logic.game_service) con jugadores virtuales.
+
+Cada jugador virtual crea una sesión, consulta la fase, piensa un tiempo al azar
+(exponencial con media --think segundos) y decide según una política hasta
+terminar; después pide los resultados y cierra la sesión. Los jugadores se
+ejecutan con asyncio en un solo hilo y comparten un grupo de conexiones HTTP/1.1
+persistentes por loopback (--connections), como detrás de un proxy, así que miles
+de jugadores no necesitan miles de hilos ni de conexiones.
+
+La latencia de cada endpoint se acumula en un histograma logarítmico del que salen
+p50/p95/p99; la espera por una conexión libre del grupo se mide aparte. La memoria
+del servidor se muestrea con GET /stats cada --sample segundos.
+
+Uso:
+    python -m logic.load_test --players 2000 --think 1 --ramp 10 --policy greedy
+    python -m logic.load_test --players 2000 --abandon 0.3 --max-active 200 --idle 5
+    python -m logic.load_test --url http://127.0.0.1:8770 --players 500 --games 3
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+POLICIES = ('first', 'random', 'greedy')
+POOL_WAIT = "(espera de conexión)"
+
+class LatencyHistogram:
+    """Latencias en cubetas logarítmicas: cada percentil tiene un error relativo de a lo sumo GROWTH - 1"""
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    MIN_LATENCY = 1e-5      # 10 µs: todo lo menor cae en la primera cubeta
+    MAX_LATENCY = 60.0
+    GROWTH = 1.02
+    BUCKETS = math.ceil(math.log(MAX_LATENCY / MIN_LATENCY) / math.log(GROWTH)) + 1
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        if seconds <= self.MIN_LATENCY:
+            index = 0
+        else:
+            index = min(math.ceil(math.log(seconds / self.MIN_LATENCY) / math.log(self.GROWTH)), self.BUCKETS - 1)
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """Límite superior de la cubeta que contiene el percentil (en segundos)"""
+        if not self.count:
+            return 0.0
+        target = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.MIN_LATENCY * self.GROWTH ** index, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+class LoadStats:
+    """Histogramas y errores por endpoint más las muestras de memoria del servidor"""
+
+    def __init__(self):
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+        # (segundos, bytes, sesiones abiertas por los jugadores, sesiones en la memoria del servidor)
+        self.memory: List[Tuple[float, Optional[int], int, int]] = []
+        self.open_sessions = 0
+        self.games = 0
+        self.game_overs = 0
+        self.abandoned = 0
+        self.decisions = 0
+
+    def record(self, endpoint: str, seconds: float, ok: bool = True) -> None:
+        histogram = self.latency.get(endpoint)
+        if histogram is None:
+            histogram = self.latency[endpoint] = LatencyHistogram()
+        histogram.record(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def sample(self, elapsed: float, server_stats: Dict) -> None:
+        """Agrega una muestra de GET /stats"""
+        self.memory.append((elapsed, server_stats.get('memory_bytes'), self.open_sessions, server_stats['active']))
+
+    @property
+    def requests(self) -> int:
+        return sum(histogram.count for endpoint, histogram in self.latency.items() if endpoint != POOL_WAIT)
+
+class HttpError(Exception):
+    """Respuesta no exitosa del servicio"""
+
+class _Connection:
+    """Conexión HTTP/1.1 persistente mínima sobre asyncio (solo cuerpos JSON con Content-Length)"""
+    __slots__ = ('host', 'port', 'reader', 'writer')
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method: str, path: str, body: Dict = None) -> Tuple[int, Dict]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n")
+        self.writer.write(head.encode('ascii') + payload)
+        await self.writer.drain()
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("El servidor cerró la conexión")
+        status = int(status_line.split()[1])
+        length, keep_alive = 0, True
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'connection' and value.strip().lower() == 'close':
+                keep_alive = False
+        data = await self.reader.readexactly(length) if length else b''
+        if not keep_alive:
+            self.close()
+        return status, json.loads(data) if data else {}
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+class ConnectionPool:
+    """Conexiones persistentes compartidas por los jugadores; mide cada solicitud por endpoint"""
+
+    def __init__(self, host: str, port: int, size: int, stats: LoadStats):
+        self.stats = stats
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._all = [_Connection(host, port) for _ in range(size)]
+        for connection in self._all:
+            self._idle.put_nowait(connection)
+
+    async def request(self, endpoint: str, method: str, path: str, body: Dict = None) -> Dict:
+        """Envía una solicitud; `endpoint` es la ruta genérica con la que se agrupa la latencia"""
+        waited = time.perf_counter()
+        connection = await self._idle.get()
+        started = time.perf_counter()
+        self.stats.record(POOL_WAIT, started - waited)
+        try:
+            status, payload = await connection.request(method, path, body)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            connection.close()
+            self.stats.record(endpoint, time.perf_counter() - started, ok=False)
+            raise HttpError(f"{endpoint}: {e}") from None
+        finally:
+            self._idle.put_nowait(connection)
+        self.stats.record(endpoint, time.perf_counter() - started, ok=status < 400)
+        if status >= 400:
+            raise HttpError(f"{endpoint}: {status} {payload.get('error', '')}")
+        return payload
+
+    def close(self) -> None:
+        for connection in self._all:
+            connection.close()
+
+async def _choose(pool: ConnectionPool, state: Dict, policy: str, rng: random.Random) -> int:
+    options = state['phase']['options']
+    if policy == 'first':
+        return 0
+    if policy == 'random':
+        return rng.randrange(len(options))
+    # greedy: la opción con mejor puntaje proyectado que no termina el juego
+    preview = await pool.request("GET /sessions/{id}/preview", 'GET', f"/sessions/{state['session_id']}/preview")
+    scored = [(-1.0 if option['game_over'] else option['score'], -index)
+              for index, option in enumerate(preview['options'])]
+    return -max(scored)[1]
+
+async def _player(pool: ConnectionPool, stats: LoadStats, rng: random.Random, delay: float,
+                  games: int, think: float, policy: str, abandon: float) -> None:
+    """Un jugador virtual: juega `games` partidas seguidas (o abandona alguna a medias)"""
+    await asyncio.sleep(delay)
+    for _ in range(games):
+        try:
+            state = await pool.request("POST /sessions", 'POST', "/sessions")
+            stats.open_sessions += 1
+            session_path = f"/sessions/{state['session_id']}"
+            state = await pool.request("GET /sessions/{id}", 'GET', session_path)
+            leave_at = rng.randrange(state['max_phases']) if rng.random() < abandon else None
+            while state['status'] == 'playing':
+                if leave_at == state['phase_index']:
+                    stats.abandoned += 1   # Deja la sesión abierta sin cerrarla, como una pestaña olvidada
+                    break
+                if think:
+                    await asyncio.sleep(rng.expovariate(1 / think))
+                index = await _choose(pool, state, policy, rng)
+                reply = await pool.request("POST /sessions/{id}/decision", 'POST', f"{session_path}/decision",
+                                           {'index': index})
+                stats.decisions += 1
+                state = reply['state']
+            else:
+                results = await pool.request("GET /sessions/{id}/results", 'GET', f"{session_path}/results")
+                await pool.request("DELETE /sessions/{id}", 'DELETE', session_path)
+                stats.open_sessions -= 1
+                stats.games += 1
+                stats.game_overs += results['game_over']
+        except HttpError:
+            return   # El error ya quedó contado en su endpoint
+
+async def _sample_memory(host: str, port: int, stats: LoadStats, interval: float, started: float) -> None:
+    """Muestrea /stats por una conexión propia para no esperar detrás de los jugadores"""
+    connection = _Connection(host, port)
+    try:
+        while True:
+            try:
+                _, payload = await connection.request('GET', "/stats")
+                stats.sample(time.perf_counter() - started, payload)
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                connection.close()
+            await asyncio.sleep(interval)
+    finally:
+        connection.close()
+
+async def run_load_test(host: str, port: int, players: int, games: int = 1, think: float = 1.0,
+                        ramp: float = 0.0, policy: str = 'random', abandon: float = 0.0,
+                        connections: int = 64, sample: float = 1.0, seed: int = 0) -> Tuple[LoadStats, float]:
+    """Ejecuta los jugadores virtuales contra un servicio ya iniciado; retorna (estadísticas, segundos)"""
+    stats = LoadStats()
+    pool = ConnectionPool(host, port, connections, stats)
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    sampler = asyncio.create_task(_sample_memory(host, port, stats, sample, started))
+    try:
+        await asyncio.gather(*(
+            _player(pool, stats, random.Random(rng.random()), ramp * i / players if players else 0.0,
+                    games, think, policy, abandon)
+            for i in range(players)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        sampler.cancel()
+        pool.close()
+    # Muestra final, ya sin carga
+    connection = _Connection(host, port)
+    try:
+        _, payload = await connection.request('GET', "/stats")
+        stats.sample(time.perf_counter() - started, payload)
+    finally:
+        connection.close()
+    return stats, elapsed
+
+def format_report(stats: LoadStats, elapsed: float, players: int) -> str:
+    lines = [
+        f"📈 {players:,} jugadores: {stats.games:,} partidas ({stats.game_overs:,} game over, "
+        f"{stats.abandoned:,} abandonadas) en {elapsed:.1f} s",
+        f"   {stats.requests / elapsed if elapsed else 0:,.0f} solicitudes/s · "
+        f"{stats.decisions / elapsed if elapsed else 0:,.0f} decisiones/s",
+        "",
+        f"   {'Endpoint':<32}{'n':>9}{'p50':>10}{'p95':>10}{'p99':>10}{'máx':>10}{'errores':>9}"
+    ]
+    for endpoint, histogram in stats.latency.items():
+        lines.append(
+            f"   {endpoint:<32}{histogram.count:>9,}"
+            + "".join(f"{histogram.percentile(p) * 1000:>8.2f}ms" for p in (50, 95, 99))
+            + f"{histogram.max * 1000:>8.1f}ms{stats.errors.get(endpoint, 0):>9,}"
+        )
+    samples = [sample for sample in stats.memory if sample[1] is not None]
+    if samples:
+        lines += ["", "🧠 Memoria del servidor", f"   {'tiempo':>9}{'memoria':>13}{'abiertas':>10}{'en memoria':>12}"]
+        step = max(1, len(samples) // 10)   # A lo sumo ~10 filas
+        for t, memory, opened, active in samples[::step] + ([samples[-1]] if (len(samples) - 1) % step else []):
+            lines.append(f"   {t:>7.1f} s{memory / 2 ** 20:>9.1f} MiB{opened:>10,}{active:>12,}")
+        growth = samples[-1][1] - samples[0][1]
+        peak_active = max(sample[3] for sample in samples)
+        lines.append(f"   Crecimiento: {growth / 2 ** 20:+.1f} MiB"
+                     + (f" (~{growth / peak_active / 1024:.1f} KiB por sesión en memoria en el pico de "
+                        f"{peak_active:,})" if peak_active else ""))
+    elif stats.memory:
+        lines += ["", "🧠 El servidor no informa su memoria en esta plataforma"]
+    return "\n".join(lines)
+
+def _spawn_server(scenario: Optional[str], sessions_db: str, max_active: int = None,
+                  idle: float = None) -> Tuple[subprocess.Popen, str, int]:
+    """Inicia logic.game_service en otro proceso con un puerto libre"""
+    command = [sys.executable, '-m', 'logic.game_service', '--port', '0', '--sessions-db', sessions_db]
+    if scenario:
+        command += ['--scenario', scenario]
+    if max_active:
+        command += ['--max-active', str(max_active)]
+    if idle is not None:
+        command += ['--idle', str(idle)]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(command, cwd=root, stdout=subprocess.PIPE,
+                               env=dict(os.environ, PYTHONIOENCODING='utf-8'))
+    banner = process.stdout.readline().decode('utf-8')   # "🌐 Servicio de juego en http://host:puerto"
+    url = urlsplit(banner.split()[-1] if banner.strip() else '')
+    if not url.port:
+        process.kill()
+        raise RuntimeError(f"El servicio no se inició: {banner.strip() or 'sin salida'}")
+    # El resto de la salida del servicio (avisos) se descarta sin que llene el pipe
+    threading.Thread(target=process.stdout.read, name='service-output', daemon=True).start()
+    return process, url.hostname, url.port
+
+def main(argv: List[str]) -> int:
+    """Lanza jugadores virtuales contra el servicio de juego y reporta latencias y memoria"""
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de juego con jugadores virtuales")
+    parser.add_argument('--url', default=None,
+                        help="servicio ya iniciado (por defecto se inicia uno en otro proceso)")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn del servicio iniciado")
+    parser.add_argument('--max-active', type=int, default=None, help="sesiones máximas en memoria del servicio iniciado")
+    parser.add_argument('--idle', type=float, default=None,
+                        help="segundos sin solicitudes antes de que el servicio iniciado guarde una sesión en disco")
+    parser.add_argument('--players', type=int, default=1000)
+    parser.add_argument('--games', type=int, default=1, help="partidas seguidas por jugador")
+    parser.add_argument('--think', type=float, default=1.0, help="segundos promedio antes de cada decisión")
+    parser.add_argument('--ramp', type=float, default=5.0, help="segundos en los que se suman todos los jugadores")
+    parser.add_argument('--policy', choices=POLICIES, default='random')
+    parser.add_argument('--abandon', type=float, default=0.0,
+                        help="probabilidad de dejar una partida a medias sin cerrar la sesión")
+    parser.add_argument('--connections', type=int, default=64, help="conexiones persistentes compartidas")
+    parser.add_argument('--sample', type=float, default=1.0, help="segundos entre muestras de memoria")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    process = None
+    # Las sesiones que guarde el servicio iniciado para la prueba se descartan al final
+    scratch = tempfile.TemporaryDirectory()
+    try:
+        if args.url:
+            url = urlsplit(args.url)
+            host, port = url.hostname, url.port or 80
+        else:
+            try:
+                process, host, port = _spawn_server(args.scenario, os.path.join(scratch.name, 'sessions.db'),
+                                                    args.max_active, args.idle)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                return 1
+            print(f"🌐 Servicio iniciado en http://{host}:{port} (proceso {process.pid})")
+
+        print(f"🚀 {args.players:,} jugadores '{args.policy}', {args.games} partida(s) cada uno, "
+              f"pensando {args.think:g} s en promedio, {args.connections} conexiones")
+        try:
+            stats, elapsed = asyncio.run(run_load_test(
+                host, port, args.players, args.games, args.think, args.ramp, args.policy,
+                args.abandon, args.connections, args.sample, args.seed
+            ))
+        except OSError as e:
+            print(f"❌ No se pudo conectar con el servicio: {e}")
+            return 1
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+        scratch.cleanup()
+    print(format_report(stats, elapsed, args.players))
+    return 0 if not stats.errors else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
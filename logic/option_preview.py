@@ -0,0 +1,110 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from config.settings import GameConfig
+from logic.outcome_cache import GameTreeSolver
+
+@dataclass
+class OptionPreview:
+    """Proyección de una opción: indicadores resultantes y mejor puntaje final alcanzable"""
+    decision_id: str
+    indicators: Dict[str, float]
+    deltas: Dict[str, float]
+    synergy_effects: Dict[str, int]
+    failed_indicators: List[str]
+    best_score: Optional[float] = None
+    best_category: Optional[str] = None
+    best_exact: bool = True              # False: la búsqueda se cortó y best_score es una estimación
+
+    @property
+    def game_over(self) -> bool:
+        """Indica si elegir esta opción termina el juego"""
+        return bool(self.failed_indicators)
+
+class OptionPreviewer:
+    """Calcula en segundo plano las proyecciones de las opciones de la fase actual.
+
+    Las proyecciones se memorizan por (fase, historial, opción), de modo que pasar el
+    mouse repetidas veces por la misma opción responde al instante; el mejor puntaje
+    alcanzable se consulta en la tabla de transposición compartida del motor, con una
+    búsqueda acotada a GameConfig.PREVIEW_SEARCH_NODES estados. Al cambiar de fase las
+    proyecciones del estado anterior se descartan y las que aún no empezaron se cancelan,
+    así que una solicitud nueva nunca espera detrás de opciones que ya no se muestran.
+    """
+
+    def __init__(self, game_engine, max_workers: int = 1, max_nodes: int = None):
+        self.game_engine = game_engine
+        self.max_nodes = max_nodes or GameConfig.PREVIEW_SEARCH_NODES
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='option-preview')
+        self._lock = threading.Lock()
+        self._previews = {}      # (fase, historial, opción) -> Future[OptionPreview]
+        self._state = None       # (fase, historial) de las proyecciones memorizadas
+
+    def request_preview(self, decision_index: int) -> Optional[Future]:
+        """Solicita la proyección de una opción disponible en la fase actual"""
+        engine = self.game_engine
+        phase_index = engine.current_phase
+        history = frozenset(engine.decision_history)
+        available = engine.get_available_decisions(phase_index, history)
+        if not 0 <= decision_index < len(available):
+            return None
+
+        decision = available[decision_index]
+        key = (phase_index, history, decision.id)
+        with self._lock:
+            if self._state != (phase_index, history):
+                self._discard()
+                self._state = (phase_index, history)
+            future = self._previews.get(key)
+            if future is None:
+                future = self._executor.submit(
+                    self._compute_preview, phase_index, history, engine.get_indicators(), decision
+                )
+                self._previews[key] = future
+        return future
+
+    def clear(self):
+        """Descarta las proyecciones memorizadas (p. ej. si cambian los datos de las fases)"""
+        with self._lock:
+            self._discard()
+            self._state = None
+
+    def _discard(self):
+        """Cancela las proyecciones que no empezaron y olvida todas (llamar con el lock)"""
+        for future in self._previews.values():
+            future.cancel()
+        self._previews.clear()
+
+    def shutdown(self):
+        """Detiene el hilo de cálculo sin esperar proyecciones pendientes"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _compute_preview(self, phase_index: int, history: frozenset,
+                         indicators: Dict[str, float], decision) -> OptionPreview:
+        """Proyecta una opción y busca el mejor puntaje final que sigue siendo alcanzable"""
+        engine = self.game_engine
+        new_indicators, new_history, synergy_effects, failed = engine.project_decision(
+            indicators, history, phase_index, decision
+        )
+        deltas = {
+            name: new_indicators[name] - indicators[name]
+            for name in indicators
+            if new_indicators[name] != indicators[name]
+        }
+
+        best_score = None
+        best_category = None
+        best_exact = True
+        if not failed:
+            scenario = engine.get_compiled_scenario()
+            outcome = GameTreeSolver(scenario, engine.outcome_cache, max_nodes=self.max_nodes).solve(
+                phase_index + 1, new_history, scenario.indicator_vector(new_indicators)
+            )
+            best_score = outcome.best_score
+            best_exact = outcome.complete
+            if best_score is not None:
+                best_category, _, _ = engine.score_calculator.get_score_category(best_score)
+
+        return OptionPreview(decision.id, new_indicators, deltas, synergy_effects,
+                             failed, best_score, best_category, best_exact)
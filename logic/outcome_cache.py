@@ -0,0 +1,198 @@
+"""Tabla de transposición de resultados del árbol de juego, compartida entre sesiones.
+
+Muchos jugadores (reales o simulados) pasan por los mismos estados
+(fase, historial, indicadores). Cada estado se identifica con un hash compacto
+y guarda sus opciones disponibles, los estados siguientes y el mejor y peor
+puntaje final alcanzable, para que el motor, los solvers y la vista previa no
+los recalculen.
+
+Del historial solo cuentan las claves que alguna fase posterior todavía pide
+(CompiledScenario.last_needed): dos caminos que difieren en decisiones que ya no
+influyen llegan al mismo estado. La búsqueda es iterativa y acotada en
+profundidad y en nodos (GameConfig.OUTCOME_SEARCH_DEPTH/NODES); donde se corta,
+el estado puntúa con sus indicadores actuales y la entrada queda marcada como
+incompleta (aproximada), y solo las entradas completas se guardan en la caché.
+"""
+import hashlib
+import struct
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
+from config.settings import GameConfig
+from logic.compiled_scenario import CompiledScenario
+
+class OutcomeEntry:
+    """Resultado memorizado de un estado del árbol de juego"""
+    __slots__ = ('available', 'next_states', 'best_score', 'worst_score', 'complete')
+
+    def __init__(self, available: Tuple[int, ...], next_states: Tuple[Tuple[Tuple[float, ...], bool], ...],
+                 best_score: Optional[float], worst_score: Optional[float], complete: bool = True):
+        self.available = available          # Índices de opciones disponibles
+        self.next_states = next_states      # (indicadores siguientes, game over) por opción disponible
+        self.best_score = best_score        # None si todos los caminos terminan en game over
+        self.worst_score = worst_score
+        self.complete = complete            # False: la búsqueda se cortó y los puntajes son aproximados
+
+class OutcomeCache:
+    """Caché LRU acotada y segura entre hilos, con contadores de aciertos y fallos"""
+
+    def __init__(self, capacity: int = None):
+        self.capacity = capacity or GameConfig.OUTCOME_CACHE_SIZE
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: bytes) -> Optional[OutcomeEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: bytes, entry: OutcomeEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: bytes, compute: Callable[[], OutcomeEntry]) -> OutcomeEntry:
+        """Retorna la entrada memorizada o la calcula (fuera del lock) y la guarda"""
+        entry = self.get(key)
+        if entry is None:
+            entry = compute()
+            self.put(key, entry)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de uso de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+def state_key(scenario: CompiledScenario, phase_index: int, history: FrozenSet[str],
+              indicators: Tuple[float, ...]) -> bytes:
+    """Hash compacto (16 bytes) de un estado del juego dentro de un escenario"""
+    digest = hashlib.blake2b(scenario.fingerprint, digest_size=16)
+    digest.update(struct.pack('<I', phase_index))
+    digest.update('\x00'.join(sorted(scenario.relevant_history(phase_index, history))).encode('utf-8'))
+    digest.update(struct.pack(f'<{len(indicators)}d', *indicators))
+    return digest.digest()
+
+class _Frame:
+    """Estado en expansión de la búsqueda iterativa"""
+    __slots__ = ('phase_index', 'history', 'key', 'available', 'next_states', 'position', 'best', 'worst',
+                 'complete')
+
+    def __init__(self, scenario: CompiledScenario, phase_index: int, history: FrozenSet[str],
+                 indicators: Tuple[float, ...], key: bytes):
+        self.phase_index = phase_index
+        self.history = history
+        self.key = key
+        self.available = tuple(scenario.available_options(phase_index, history))
+        self.next_states = tuple(scenario.apply_option(indicators, history, phase_index, option_index)
+                                 for option_index in self.available)
+        self.position = 0
+        self.best = self.worst = None
+        self.complete = True
+
+    def merge(self, child: OutcomeEntry) -> None:
+        if child.best_score is not None and (self.best is None or child.best_score > self.best):
+            self.best = child.best_score
+        if child.worst_score is not None and (self.worst is None or child.worst_score < self.worst):
+            self.worst = child.worst_score
+        self.complete = self.complete and child.complete
+
+class GameTreeSolver:
+    """Resuelve estados del árbol de juego consultando la tabla de transposición"""
+
+    def __init__(self, scenario: CompiledScenario, cache: OutcomeCache = None, max_depth: int = None,
+                 max_nodes: int = None):
+        self.scenario = scenario
+        self.cache = cache if cache is not None else get_shared_outcome_cache()
+        self.max_depth = max_depth or GameConfig.OUTCOME_SEARCH_DEPTH
+        self.max_nodes = max_nodes or GameConfig.OUTCOME_SEARCH_NODES
+
+    def solve(self, phase_index: int, history: FrozenSet[str],
+              indicators: Tuple[float, ...]) -> OutcomeEntry:
+        """Opciones, estados siguientes y mejor/peor puntaje alcanzable desde un estado"""
+        scenario = self.scenario
+        history = scenario.relevant_history(phase_index, history)
+        known, key = self._known(phase_index, history, indicators)
+        if known is not None:
+            return known
+
+        # Búsqueda en profundidad con pila explícita: la profundidad no depende de la
+        # pila de Python y se corta en max_depth fases o max_nodes estados expandidos
+        stack = [_Frame(scenario, phase_index, history, indicators, key)]
+        nodes = 1
+        while True:
+            frame = stack[-1]
+            if frame.position < len(frame.available):
+                position = frame.position
+                frame.position += 1
+                child_indicators, failed = frame.next_states[position]
+                if failed:
+                    continue
+                child_phase = frame.phase_index + 1
+                option = scenario.phases[frame.phase_index][frame.available[position]]
+                child_history = scenario.relevant_history(child_phase, frame.history | {option.key})
+                child, child_key = self._known(child_phase, child_history, child_indicators)
+                if child is None:
+                    if len(stack) < self.max_depth and nodes < self.max_nodes:
+                        stack.append(_Frame(scenario, child_phase, child_history, child_indicators, child_key))
+                        nodes += 1
+                        continue
+                    score = scenario.score(child_indicators)   # Corte: puntaje si terminara aquí
+                    child = OutcomeEntry((), (), score, score, complete=False)
+                frame.merge(child)
+                continue
+
+            stack.pop()
+            entry = OutcomeEntry(frame.available, frame.next_states, frame.best, frame.worst, frame.complete)
+            if entry.complete:
+                self.cache.put(frame.key, entry)
+            if not stack:
+                return entry
+            stack[-1].merge(entry)
+
+    def _known(self, phase_index: int, history: FrozenSet[str],
+               indicators: Tuple[float, ...]) -> Tuple[Optional[OutcomeEntry], Optional[bytes]]:
+        """Entrada de un estado final o memorizada (None si hay que expandirlo) y su clave"""
+        scenario = self.scenario
+        if phase_index >= scenario.max_phases:
+            score = scenario.score(indicators)
+            return OutcomeEntry((), (), score, score), None
+        key = state_key(scenario, phase_index, history, indicators)
+        return self.cache.get(key), key
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_outcome_cache() -> OutcomeCache:
+    """Caché compartida por todas las sesiones del proceso"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = OutcomeCache()
+        return _shared_cache
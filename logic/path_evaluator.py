@@ -0,0 +1,182 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+from config.settings import GameConfig
+from logic.compiled_scenario import CompiledScenario
+from logic.score_calculator import ScoreCalculator
+
+# Tabla de efectos por fase y opción: (efectos, bonus de sinergia o None)
+EffectTable = Sequence[Sequence[Tuple[Tuple[int, ...], Optional[Tuple[int, ...]]]]]
+
+class EvaluationBudgetError(ValueError):
+    """El escenario tiene más estados que los que el evaluador recorre por evaluación"""
+
+@dataclass
+class PathStats:
+    """Resumen de resultados sobre todos los caminos legales"""
+    total_paths: int
+    completed_paths: int
+    game_over_paths: int
+    random_game_over_probability: float   # Con elección uniforme entre las opciones disponibles
+    # (puntaje, caminos que lo obtienen) de los caminos completados, por puntaje descendente
+    score_counts: List[Tuple[float, int]] = field(default_factory=list)
+
+    @property
+    def best_score(self) -> Optional[float]:
+        return self.score_counts[0][0] if self.score_counts else None
+
+    @property
+    def excellent_paths(self) -> int:
+        """Caminos completados con categoría EXCELENTE"""
+        return sum(count for score, count in self.score_counts if score >= ScoreCalculator.EXCELLENT_SCORE)
+
+    @property
+    def dominance_gap(self) -> float:
+        """Ventaja del mejor camino sobre el segundo (0 si no hay un único dominante)"""
+        top = self.top_scores(2)
+        if len(top) < 2:
+            return 0.0
+        return top[0] - top[1]
+
+    def top_scores(self, limit: int) -> List[float]:
+        """Los `limit` mejores puntajes de caminos completados (con repeticiones)"""
+        scores = []
+        for score, count in self.score_counts:
+            scores.extend([score] * min(count, limit - len(scores)))
+            if len(scores) >= limit:
+                break
+        return scores
+
+class PathTreeEvaluator:
+    """Evaluador por lotes de todos los caminos legales de un escenario.
+
+    La disponibilidad de opciones y qué sinergias se activan solo dependen del
+    historial relevante (CompiledScenario.relevant_history), así que la estructura se
+    construye una vez, fase por fase, con un nodo por historial relevante distinto.
+    Evaluar una tabla de efectos candidata recorre las fases hacia adelante con un
+    estado por (nodo, indicadores): los caminos que llegan al mismo estado se cuentan
+    juntos, junto con su probabilidad de juego aleatorio.
+
+    Los nodos y los estados por evaluación se acotan con
+    GameConfig.PATH_EVALUATOR_STATES; al superarlo se lanza EvaluationBudgetError en
+    lugar de recorrer millones de caminos.
+    """
+
+    def __init__(self, scenario: CompiledScenario, max_states: int = None):
+        self.scenario = scenario
+        self.max_states = max_states or GameConfig.PATH_EVALUATOR_STATES
+        # Por fase, un nodo por historial relevante: tupla de aristas (opción, sinergia activa,
+        # nodo hijo en la fase siguiente o -1 en la última fase)
+        self.layers: List[List[Tuple[Tuple[int, bool, int], ...]]] = []
+        self._build()
+
+    def _build(self) -> None:
+        """Construye la estructura fase por fase, fusionando historiales equivalentes"""
+        scenario = self.scenario
+        histories = [frozenset()]
+        edges_count = 0
+        for phase_index in range(scenario.max_phases):
+            last_phase = phase_index + 1 >= scenario.max_phases
+            next_index = {}
+            next_histories = []
+            nodes = []
+            for history in histories:
+                edges = []
+                for option_index in scenario.available_options(phase_index, history):
+                    option = scenario.phases[phase_index][option_index]
+                    synergy = option.synergy_with is not None and option.synergy_with in history
+                    child = -1
+                    if not last_phase:
+                        child_history = scenario.relevant_history(phase_index + 1, history | {option.key})
+                        child = next_index.get(child_history)
+                        if child is None:
+                            child = next_index[child_history] = len(next_histories)
+                            next_histories.append(child_history)
+                    edges.append((option_index, synergy, child))
+                nodes.append(tuple(edges))
+                edges_count += len(edges)
+                if edges_count > self.max_states:
+                    raise EvaluationBudgetError(
+                        f"El escenario supera {self.max_states:,} nodos de historial en la fase "
+                        f"{phase_index + 1}; el evaluador de caminos no puede recorrerlo"
+                    )
+            self.layers.append(nodes)
+            histories = next_histories
+
+    @property
+    def node_count(self) -> int:
+        return sum(len(edges) for nodes in self.layers for edges in nodes)
+
+    def base_effect_table(self) -> EffectTable:
+        """Tabla de efectos original del escenario"""
+        return [
+            [(option.effects, option.synergy_bonus) for option in options]
+            for options in self.scenario.phases
+        ]
+
+    def evaluate(self, effect_table: EffectTable = None) -> PathStats:
+        """Evalúa todos los caminos con una tabla de efectos (por defecto, la del escenario)"""
+        table = effect_table or self.base_effect_table()
+        thresholds = self.scenario.failure_thresholds
+        # Con un único umbral basta comparar el mínimo (caso habitual, más rápido)
+        threshold = thresholds[0] if len(set(thresholds)) == 1 else None
+        score = self.scenario.score
+        budget = self.max_states
+
+        completed = 0
+        game_overs = 0
+        go_probability = 0.0
+        score_counts = {}
+        # Estados de la fase actual: (nodo, indicadores) -> [caminos, probabilidad de juego aleatorio]
+        states = {(0, tuple(self.scenario.initial_indicators)): [1, 1.0]} if self.layers else {}
+        visited = 0
+        for phase_index, nodes in enumerate(self.layers):
+            phase_table = table[phase_index]
+            next_states = {}
+            for (node, values), (count, probability) in states.items():
+                edges = nodes[node]
+                if not edges:
+                    # Sin opciones disponibles: el camino termina aquí (no en la primera fase)
+                    if phase_index:
+                        completed += count
+                        final = score(values)
+                        score_counts[final] = score_counts.get(final, 0) + count
+                    continue
+                child_probability = probability / len(edges)
+                for option_index, synergy, child in edges:
+                    effects, bonus = phase_table[option_index]
+                    current = tuple(min(100, max(0, v + e)) for v, e in zip(values, effects))
+                    if synergy and bonus is not None:
+                        current = tuple(min(100, max(0, v + e)) for v, e in zip(current, bonus))
+
+                    if (min(current) < threshold if threshold is not None
+                            else any(v < t for v, t in zip(current, thresholds))):
+                        game_overs += count
+                        go_probability += child_probability
+                    elif child < 0:
+                        completed += count
+                        final = score(current)
+                        score_counts[final] = score_counts.get(final, 0) + count
+                    else:
+                        key = (child, current)
+                        entry = next_states.get(key)
+                        if entry is None:
+                            visited += 1
+                            if visited > budget:
+                                raise EvaluationBudgetError(
+                                    f"La evaluación supera {budget:,} estados (fase, historial, indicadores) "
+                                    f"en la fase {phase_index + 2}; el escenario es demasiado grande para "
+                                    f"evaluar todos sus caminos"
+                                )
+                            next_states[key] = [count, child_probability]
+                        else:
+                            entry[0] += count
+                            entry[1] += child_probability
+            states = next_states
+
+        return PathStats(
+            total_paths=completed + game_overs,
+            completed_paths=completed,
+            game_over_paths=game_overs,
+            random_game_over_probability=go_probability,
+            score_counts=sorted(score_counts.items(), reverse=True)
+        )
@@ -0,0 +1,287 @@
+"""Versiones de escenario direccionadas por contenido.
+
+Cada escenario compilado se identifica por su huella (CompiledScenario.version) y
+se guarda una sola vez en GameConfig.SCENARIO_VERSIONS_DIR como <versión>.json.
+Las partidas, autoguardados, resultados y registros de partidas anotan la versión
+con la que se jugaron; al repetirlas o analizarlas se carga esa versión exacta
+aunque phases.json haya cambiado después. Las versiones cargadas se mantienen en
+una caché LRU acotada en memoria.
+
+En disco la fecha de modificación de cada archivo es su último uso (registrarla o
+cargarla la renueva). Al pasar de GameConfig.SCENARIO_VERSIONS_MAX versiones se
+borran las de uso más antiguo, salvo las que todavía anotan las sesiones guardadas,
+los resultados o el autoguardado (referenced_versions). La CLI también borra por
+antigüedad y puede conservar las versiones de registros de partidas.
+
+Uso:
+    python -m logic.scenario_versions [--register data/phases.json]
+    python -m logic.scenario_versions --prune-days 90 [--keep-log partidas.rpl]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Set, Tuple
+from config.settings import GameConfig
+from logic.compiled_scenario import CompiledScenario
+
+VERSION_FORMAT = 1
+TOUCH_INTERVAL = 600.0   # Segundos entre renovaciones del último uso de una versión en disco
+
+class ScenarioVersions:
+    """Escenarios compilados por versión: archivos en disco y caché LRU en memoria"""
+
+    def __init__(self, directory: str = None, capacity: int = None, max_versions: int = None):
+        self.directory = directory or GameConfig.SCENARIO_VERSIONS_DIR
+        self.capacity = capacity or GameConfig.SCENARIO_VERSION_CACHE_SIZE
+        self.max_versions = GameConfig.SCENARIO_VERSIONS_MAX if max_versions is None else max_versions
+        self._cache = OrderedDict()        # versión -> CompiledScenario
+        self._touched = {}                 # versión -> time.monotonic() de la última renovación en disco
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, version: str) -> str:
+        if not version or not all(c in '0123456789abcdef' for c in version):
+            raise KeyError(f"Versión de escenario inválida: {version!r}")
+        return os.path.join(self.directory, f"{version}.json")
+
+    def _remember(self, version: str, scenario: CompiledScenario) -> None:
+        self._cache[version] = scenario
+        self._cache.move_to_end(version)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+
+    def _touch_due(self, version: str) -> bool:
+        """True (y anota la renovación) si el último uso en disco de la versión está por renovarse"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._touched.get(version, -TOUCH_INTERVAL) < TOUCH_INTERVAL:
+                return False
+            self._touched[version] = now
+            return True
+
+    def register(self, scenario: CompiledScenario) -> str:
+        """Guarda el escenario si su versión es nueva y retorna la versión"""
+        version = scenario.version
+        with self._lock:
+            self._remember(version, scenario)
+        if not self._touch_due(version):
+            return version
+
+        path = self._path(version)
+        try:
+            os.utime(path)   # Ya estaba en disco: renovar su último uso
+            return version
+        except FileNotFoundError:
+            pass
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.scenario-', suffix='.tmp', dir=self.directory)
+        except BaseException:
+            with self._lock:
+                self._touched.pop(version, None)   # Reintentar en el próximo registro
+            raise
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                json.dump({'format': VERSION_FORMAT, 'scenario': scenario.to_dict()},
+                          file, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except BaseException:
+            with self._lock:
+                self._touched.pop(version, None)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._retain()
+        return version
+
+    def get(self, version: str) -> CompiledScenario:
+        """Escenario compilado de una versión (KeyError si nunca se registró)"""
+        with self._lock:
+            scenario = self._cache.get(version)
+            if scenario is not None:
+                self._cache.move_to_end(version)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if scenario is not None:
+            self._renew(version)
+            return scenario
+
+        try:
+            with open(self._path(version), 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            raise KeyError(f"Versión de escenario desconocida: {version}") from None
+        scenario = CompiledScenario.from_dict(data['scenario'])
+        if scenario.version != version:
+            raise ValueError(f"El archivo de la versión {version} está dañado")
+
+        with self._lock:
+            self._remember(version, scenario)
+        self._renew(version)
+        return scenario
+
+    def _renew(self, version: str) -> None:
+        """Renueva el último uso en disco de una versión usada (a lo sumo cada TOUCH_INTERVAL)"""
+        if self._touch_due(version):
+            try:
+                os.utime(self._path(version))
+            except OSError:
+                pass   # Borrada por otro proceso: la copia en memoria sigue sirviendo
+
+    def __contains__(self, version: str) -> bool:
+        with self._lock:
+            if version in self._cache:
+                return True
+        try:
+            return os.path.exists(self._path(version))
+        except KeyError:
+            return False
+
+    def versions(self) -> List[str]:
+        """Versiones guardadas en disco, de la usada más recientemente a la más antigua"""
+        return [version for version, _ in self._disk_versions()]
+
+    def _disk_versions(self) -> List[Tuple[str, float]]:
+        """(versión, último uso) de los archivos en disco, del uso más reciente al más antiguo"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+            try:
+                entries.append((name[:-len('.json')], os.path.getmtime(os.path.join(self.directory, name))))
+            except OSError:
+                continue   # Borrada mientras se listaba
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+        return entries
+
+    def prune(self, max_versions: int = None, max_age_days: float = None,
+              keep: Iterable[str] = ()) -> List[str]:
+        """Borra del disco las versiones fuera de las `max_versions` de uso más reciente o
+        sin uso hace más de `max_age_days`; nunca las de `keep` ni las cargadas en memoria.
+        Retorna las versiones borradas."""
+        keep = set(keep)
+        with self._lock:
+            keep.update(self._cache)
+        cutoff = None if max_age_days is None else time.time() - max_age_days * 86400
+        removed = []
+        for position, (version, used_at) in enumerate(self._disk_versions()):
+            too_many = max_versions is not None and position >= max_versions
+            too_old = cutoff is not None and used_at < cutoff
+            if (too_many or too_old) and version not in keep:
+                try:
+                    os.unlink(self._path(version))
+                except OSError:
+                    continue
+                removed.append(version)
+        return removed
+
+    def _retain(self) -> None:
+        """Aplica max_versions tras guardar una versión nueva, conservando las referenciadas"""
+        if not self.max_versions or len(self._disk_versions()) <= self.max_versions:
+            return
+        try:
+            keep = referenced_versions()
+        except Exception as e:
+            # Sin saber qué versiones siguen en uso no se borra nada
+            print(f"⚠️ No se pudieron leer las versiones en uso; no se borran versiones viejas: {e}")
+            return
+        self.prune(max_versions=self.max_versions, keep=keep)
+
+def referenced_versions(sessions_db: str = None, results_db: str = None, autosave_path: str = None,
+                        logs: Iterable[str] = ()) -> Set[str]:
+    """Versiones que anotan las sesiones guardadas, los resultados, el autoguardado y los
+    registros de partidas indicados (por defecto, los archivos de GameConfig que existan)"""
+    # Imports locales: el almacén no depende de dónde se anotan las versiones
+    from data.replay_log import log_versions
+    from data.results_store import ResultsStore
+    from data.session_store import SessionStore
+
+    versions = set()
+    sessions_db = sessions_db or GameConfig.SESSIONS_DB
+    if os.path.exists(sessions_db):
+        store = SessionStore(sessions_db)
+        try:
+            versions |= store.scenario_versions()
+        finally:
+            store.close()
+    results_db = results_db or GameConfig.RESULTS_DB
+    if os.path.exists(results_db):
+        results = ResultsStore(results_db)
+        try:
+            versions.update(version for version in results.scenario_versions() if version)
+        finally:
+            results.close()
+    autosave_path = autosave_path or GameConfig.AUTOSAVE_FILE
+    try:
+        with open(autosave_path, 'r', encoding='utf-8') as file:
+            version = json.load(file).get('scenario_version')
+        if version:
+            versions.add(version)
+    except (OSError, ValueError, AttributeError):
+        pass   # Sin autoguardado (o ilegible: no se podría reanudar)
+    for path in logs:
+        versions |= log_versions(path)
+    return versions
+
+_shared_versions = None
+_shared_versions_lock = threading.Lock()
+
+def get_scenario_versions() -> ScenarioVersions:
+    """Almacén de versiones compartido por todo el proceso"""
+    global _shared_versions
+    with _shared_versions_lock:
+        if _shared_versions is None:
+            _shared_versions = ScenarioVersions()
+        return _shared_versions
+
+def main(argv: List[str]) -> int:
+    """Lista las versiones de escenario guardadas, registra la actual o borra las viejas"""
+    # Import local: el almacén solo necesita escenarios compilados
+    from data.data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Versiones de escenario direccionadas por contenido")
+    parser.add_argument('--register', metavar='ESCENARIO', nargs='?', const='',
+                        help="registra un escenario (por defecto data/phases.json)")
+    parser.add_argument('--dir', default=None, help="directorio de versiones")
+    parser.add_argument('--prune-days', type=float, default=None,
+                        help="borra las versiones sin uso hace más de N días")
+    parser.add_argument('--max-versions', type=int, default=None,
+                        help="borra las versiones fuera de las N de uso más reciente")
+    parser.add_argument('--keep-log', action='append', default=[], metavar='REGISTRO',
+                        help="conserva las versiones de un registro de partidas (.rpl o JSONL); repetible")
+    parser.add_argument('--sessions-db', default=None, help="sesiones guardadas cuyas versiones se conservan")
+    parser.add_argument('--results-db', default=None, help="resultados cuyas versiones se conservan")
+    args = parser.parse_args(argv)
+
+    store = ScenarioVersions(args.dir)
+    if args.register is not None:
+        data_manager = DataManager(args.register or None)
+        scenario = CompiledScenario.from_phases(data_manager.get_phases(), data_manager.get_indicator_specs())
+        print(f"✅ Versión registrada: {store.register(scenario)} ({data_manager.data_path})")
+    if args.prune_days is not None or args.max_versions is not None:
+        keep = referenced_versions(args.sessions_db, args.results_db, logs=args.keep_log)
+        removed = store.prune(args.max_versions, args.prune_days, keep)
+        print(f"🧹 {len(removed):,} versiones borradas ({len(keep):,} en uso conservadas)")
+
+    for version in store.versions():
+        scenario = store.get(version)
+        options = sum(len(options) for options in scenario.phases)
+        print(f"📦 {version}  {scenario.max_phases} fases, {options} opciones, "
+              f"{len(scenario.indicator_names)} indicadores")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,64 +1,108 @@
-from typing import Dict, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Tuple
 from config.settings import UIConfig
+from data.data_manager import IndicatorSpec, default_indicator_specs
+
+# Tablas inmutables tomadas al importar: los cálculos no leen estado global mutable
+# y un ScoreCalculator se puede usar desde varios hilos
+LEVEL_COLORS = MappingProxyType({
+    'danger': UIConfig.COLORS['fg_error'],
+    'warning': UIConfig.COLORS['fg_warning'],
+    'success': UIConfig.COLORS['fg_success']
+})
+
+# (puntaje mínimo, categoría, mensaje, color), de la mejor a la peor
+SCORE_CATEGORIES = (
+    (70, "🏆 EXCELENTE", "¡Felicidades! Has logrado construir una empresa sólida y próspera.",
+     UIConfig.COLORS['fg_success']),
+    (50, "👍 BUENO", "Buen trabajo. Tu empresa está en una posición estable con potencial de crecimiento.",
+     UIConfig.COLORS['fg_info']),
+    (30, "⚠️ REGULAR", "Tu empresa sobrevivió, pero necesita mejoras importantes para prosperar.",
+     UIConfig.COLORS['fg_warning']),
+    (float('-inf'), "❌ CRÍTICO", "Tu empresa está en serios problemas. Es momento de replantear la estrategia.",
+     UIConfig.COLORS['fg_error'])
+)
 
 class ScoreCalculator:
-    """Maneja todos los cálculos relacionados con puntuaciones e indicadores"""
+    """Maneja todos los cálculos relacionados con puntuaciones e indicadores.
     
-    @staticmethod
-    def get_indicator_color(value: float) -> str:
-        """Determina el color del indicador según su valor"""
-        if value < UIConfig.CRITICAL_THRESHOLD:
-            return UIConfig.COLORS['fg_error']
-        elif value < 50:
-            return UIConfig.COLORS['fg_warning']
+    Los umbrales y pesos de cada indicador vienen de la declaración del escenario
+    (IndicatorSpec); los indicadores no declarados usan los valores por defecto.
+    La declaración se reemplaza entera (nunca se modifica en su lugar), así que
+    un hilo que la lee ve la anterior o la nueva completa.
+    """
+    
+    # Puntajes mínimos de cada categoría final
+    EXCELLENT_SCORE = SCORE_CATEGORIES[0][0]
+    GOOD_SCORE = SCORE_CATEGORIES[1][0]
+    REGULAR_SCORE = SCORE_CATEGORIES[2][0]
+    
+    def __init__(self, indicator_specs: List[IndicatorSpec] = None):
+        self.set_indicator_specs(indicator_specs or default_indicator_specs())
+    
+    def set_indicator_specs(self, indicator_specs: List[IndicatorSpec]) -> None:
+        """Reemplaza la declaración de indicadores (p. ej. tras recargar el escenario)"""
+        self.indicator_specs = MappingProxyType({spec.name: spec for spec in indicator_specs})
+    
+    def get_spec(self, name: str) -> IndicatorSpec:
+        """Declaración de un indicador (valores por defecto si el escenario no lo declara)"""
+        spec = self.indicator_specs.get(name)
+        return spec if spec is not None else IndicatorSpec(name=name)
+    
+    def get_indicator_level(self, name: str, value: float) -> str:
+        """Nivel del indicador según sus umbrales: 'danger', 'warning' o 'success'"""
+        spec = self.get_spec(name)
+        if value < spec.critical:
+            return 'danger'
+        elif value < spec.warning:
+            return 'warning'
         else:
-            return UIConfig.COLORS['fg_success']
+            return 'success'
     
-    @staticmethod
-    def get_progressbar_style(value: float) -> str:
+    def get_indicator_color(self, name: str, value: float) -> str:
+        """Determina el color del indicador según su valor"""
+        return LEVEL_COLORS[self.get_indicator_level(name, value)]
+    
+    def get_progressbar_style(self, name: str, value: float) -> str:
         """Determina el estilo de la barra de progreso"""
-        if value < UIConfig.CRITICAL_THRESHOLD:
+        level = self.get_indicator_level(name, value)
+        if level == 'danger':
             return "Red.Horizontal.TProgressbar"
-        elif value < 50:
+        elif level == 'warning':
             return "Orange.Horizontal.TProgressbar"
         else:
             return "Green.Horizontal.TProgressbar"
     
-    @staticmethod
-    def calculate_final_score(indicators: Dict[str, float]) -> Tuple[float, str, str, str]:
-        """Calcula la puntuación final y determina la categoría"""
-        total_score = sum(indicators.values())
-        avg_score = total_score / len(indicators)
-        
-        if avg_score >= 70:
-            category = "🏆 EXCELENTE"
-            message = "¡Felicidades! Has logrado construir una empresa sólida y próspera."
-            color = UIConfig.COLORS['fg_success']
-        elif avg_score >= 50:
-            category = "👍 BUENO"
-            message = "Buen trabajo. Tu empresa está en una posición estable con potencial de crecimiento."
-            color = UIConfig.COLORS['fg_info']
-        elif avg_score >= 30:
-            category = "⚠️ REGULAR"
-            message = "Tu empresa sobrevivió, pero necesita mejoras importantes para prosperar."
-            color = UIConfig.COLORS['fg_warning']
-        else:
-            category = "❌ CRÍTICO"
-            message = "Tu empresa está en serios problemas. Es momento de replantear la estrategia."
-            color = UIConfig.COLORS['fg_error']
+    def calculate_final_score(self, indicators: Dict[str, float]) -> Tuple[float, str, str, str]:
+        """Calcula la puntuación final (promedio ponderado) y determina la categoría"""
+        total_weight = 0.0
+        total_score = 0.0
+        for name, value in indicators.items():
+            weight = self.get_spec(name).weight
+            total_score += weight * value
+            total_weight += weight
+        avg_score = total_score / total_weight if total_weight else 0.0
+        category, message, color = ScoreCalculator.get_score_category(avg_score)
         
         return avg_score, category, message, color
     
     @staticmethod
-    def check_critical_indicators(indicators: Dict[str, float]) -> Tuple[list, list]:
-        """Verifica indicadores críticos y fallidos"""
+    def get_score_category(avg_score: float) -> Tuple[str, str, str]:
+        """Determina la categoría, el mensaje y el color para un puntaje promedio"""
+        for minimum, category, message, color in SCORE_CATEGORIES:
+            if avg_score >= minimum:
+                return category, message, color
+        return SCORE_CATEGORIES[-1][1:]   # NaN
+    
+    def check_critical_indicators(self, indicators: Dict[str, float]) -> Tuple[list, list]:
+        """Verifica indicadores críticos y fallidos según los umbrales de cada uno"""
         critical_indicators = [
             name for name, value in indicators.items() 
-            if value < UIConfig.CRITICAL_THRESHOLD
+            if value < self.get_spec(name).critical
         ]
         failed_indicators = [
             name for name, value in indicators.items() 
-            if value < UIConfig.FAILURE_THRESHOLD
+            if value < self.get_spec(name).failure
         ]
         
         return critical_indicators, failed_indicators
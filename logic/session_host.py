@@ -0,0 +1,507 @@
+"""Hospedaje de sesiones en varios procesos con el escenario en memoria compartida.
+
+Para exámenes con muchos jugadores simultáneos, N procesos trabajadores alojan
+cada uno un fragmento (shard) de las sesiones; cada sesión se enruta siempre al
+mismo trabajador según un hash estable de su id. El escenario compilado (matrices
+de efectos y sinergias, tabla de requisitos y textos de las claves) se escribe una
+sola vez en multiprocessing.shared_memory y los trabajadores lo leen desde ahí sin
+tener cada uno su copia. Las reglas son las de logic.simulation.step.
+
+Uso (prueba de carga local):
+    python -m logic.session_host --workers 1 2 4 --sessions 4000
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+from multiprocessing import get_context, shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config.settings import GameState
+from logic.compiled_scenario import CompiledOption, CompiledScenario, clamp_indicator
+from logic.simulation import SimulationState, initial_state, available_choices, step
+
+MAGIC = b'RAMSHM01'
+HEADER = struct.Struct('<8sI')   # magic, largo del índice JSON
+ALIGNMENT = 8
+KEY_CACHE_SIZE = 4096            # Claves decodificadas que cada proceso mantiene (las más usadas)
+
+# Respuesta de un trabajador a un comando (error es None si el comando se aplicó)
+SessionReply = namedtuple('SessionReply', 'status phase_index available indicators error')
+
+def shard_for(session_id: str, shards: int) -> int:
+    """Trabajador asignado a una sesión (hash estable entre procesos y reinicios)"""
+    digest = hashlib.blake2b(session_id.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') % shards
+
+def _string_table(values: Sequence[str]) -> Tuple[array, bytes]:
+    """Offsets y bytes UTF-8 concatenados de una lista de textos"""
+    offsets = array('i', [0])
+    blob = bytearray()
+    for value in values:
+        blob += value.encode('utf-8')
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+class SharedScenario:
+    """Escenario compilado en un bloque de memoria compartida.
+
+    Expone la misma interfaz que CompiledScenario usa logic.simulation (phases,
+    available_options, apply_option, score, umbrales...), leyendo los arreglos
+    directamente del bloque compartido. Solo los datos por indicador (nombres,
+    umbrales, pesos) se copian en cada proceso.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        magic, index_size = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError("El bloque de memoria compartida no contiene un escenario")
+        index = json.loads(bytes(shm.buf[HEADER.size:HEADER.size + index_size]).decode('utf-8'))
+
+        self._views = {}
+        self._exports = []   # Vistas a liberar antes de cerrar el bloque
+        for name, (typecode, offset, count) in index['sections'].items():
+            size = array(typecode).itemsize * count
+            raw = shm.buf[offset:offset + size]
+            self._views[name] = raw.cast(typecode)
+            self._exports += [self._views[name], raw]
+
+        self.indicator_names = tuple(index['indicator_names'])
+        self.initial_indicators = tuple(self._views['initial'])
+        self.failure_thresholds = tuple(self._views['failure'])
+        self.critical_thresholds = tuple(self._views['critical'])
+        self.weights = tuple(self._views['weights'])
+        self.uniform_weights = len(set(self.weights)) <= 1
+        self.fingerprint = bytes.fromhex(index['fingerprint'])
+        self.phase_ids = tuple(self._views['phase_ids'])
+        self.phases = _SharedPhases(self)
+        self._indicator_count = len(self.indicator_names)
+        self._key = lru_cache(maxsize=KEY_CACHE_SIZE)(self._decode_key)
+
+    # --- Creación y conexión ---
+
+    @classmethod
+    def create(cls, scenario: CompiledScenario) -> 'SharedScenario':
+        """Escribe el escenario en un bloque nuevo (el proceso creador debe llamar a unlink)"""
+        positions = scenario.option_index
+        options = [option for phase in scenario.phases for option in phase]
+        width = len(scenario.indicator_names)
+
+        phase_offsets = array('i', [0])
+        for phase in scenario.phases:
+            phase_offsets.append(phase_offsets[-1] + len(phase))
+
+        def global_index(key: Optional[str]) -> int:
+            # -1: la clave no existe en el escenario (nunca estará en el historial)
+            if key not in positions:
+                return -1
+            phase_index, option_index = positions[key]
+            return phase_offsets[phase_index] + option_index
+
+        effects, synergy, partner = array('i'), array('i'), array('i')
+        requires_offsets, requires = array('i', [0]), array('i')
+        for option in options:
+            effects.extend(option.effects)
+            synergy.extend(option.synergy_bonus or (0,) * width)
+            partner.append(global_index(option.synergy_with) if option.synergy_with is not None else -2)
+            requires.extend(global_index(key) for key in option.requires)
+            requires_offsets.append(len(requires))
+
+        key_offsets, key_blob = _string_table([option.key for option in options])
+        id_offsets, id_blob = _string_table([option.decision_id for option in options])
+        unlock_offsets, unlock_blob = _string_table([option.unlocks or '' for option in options])
+
+        sections = {
+            'phase_offsets': phase_offsets,
+            'phase_ids': array('i', scenario.phase_ids),
+            'effects': effects,
+            'synergy': synergy,
+            'synergy_partner': partner,
+            'requires_offsets': requires_offsets,
+            'requires': requires,
+            'key_offsets': key_offsets,
+            'key_text': array('B', key_blob),
+            'id_offsets': id_offsets,
+            'id_text': array('B', id_blob),
+            'unlock_offsets': unlock_offsets,
+            'unlock_text': array('B', unlock_blob),
+            'initial': array('d', scenario.initial_indicators),
+            'failure': array('d', scenario.failure_thresholds),
+            'critical': array('d', scenario.critical_thresholds),
+            'weights': array('d', scenario.weights)
+        }
+
+        # El índice se escribe con offsets provisorios para conocer su tamaño y luego con los reales
+        def build_index(layout):
+            return json.dumps({
+                'indicator_names': list(scenario.indicator_names),
+                'fingerprint': scenario.fingerprint.hex(),
+                'sections': layout
+            }, ensure_ascii=False).encode('utf-8')
+
+        placeholder = {name: (data.typecode, 0, len(data)) for name, data in sections.items()}
+        index_size = len(build_index(placeholder)) + 16 * len(sections)
+        offset = _align(HEADER.size + index_size)
+        layout = {}
+        for name, data in sections.items():
+            layout[name] = (data.typecode, offset, len(data))
+            offset = _align(offset + len(data) * data.itemsize)
+        index = build_index(layout).ljust(index_size)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        HEADER.pack_into(shm.buf, 0, MAGIC, len(index))
+        shm.buf[HEADER.size:HEADER.size + len(index)] = index
+        for name, data in sections.items():
+            start = layout[name][1]
+            raw = data.tobytes()
+            shm.buf[start:start + len(raw)] = raw
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> 'SharedScenario':
+        """Abre un escenario ya publicado por otro proceso"""
+        return cls(_attach_shared_memory(name), owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def size(self) -> int:
+        return self._shm.size
+
+    def close(self) -> None:
+        """Libera las vistas y el bloque (y lo elimina si este proceso lo creó)"""
+        self._views = {}
+        for view in self._exports:
+            view.release()
+        self._exports = []
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+    # --- Interfaz de CompiledScenario usada por logic.simulation ---
+
+    @property
+    def max_phases(self) -> int:
+        return len(self.phase_ids)
+
+    score = CompiledScenario.score
+
+    def indicator_vector(self, indicators: Dict[str, float]) -> Tuple[float, ...]:
+        return tuple(float(indicators[name]) for name in self.indicator_names)
+
+    def _text(self, table: str, index: int) -> str:
+        """Texto index de una tabla de textos ('key', 'id' o 'unlock')"""
+        offsets = self._views[f'{table}_offsets']
+        return bytes(self._views[f'{table}_text'][offsets[index]:offsets[index + 1]]).decode('utf-8')
+
+    def _decode_key(self, global_index: int) -> str:
+        return self._text('key', global_index)
+
+    def available_options(self, phase_index: int, history) -> List[int]:
+        """Índices de las opciones cuyos requisitos cumple el historial"""
+        start, end = self._views['phase_offsets'][phase_index:phase_index + 2]
+        offsets, requires, key = self._views['requires_offsets'], self._views['requires'], self._key
+        available = []
+        for global_index in range(start, end):
+            first, last = offsets[global_index], offsets[global_index + 1]
+            if first == last or all(requires[i] >= 0 and key(requires[i]) in history for i in range(first, last)):
+                available.append(global_index - start)
+        return available
+
+    def apply_option(self, indicators: Tuple[float, ...], history,
+                     phase_index: int, option_index: int) -> Tuple[Tuple[float, ...], bool]:
+        """Aplica una opción y retorna (nuevos indicadores, game over)"""
+        global_index = self._views['phase_offsets'][phase_index] + option_index
+        width = self._indicator_count
+        row = slice(global_index * width, (global_index + 1) * width)
+        values = tuple(clamp_indicator(v + e) for v, e in zip(indicators, self._views['effects'][row]))
+        partner = self._views['synergy_partner'][global_index]
+        if partner >= 0 and self._key(partner) in history:
+            values = tuple(clamp_indicator(v + e) for v, e in zip(values, self._views['synergy'][row]))
+        return values, any(v < t for v, t in zip(values, self.failure_thresholds))
+
+    def _option(self, phase_index: int, option_index: int) -> CompiledOption:
+        """Construye bajo demanda la opción (sin guardarla) desde el bloque compartido"""
+        global_index = self._views['phase_offsets'][phase_index] + option_index
+        width = self._indicator_count
+        row = slice(global_index * width, (global_index + 1) * width)
+        partner = self._views['synergy_partner'][global_index]
+        offsets = self._views['requires_offsets']
+        requires = self._views['requires'][offsets[global_index]:offsets[global_index + 1]]
+        has_synergy = partner != -2
+        return CompiledOption(
+            key=self._key(global_index),
+            decision_id=self._text('id', global_index),
+            effects=tuple(self._views['effects'][row]),
+            requires=tuple(self._key(index) if index >= 0 else '' for index in requires),
+            # Una sinergia con una clave inexistente nunca se activa: se conserva como clave vacía
+            synergy_with=(self._key(partner) if partner >= 0 else '') if has_synergy else None,
+            synergy_bonus=tuple(self._views['synergy'][row]) if has_synergy else None,
+            unlocks=self._text('unlock', global_index) or None
+        )
+
+class _SharedPhases:
+    """Secuencia perezosa de fases; cada opción se decodifica al accederla"""
+
+    def __init__(self, scenario: SharedScenario):
+        self._scenario = scenario
+
+    def __len__(self) -> int:
+        return self._scenario.max_phases
+
+    def __getitem__(self, phase_index: int) -> '_SharedOptions':
+        if not 0 <= phase_index < len(self):
+            raise IndexError(phase_index)
+        return _SharedOptions(self._scenario, phase_index)
+
+class _SharedOptions:
+    def __init__(self, scenario: SharedScenario, phase_index: int):
+        self._scenario = scenario
+        self._phase_index = phase_index
+
+    def __len__(self) -> int:
+        offsets = self._scenario._views['phase_offsets']
+        return offsets[self._phase_index + 1] - offsets[self._phase_index]
+
+    def __getitem__(self, option_index: int) -> CompiledOption:
+        if not 0 <= option_index < len(self):
+            raise IndexError(option_index)
+        return self._scenario._option(self._phase_index, option_index)
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Abre un bloque existente sin que este proceso quede como responsable de eliminarlo"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: los trabajadores iniciados por SessionHost comparten el resource
+        # tracker del proceso padre, que es quien elimina el bloque en close()
+        return shared_memory.SharedMemory(name=name)
+
+# --- Proceso trabajador ---
+
+def _reply(scenario: SharedScenario, state: SimulationState) -> SessionReply:
+    return SessionReply(
+        status=state.status.value,
+        phase_index=state.phase_index,
+        available=len(available_choices(scenario, state)),
+        indicators=state.indicators,
+        error=None
+    )
+
+def _handle(scenario: SharedScenario, sessions: Dict[str, SimulationState], command) -> SessionReply:
+    operation, session_id, argument = command
+    if operation == 'start':
+        sessions[session_id] = initial_state(scenario)
+        return _reply(scenario, sessions[session_id])
+
+    state = sessions.get(session_id)
+    if state is None:
+        return SessionReply(None, None, 0, None, f"Sesión desconocida: {session_id}")
+    if operation == 'choose':
+        try:
+            state, _ = step(scenario, state, argument)
+        except ValueError as e:
+            return SessionReply(state.status.value, state.phase_index, 0, state.indicators, str(e))
+        sessions[session_id] = state
+        return _reply(scenario, state)
+    if operation == 'state':
+        return _reply(scenario, state)
+    if operation == 'end':
+        del sessions[session_id]
+        return SessionReply(state.status.value, state.phase_index, 0, state.indicators, None)
+    return SessionReply(None, None, 0, None, f"Operación desconocida: {operation}")
+
+def _worker_main(shm_name: str, connection) -> None:
+    """Bucle de un trabajador: recibe lotes de comandos y responde con un lote de resultados"""
+    scenario = SharedScenario.attach(shm_name)
+    sessions = {}
+    try:
+        while True:
+            batch = connection.recv()
+            if batch is None:
+                break
+            if batch == 'stats':
+                connection.send({'pid': os.getpid(), 'sessions': len(sessions)})
+                continue
+            connection.send([_handle(scenario, sessions, command) for command in batch])
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        scenario.close()
+        connection.close()
+
+class SessionHost:
+    """Enruta sesiones a N procesos trabajadores (sticky por id de sesión)"""
+
+    def __init__(self, scenario: CompiledScenario, workers: int = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.shared_scenario = SharedScenario.create(scenario)
+        context = get_context('spawn')   # Los trabajadores no heredan el escenario del proceso padre
+        self._connections = []
+        self._processes = []
+        try:
+            for worker in range(self.workers):
+                parent_end, child_end = context.Pipe()
+                process = context.Process(target=_worker_main, args=(self.shared_scenario.name, child_end),
+                                          name=f'session-worker-{worker}', daemon=True)
+                process.start()
+                child_end.close()
+                self._connections.append(parent_end)
+                self._processes.append(process)
+        except Exception:
+            self.close()
+            raise
+
+    def shard_for(self, session_id: str) -> int:
+        return shard_for(session_id, self.workers)
+
+    def submit(self, commands: Sequence[Tuple[str, str, object]]) -> List[SessionReply]:
+        """Ejecuta un lote de comandos (operación, id de sesión, argumento) y retorna sus respuestas.
+
+        Cada trabajador recibe su parte del lote y los trabajadores procesan en paralelo;
+        las respuestas vuelven en el orden de los comandos.
+        """
+        positions = [[] for _ in range(self.workers)]
+        batches = [[] for _ in range(self.workers)]
+        for position, command in enumerate(commands):
+            shard = self.shard_for(command[1])
+            positions[shard].append(position)
+            batches[shard].append(command)
+
+        for shard, batch in enumerate(batches):
+            if batch:
+                self._connections[shard].send(batch)
+        replies = [None] * len(commands)
+        for shard, batch in enumerate(batches):
+            if batch:
+                for position, reply in zip(positions[shard], self._connections[shard].recv()):
+                    replies[position] = reply
+        return replies
+
+    def start_session(self, session_id: str) -> SessionReply:
+        return self.submit([('start', session_id, None)])[0]
+
+    def choose(self, session_id: str, choice) -> SessionReply:
+        return self.submit([('choose', session_id, choice)])[0]
+
+    def end_session(self, session_id: str) -> SessionReply:
+        return self.submit([('end', session_id, None)])[0]
+
+    def stats(self) -> List[Dict]:
+        """Sesiones activas por trabajador"""
+        for connection in self._connections:
+            connection.send('stats')
+        return [connection.recv() for connection in self._connections]
+
+    def close(self) -> None:
+        """Detiene los trabajadores y elimina el bloque compartido"""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
+        self._connections, self._processes = [], []
+        if self.shared_scenario is not None:
+            self.shared_scenario.close()
+            self.shared_scenario = None
+
+    def __enter__(self) -> 'SessionHost':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+# --- Prueba de carga ---
+
+def run_load_test(scenario: CompiledScenario, workers: int, sessions: int,
+                  batch_size: int = 1000, seed: int = 0) -> Dict[str, float]:
+    """Juega partidas completas al azar en paralelo y mide decisiones por segundo"""
+    rng = random.Random(seed)
+    with SessionHost(scenario, workers) as host:
+        session_ids = [f"s{seed}-{index}" for index in range(sessions)]
+        start = time.perf_counter()
+        decisions = 0
+        for first in range(0, sessions, batch_size):
+            active = {}
+            ids = session_ids[first:first + batch_size]
+            for session_id, reply in zip(ids, host.submit([('start', sid, None) for sid in ids])):
+                active[session_id] = reply
+            while active:
+                commands = [('choose', sid, rng.randrange(reply.available))
+                            for sid, reply in active.items() if reply.available]
+                if not commands:
+                    break
+                replies = host.submit(commands)
+                decisions += len(commands)
+                for (_, session_id, _), reply in zip(commands, replies):
+                    if reply.error or reply.status != GameState.PLAYING.value:
+                        del active[session_id]
+                    else:
+                        active[session_id] = reply
+            host.submit([('end', sid, None) for sid in ids])
+        elapsed = time.perf_counter() - start
+        shared_bytes = host.shared_scenario.size
+    return {
+        'workers': workers,
+        'sessions': sessions,
+        'decisions': decisions,
+        'elapsed': elapsed,
+        'decisions_per_second': decisions / elapsed if elapsed else 0.0,
+        'shared_bytes': shared_bytes
+    }
+
+def main(argv: List[str]) -> int:
+    """Prueba de carga: mide el rendimiento con distinta cantidad de trabajadores"""
+    from data.data_manager import DataManager
+
+    parser = argparse.ArgumentParser(description="Prueba de carga del hospedaje de sesiones en varios procesos")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help="cantidades de trabajadores a medir (por defecto 1, 2, 4... hasta los núcleos)")
+    parser.add_argument('--sessions', type=int, default=4000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    data_manager = DataManager(args.scenario)
+    scenario = CompiledScenario.from_phases(data_manager.get_phases(), data_manager.get_indicator_specs())
+    cpus = os.cpu_count() or 1
+    counts = args.workers or sorted({1, *[2 ** i for i in range(1, 8) if 2 ** i <= cpus], cpus})
+
+    baseline = None
+    for workers in counts:
+        result = run_load_test(scenario, workers, args.sessions, args.batch_size, args.seed)
+        baseline = baseline or result['decisions_per_second']
+        print(f"⚙️ {workers:>3} trabajadores: {result['decisions_per_second']:>10,.0f} decisiones/s "
+              f"({result['decisions']} decisiones en {result['elapsed']:.2f} s) - "
+              f"escalado x{result['decisions_per_second'] / baseline:.2f} - "
+              f"escenario compartido {result['shared_bytes'] / 1024:.1f} KiB")
+    if max(counts) > cpus:
+        print(f"⚠️ Este equipo tiene {cpus} núcleos: con más trabajadores no se espera escalado")
+    return 0
+
+if __name__ == '__main__':
+    # Se ejecuta desde el módulo importado para que los trabajadores (spawn) y este
+    # proceso compartan las mismas rutas de clases al intercambiar respuestas
+    from logic.session_host import main as session_host_main
+    sys.exit(session_host_main(sys.argv[1:]))
@@ -0,0 +1,280 @@
+"""Sesiones de GameEngine con un LRU en memoria y las inactivas guardadas en disco.
+
+Solo las sesiones usadas recientemente (hasta max_active) quedan en memoria como
+motores completos. Cuando se supera el límite, o cuando una sesión lleva más de
+idle_seconds sin solicitudes, su snapshot (GameEngine.get_snapshot) se guarda en
+data.session_store y el motor se libera. La siguiente solicitud a esa sesión la
+rehidrata desde el disco sin que el cliente lo note. Así la memoria depende de
+max_active y no de cuántas sesiones se iniciaron. La copia en disco de una sesión
+rehidratada queda como respaldo hasta su próximo desalojo o su cierre.
+
+Cada sesión tiene su propio lock: session() la entrega en exclusiva y el desalojo
+solo toma sesiones cuyo lock está libre, de modo que nunca se guarda un motor a
+mitad de una decisión. Una sesión que alguien espera mientras se desaloja se busca
+de nuevo (y se rehidrata) al obtener el lock.
+
+Uso (muchas sesiones con pocas en memoria):
+    python -m logic.session_manager --sessions 5000 --max-active 200
+"""
+import argparse
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+from config.settings import GameConfig
+from data.session_store import SessionStore
+from logic.game_engine import DecisionLog, GameEngine
+
+class UnknownSessionError(LookupError):
+    """La sesión no existe (nunca se creó, se cerró o se purgó del disco)"""
+
+    def __init__(self, session_id: str):
+        super().__init__(session_id)
+        self.session_id = session_id
+
+class _Session:
+    """Sesión en memoria: motor (None si se desalojó o aún se está cargando), lock y último acceso"""
+    __slots__ = ('engine', 'lock', 'last_access')
+
+    def __init__(self, engine: Optional[GameEngine]):
+        self.engine = engine
+        self.lock = threading.Lock()
+        self.last_access = time.monotonic()
+
+class SessionManager:
+    """Sesiones activas en un LRU acotado; las desalojadas viven en un SessionStore"""
+
+    def __init__(self, data_path: str = None, store: SessionStore = None, max_active: int = None,
+                 idle_seconds: float = None, decision_log: bool = False):
+        self.data_path = data_path
+        self.decision_log = decision_log    # Instala un DecisionLog en cada motor (--verbose)
+        self.store = store if store is not None else SessionStore()
+        self.max_active = max_active or GameConfig.MAX_ACTIVE_SESSIONS
+        self.idle_seconds = GameConfig.SESSION_IDLE_SECONDS if idle_seconds is None else idle_seconds
+        self._active: 'OrderedDict[str, _Session]' = OrderedDict()   # De menos a más reciente
+        self._lock = threading.Lock()                                # Protege _active y los contadores
+        self.created = 0
+        self.closed = 0
+        self.evicted = 0
+        self.rehydrated = 0
+        self._sweeper = None
+        self._stop = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._active)
+
+    def create(self) -> str:
+        """Inicia una sesión nueva en memoria; retorna su session_id"""
+        engine = self._new_engine()
+        with self._lock:
+            self._active[engine.session_id] = _Session(engine)
+            self.created += 1
+        self._enforce_limit()
+        return engine.session_id
+
+    def _new_engine(self, session_id: str = None) -> GameEngine:
+        engine = GameEngine(self.data_path, session_id=session_id)
+        if self.decision_log:
+            engine.add_listener(DecisionLog(engine))
+        return engine
+
+    @contextmanager
+    def session(self, session_id: str) -> Iterator[GameEngine]:
+        """Motor de la sesión en exclusiva (rehidratado si estaba en disco); UnknownSessionError si no existe"""
+        while True:
+            session = self._checkout(session_id)
+            session.lock.acquire()
+            if session.engine is not None:
+                break
+            session.lock.release()   # Se desalojó o falló su carga mientras esperábamos
+        try:
+            session.last_access = time.monotonic()
+            yield session.engine
+        finally:
+            session.lock.release()
+        self._enforce_limit()
+
+    def close(self, session_id: str) -> None:
+        """Termina una sesión: la quita de memoria y del disco; UnknownSessionError si no existe"""
+        with self._lock:
+            session = self._active.pop(session_id, None)
+        if session is not None:
+            with session.lock:
+                session.engine = None
+        if not self.store.delete(session_id) and session is None:
+            raise UnknownSessionError(session_id)
+        with self._lock:
+            self.closed += 1
+
+    def _checkout(self, session_id: str) -> _Session:
+        """Sesión en memoria, cargándola del disco si hace falta (un solo hilo la carga)"""
+        with self._lock:
+            session = self._active.get(session_id)
+            if session is not None:
+                self._active.move_to_end(session_id)
+                return session
+            # Lugar reservado: otros hilos que pidan la sesión esperan su lock
+            session = self._active[session_id] = _Session(None)
+            session.lock.acquire()
+        try:
+            snapshot = self.store.load(session_id)
+            if snapshot is None:
+                raise UnknownSessionError(session_id)
+            engine = self._new_engine(session_id)
+            engine.restore_snapshot(snapshot)
+        except BaseException:
+            with self._lock:
+                if self._active.get(session_id) is session:
+                    del self._active[session_id]
+            session.lock.release()
+            raise
+        session.engine = engine
+        with self._lock:
+            self.rehydrated += 1
+        session.lock.release()
+        return session
+
+    def _evict(self, session_id: str, session: _Session) -> bool:
+        """Guarda y libera una sesión cuyo lock ya tiene quien llama (y lo libera)"""
+        try:
+            self.store.save(session_id, session.engine.get_snapshot())
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar la sesión {session_id[:8]}; sigue en memoria: {e}")
+            session.lock.release()
+            return False
+        with self._lock:
+            if self._active.get(session_id) is session:
+                del self._active[session_id]
+            self.evicted += 1
+        session.engine = None
+        session.lock.release()
+        return True
+
+    def _enforce_limit(self) -> None:
+        """Desaloja las sesiones menos usadas mientras haya más de max_active en memoria"""
+        while True:
+            with self._lock:
+                if len(self._active) <= self.max_active:
+                    return
+                victim = None
+                for session_id, session in self._active.items():
+                    if session.lock.acquire(blocking=False):
+                        victim = session_id, session
+                        break
+                if victim is None:
+                    return   # Todas en uso: se desalojan cuando se liberen
+            if not self._evict(*victim):
+                return
+
+    def evict_idle(self, idle_seconds: float = None) -> int:
+        """Guarda en disco las sesiones sin solicitudes hace más de idle_seconds; retorna cuántas"""
+        limit = time.monotonic() - (self.idle_seconds if idle_seconds is None else idle_seconds)
+        with self._lock:
+            candidates = [(session_id, session) for session_id, session in self._active.items()
+                          if session.last_access < limit]
+        evicted = 0
+        for session_id, session in candidates:
+            if not session.lock.acquire(blocking=False):
+                continue   # En uso: ya no está inactiva
+            if session.engine is None or session.last_access >= limit:
+                session.lock.release()
+                continue
+            evicted += self._evict(session_id, session)
+        return evicted
+
+    def persist_all(self) -> int:
+        """Guarda todas las sesiones en memoria (p. ej. antes de detener el servicio)"""
+        return self.evict_idle(idle_seconds=-1.0)
+
+    def start_sweeper(self, interval: float = None) -> None:
+        """Barre las sesiones inactivas y purga las viejas del disco en un hilo en segundo plano"""
+        interval = interval or GameConfig.SESSION_SWEEP_INTERVAL
+
+        def sweep():
+            last_purge = 0.0
+            while not self._stop.wait(interval):
+                self.evict_idle()
+                if time.monotonic() - last_purge > 3600:
+                    self.store.purge()
+                    last_purge = time.monotonic()
+
+        self._sweeper = threading.Thread(target=sweep, name='session-sweeper', daemon=True)
+        self._sweeper.start()
+
+    def shutdown(self, persist: bool = True) -> int:
+        """Detiene el barrido y guarda las sesiones en memoria para retomarlas al reiniciar; retorna cuántas"""
+        self._stop.set()
+        if self._sweeper:
+            self._sweeper.join()
+        saved = self.persist_all() if persist else 0
+        self.store.close()
+        return saved
+
+    def stats(self) -> Dict:
+        return {
+            'active': len(self._active),
+            'stored': len(self.store),
+            'created': self.created,
+            'closed': self.closed,
+            'evicted': self.evicted,
+            'rehydrated': self.rehydrated
+        }
+
+def main(argv: List[str]) -> int:
+    """Inicia muchas sesiones con pocas en memoria y muestra la memoria y los tiempos"""
+    # Import local: solo la demostración mide memoria
+    import os
+    import random
+    import tempfile
+    from logic.game_service import process_memory
+
+    parser = argparse.ArgumentParser(description="Sesiones en memoria acotada con desalojo a disco")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--sessions', type=int, default=5000)
+    parser.add_argument('--max-active', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as directory:
+        manager = SessionManager(args.scenario, SessionStore(os.path.join(directory, 'sessions.db')),
+                                 max_active=args.max_active)
+        before = process_memory()
+        started = time.perf_counter()
+        ids = []
+        # Cada sesión toma una decisión y queda abierta, como un estudiante que se va
+        for _ in range(args.sessions):
+            session_id = manager.create()
+            with manager.session(session_id) as engine:
+                engine.make_decision(rng.randrange(len(engine.get_current_phase().decisions)))
+            ids.append(session_id)
+        created = time.perf_counter() - started
+
+        # Todos vuelven en otro orden y siguen jugando desde donde quedaron
+        started = time.perf_counter()
+        rng.shuffle(ids)
+        lost = 0
+        for session_id in ids:
+            with manager.session(session_id) as engine:
+                lost += engine.current_phase != 1
+                engine.make_decision(0)
+        resumed = time.perf_counter() - started
+
+        stats = manager.stats()
+        after = process_memory()
+        print(f"🗂️ {args.sessions:,} sesiones, máximo {args.max_active:,} en memoria: "
+              f"{stats['active']:,} activas, {stats['stored']:,} en disco")
+        print(f"⚡ Creación {created / args.sessions * 1e3:.2f} ms por sesión · "
+              f"retomar {resumed / args.sessions * 1e3:.2f} ms por sesión "
+              f"({stats['rehydrated']:,} rehidratadas, {stats['evicted']:,} desalojos)")
+        if before is not None and after is not None:
+            print(f"🧠 Memoria: {before / 2 ** 20:.1f} MiB → {after / 2 ** 20:.1f} MiB")
+        if lost:
+            print(f"❌ {lost:,} sesiones rehidratadas perdieron su progreso")
+        manager.shutdown(persist=False)
+    return 1 if lost else 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,150 @@
+"""Núcleo de simulación sin efectos secundarios.
+
+    step(scenario, state, choice) -> (state, outcome)
+    simulate(scenario, path) -> result
+
+Ambas funciones operan sobre un CompiledScenario y estados inmutables: no imprimen,
+no formatean texto y no modifican sus argumentos. Por eso pueden ejecutarse en
+paralelo entre hilos o procesos, memorizarse por (escenario, estado) y evaluarse
+por lotes. GameEngine es una capa delgada que guarda el estado de una sesión y
+delega aquí las reglas del juego.
+"""
+from dataclasses import dataclass
+from functools import cached_property
+from typing import FrozenSet, Iterable, List, Optional, Tuple, Union
+from config.settings import GameState
+from logic.compiled_scenario import CompiledScenario
+
+# Una elección es la posición entre las opciones disponibles (como en la UI),
+# el id de la opción ("A") o su clave de historial ("isla_1_A")
+Choice = Union[int, str]
+
+@dataclass(frozen=True)
+class SimulationState:
+    """Estado inmutable de una partida.
+
+    Al terminar la partida (game over o última fase) phase_index queda en la fase
+    donde se tomó la última decisión, igual que GameEngine.current_phase.
+    """
+    phase_index: int
+    indicators: Tuple[float, ...]           # En el orden de scenario.indicator_names
+    history: Tuple[str, ...] = ()           # Claves isla_X_Y en el orden en que se eligieron
+    status: GameState = GameState.PLAYING
+
+    @cached_property
+    def history_set(self) -> FrozenSet[str]:
+        return frozenset(self.history)
+
+    @property
+    def finished(self) -> bool:
+        return self.status != GameState.PLAYING
+
+@dataclass(frozen=True)
+class StepOutcome:
+    """Qué se eligió en un paso y qué cambió"""
+    phase_index: int
+    option_index: int                       # Índice de la opción dentro de la fase
+    option_key: str
+    previous_indicators: Tuple[float, ...]
+    indicators: Tuple[float, ...]
+    synergy_applied: bool
+    critical: Tuple[int, ...]               # Índices de indicadores bajo su umbral crítico
+    failed: Tuple[int, ...]                 # Índices de indicadores bajo su umbral de fracaso
+    status: GameState
+
+    @property
+    def game_over(self) -> bool:
+        return self.status == GameState.GAME_OVER
+
+    @property
+    def completed(self) -> bool:
+        return self.status == GameState.COMPLETED
+
+@dataclass(frozen=True)
+class SimulationResult:
+    """Resultado de simular un camino completo o parcial"""
+    state: SimulationState
+    outcomes: Tuple[StepOutcome, ...]
+    score: float                            # Promedio ponderado de los indicadores finales
+
+    @property
+    def game_over(self) -> bool:
+        return self.state.status == GameState.GAME_OVER
+
+    @property
+    def completed(self) -> bool:
+        return self.state.status == GameState.COMPLETED
+
+    @property
+    def path(self) -> Tuple[str, ...]:
+        return self.state.history
+
+def initial_state(scenario: CompiledScenario) -> SimulationState:
+    """Estado al comenzar una partida"""
+    return SimulationState(
+        phase_index=0,
+        indicators=scenario.initial_indicators,
+        status=GameState.PLAYING if scenario.max_phases else GameState.COMPLETED
+    )
+
+def available_choices(scenario: CompiledScenario, state: SimulationState) -> List[int]:
+    """Índices (dentro de la fase) de las opciones disponibles en el estado"""
+    if state.finished:
+        return []
+    return scenario.available_options(state.phase_index, state.history_set)
+
+def resolve_choice(scenario: CompiledScenario, state: SimulationState, choice: Choice) -> int:
+    """Índice de opción dentro de la fase para una elección, o ValueError si no está disponible"""
+    available = available_choices(scenario, state)
+    if isinstance(choice, int) and not isinstance(choice, bool):
+        if 0 <= choice < len(available):
+            return available[choice]
+    else:
+        options = scenario.phases[state.phase_index] if available else ()
+        for option_index in available:
+            if choice in (options[option_index].key, options[option_index].decision_id):
+                return option_index
+    raise ValueError(f"Elección no disponible en la fase {state.phase_index + 1}: {choice!r}")
+
+def step(scenario: CompiledScenario, state: SimulationState,
+         choice: Choice) -> Tuple[SimulationState, StepOutcome]:
+    """Aplica una elección y retorna (nuevo estado, resultado del paso)"""
+    if state.finished:
+        raise ValueError("La partida ya terminó")
+
+    phase_index = state.phase_index
+    option_index = resolve_choice(scenario, state, choice)
+    option = scenario.phases[phase_index][option_index]
+    indicators, game_over = scenario.apply_option(state.indicators, state.history_set,
+                                                  phase_index, option_index)
+
+    if game_over:
+        status, next_phase = GameState.GAME_OVER, phase_index
+    elif phase_index + 1 >= scenario.max_phases:
+        status, next_phase = GameState.COMPLETED, phase_index
+    else:
+        status, next_phase = GameState.PLAYING, phase_index + 1
+
+    outcome = StepOutcome(
+        phase_index=phase_index,
+        option_index=option_index,
+        option_key=option.key,
+        previous_indicators=state.indicators,
+        indicators=indicators,
+        synergy_applied=option.synergy_with is not None and option.synergy_with in state.history_set,
+        critical=tuple(i for i, (v, t) in enumerate(zip(indicators, scenario.critical_thresholds)) if v < t),
+        failed=tuple(i for i, (v, t) in enumerate(zip(indicators, scenario.failure_thresholds)) if v < t),
+        status=status
+    )
+    new_state = SimulationState(next_phase, indicators, state.history + (option.key,), status)
+    return new_state, outcome
+
+def simulate(scenario: CompiledScenario, path: Iterable[Choice],
+             state: Optional[SimulationState] = None) -> SimulationResult:
+    """Aplica una secuencia de elecciones desde el inicio (o desde state)"""
+    state = state or initial_state(scenario)
+    outcomes = []
+    for choice in path:
+        state, outcome = step(scenario, state, choice)
+        outcomes.append(outcome)
+    return SimulationResult(state=state, outcomes=tuple(outcomes), score=scenario.score(state.indicators))
@@ -0,0 +1,262 @@
+"""Prueba de estrés de concurrencia: muchos hilos avanzando sesiones a la vez.
+
+Comprueba el modelo de hilos del motor: cada GameEngine serializa sus cambios con
+su propio lock, el escenario compilado y la configuración son inmutables, y lo
+compartido entre sesiones (caché de resultados, panel, almacén de sesiones) tiene
+su propio lock. Tres partes, cada una con un ThreadPoolExecutor:
+
+    motores     hilos que deciden, leen snapshots y reinician los mismos motores,
+                con un DashboardAggregator escuchando a todos
+    sesiones    un SessionManager con pocas sesiones en memoria y desalojos
+                concurrentes mientras los hilos juegan
+    caché       una OutcomeCache pequeña (con desalojos) resolviendo estados en
+                paralelo, comparada con una resolución de un solo hilo
+
+Al terminar, cada historial se vuelve a simular con logic.simulation y debe dar
+el mismo estado, y los contadores (decisiones exitosas, eventos del panel) deben
+cuadrar. El intervalo de cambio de hilo se reduce al mínimo para forzar
+intercalados; en un CPython sin GIL (3.13t) los hilos corren realmente en paralelo.
+
+Uso:
+    python -m logic.thread_stress [--threads 8] [--operations 10000] [--scenario data/phases.json]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from config.settings import GameState
+from data.session_store import SessionStore
+from logic.dashboard import DashboardAggregator
+from logic.game_engine import GameEngine
+from logic.outcome_cache import GameTreeSolver, OutcomeCache
+from logic.session_manager import SessionManager
+from logic.simulation import initial_state, simulate, step
+
+def check_engine(engine: GameEngine) -> Optional[str]:
+    """Compara el snapshot del motor con su historial simulado de nuevo; None si coinciden"""
+    snapshot = engine.get_snapshot()
+    scenario = engine.get_compiled_scenario()
+    history = snapshot['decision_history']
+    try:
+        expected = simulate(scenario, history).state
+    except ValueError as e:
+        return f"{engine.session_id[:8]}: historial imposible {history}: {e}"
+    indicators = dict(zip(scenario.indicator_names, expected.indicators))
+    if (snapshot['current_phase'], snapshot['game_state'], snapshot['indicators']) != \
+            (expected.phase_index, expected.status.value, indicators):
+        return f"{engine.session_id[:8]}: snapshot inconsistente con su historial {history}"
+    return None
+
+def _run_workers(threads: int, worker, *args) -> List:
+    """Ejecuta worker(número, *args) en cada hilo del pool y retorna sus resultados"""
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(lambda number: worker(number, *args), range(threads)))
+
+def stress_engines(data_path: str, threads: int, operations: int, engine_count: int, seed: int) -> Dict:
+    """Hilos que comparten los mismos motores: decisiones, lecturas y reinicios intercalados"""
+    engines = [GameEngine(data_path, session_id=f"motor-{i + 1}") for i in range(engine_count)]
+    aggregator = DashboardAggregator(engines[0].get_compiled_scenario())
+    for engine in engines:
+        engine.add_listener(aggregator)
+    problems = []
+
+    def worker(number: int):
+        rng = random.Random(seed * 1000 + number)
+        decided = Counter()     # Motor -> decisiones exitosas de este hilo
+        archived = Counter()    # Motor -> decisiones de las partidas terminadas que este hilo reinició
+        finished = 0
+        for _ in range(operations // threads):
+            index = rng.randrange(engine_count)
+            engine = engines[index]
+            roll = rng.random()
+            if roll < 0.6:
+                decided[index] += engine.make_decision(rng.randrange(-1, 6)).success
+            elif roll < 0.85:
+                problem = check_engine(engine)
+                if problem:
+                    problems.append(problem)
+            elif roll < 0.95:
+                results = engine.get_final_results()
+                if results['game_over'] and len(results['path']) == 0:
+                    problems.append(f"{engine.session_id}: game over sin decisiones")
+            else:
+                with engine.lock:
+                    if engine.game_state != GameState.PLAYING:
+                        problem = check_engine(engine)
+                        if problem:
+                            problems.append(problem)
+                        archived[index] += len(engine.state.history)
+                        finished += 1
+                        engine.reset_game()
+        return decided, archived, finished
+
+    started = time.perf_counter()
+    results = _run_workers(threads, worker)
+    elapsed = time.perf_counter() - started
+
+    decided = sum((result[0] for result in results), Counter())
+    archived = sum((result[1] for result in results), Counter())
+    finished = sum(result[2] for result in results)
+    for index, engine in enumerate(engines):
+        problem = check_engine(engine)
+        if problem:
+            problems.append(problem)
+        if decided[index] != archived[index] + len(engine.state.history):
+            problems.append(f"{engine.session_id}: {decided[index]} decisiones exitosas pero "
+                            f"{archived[index] + len(engine.state.history)} en los historiales")
+        finished += engine.game_state != GameState.PLAYING
+
+    snapshot = aggregator.snapshot()
+    playing = sum(engine.game_state == GameState.PLAYING for engine in engines)
+    if sum(snapshot.picks.values()) != sum(decided.values()):
+        problems.append(f"Panel: {sum(snapshot.picks.values())} elecciones registradas, "
+                        f"{sum(decided.values())} decisiones exitosas")
+    if (snapshot.completed + snapshot.game_overs, snapshot.active, snapshot.abandoned) != (finished, playing, 0):
+        problems.append(f"Panel: {snapshot.completed + snapshot.game_overs} terminadas y {snapshot.active} en curso, "
+                        f"esperadas {finished} y {playing}")
+    return {'decisions': sum(decided.values()), 'games': finished, 'elapsed': elapsed, 'problems': problems}
+
+def stress_sessions(data_path: str, threads: int, operations: int, session_count: int, max_active: int,
+                    seed: int) -> Dict:
+    """Hilos jugando sesiones de un SessionManager mientras otro hilo las desaloja sin pausa"""
+    problems = []
+    with tempfile.TemporaryDirectory() as directory:
+        manager = SessionManager(data_path, SessionStore(os.path.join(directory, 'sessions.db')),
+                                 max_active=max_active)
+        ids = [manager.create() for _ in range(session_count)]
+        stop = threading.Event()
+        sweeps = [0]
+
+        def sweeper():
+            while not stop.wait(0.001):
+                manager.evict_idle(0.0)
+                sweeps[0] += 1
+
+        def worker(number: int):
+            rng = random.Random(seed * 1000 + 500 + number)
+            decided = Counter()
+            for _ in range(operations // threads):
+                session_id = rng.choice(ids)
+                with manager.session(session_id) as engine:
+                    if rng.random() < 0.7:
+                        decided[session_id] += engine.make_decision(rng.randrange(4)).success
+                    else:
+                        problem = check_engine(engine)
+                        if problem:
+                            problems.append(problem)
+            return decided
+
+        sweeping = threading.Thread(target=sweeper, name='stress-sweeper')
+        sweeping.start()
+        started = time.perf_counter()
+        try:
+            results = _run_workers(threads, worker)
+        finally:
+            stop.set()
+            sweeping.join()
+        elapsed = time.perf_counter() - started
+
+        decided = sum(results, Counter())
+        for session_id in ids:
+            with manager.session(session_id) as engine:
+                problem = check_engine(engine)
+                if problem:
+                    problems.append(problem)
+                if decided[session_id] != len(engine.state.history):
+                    problems.append(f"{session_id[:8]}: {decided[session_id]} decisiones exitosas pero "
+                                    f"{len(engine.state.history)} en el historial (progreso perdido)")
+        stats = manager.stats()
+        manager.shutdown(persist=False)
+    return {'decisions': sum(decided.values()), 'evicted': stats['evicted'], 'rehydrated': stats['rehydrated'],
+            'sweeps': sweeps[0], 'elapsed': elapsed, 'problems': problems}
+
+def stress_outcome_cache(data_path: str, threads: int, operations: int, capacity: int, seed: int) -> Dict:
+    """Hilos resolviendo estados con una caché compartida pequeña; se compara con un solo hilo"""
+    scenario = GameEngine(data_path).get_compiled_scenario()
+    rng = random.Random(seed)
+    states = []
+    for _ in range(200):
+        state = initial_state(scenario)
+        while not state.finished:
+            states.append(state)
+            choices = scenario.available_options(state.phase_index, state.history_set)
+            state, _ = step(scenario, state, rng.randrange(len(choices)))
+
+    def solve(solver: GameTreeSolver, index: int):
+        state = states[index]
+        entry = solver.solve(state.phase_index, state.history_set, state.indicators)
+        return entry.available, entry.next_states, entry.best_score, entry.worst_score
+
+    reference_solver = GameTreeSolver(scenario, OutcomeCache())
+    reference = [solve(reference_solver, index) for index in range(len(states))]
+    shared = OutcomeCache(capacity=capacity)
+    problems = []
+
+    def worker(number: int):
+        worker_rng = random.Random(seed * 1000 + 900 + number)
+        solver = GameTreeSolver(scenario, shared)
+        for _ in range(operations // threads):
+            index = worker_rng.randrange(len(states))
+            if solve(solver, index) != reference[index]:
+                problems.append(f"Caché: resultado distinto para el estado {states[index].history}")
+
+    started = time.perf_counter()
+    _run_workers(threads, worker)
+    elapsed = time.perf_counter() - started
+    stats = shared.stats()
+    if len(shared) > capacity:
+        problems.append(f"Caché: {len(shared)} entradas con capacidad {capacity}")
+    return {'solves': operations // threads * threads, 'hit_rate': stats['hit_rate'], 'elapsed': elapsed,
+            'problems': problems}
+
+def main(argv: List[str]) -> int:
+    """Ejecuta las tres partes y retorna 1 si alguna encontró una carrera"""
+    parser = argparse.ArgumentParser(description="Prueba de estrés de concurrencia del motor")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--operations', type=int, default=10000, help="operaciones por parte")
+    parser.add_argument('--engines', type=int, default=16, help="motores compartidos por los hilos")
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--max-active', type=int, default=16)
+    parser.add_argument('--cache-capacity', type=int, default=256, help="menor que los estados del árbol para forzar desalojos")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"🧵 {args.threads} hilos · Python {sys.version.split()[0]} "
+          f"{'con GIL' if gil else 'sin GIL (free-threaded)'}")
+    previous_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)   # Cambios de hilo lo más seguido posible
+    try:
+        engines = stress_engines(args.scenario, args.threads, args.operations, args.engines, args.seed)
+        sessions = stress_sessions(args.scenario, args.threads, args.operations, args.sessions,
+                                   args.max_active, args.seed)
+        cache = stress_outcome_cache(args.scenario, args.threads, args.operations, args.cache_capacity,
+                                     args.seed)
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+    print(f"🎮 Motores compartidos: {engines['decisions']:,} decisiones, {engines['games']:,} partidas "
+          f"terminadas en {engines['elapsed']:.2f} s")
+    print(f"🗂️ Sesiones con desalojo: {sessions['decisions']:,} decisiones, {sessions['evicted']:,} desalojos, "
+          f"{sessions['rehydrated']:,} rehidratadas, {sessions['sweeps']:,} barridos en {sessions['elapsed']:.2f} s")
+    print(f"🧮 Caché compartida: {cache['solves']:,} resoluciones ({cache['hit_rate']:.0%} aciertos) "
+          f"en {cache['elapsed']:.2f} s")
+
+    problems = engines['problems'] + sessions['problems'] + cache['problems']
+    for problem in problems[:20]:
+        print(f"❌ {problem}")
+    if problems:
+        print(f"❌ {len(problems):,} inconsistencias encontradas")
+        return 1
+    print("✅ Sin carreras: historiales, snapshots, panel y caché coinciden con la ejecución de un solo hilo")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,4 +1,5 @@
 import tkinter as tk
+import argparse
 import sys
 import os
 import json
@@ -7,13 +8,18 @@ import json
 sys.path.append(os.path.dirname(__file__))
 
 from ui.ui_manager import UIManager
-from logic.game_engine import GameEngine
-from config.settings import GameState
+from logic.game_engine import DecisionLog, GameEngine
+from logic.option_preview import OptionPreviewer
+from data.autosave_manager import AutosaveManager
+from data.results_store import ResultsStore
+from data.scenario_archive import ARCHIVE_EXTENSION, ArchiveError, ScenarioArchive
+from config.settings import GameConfig, GameState, UIConfig
 
 class BusinessSimulator:
     """Simulador empresarial refactorizado"""
     
-    def __init__(self):
+    def __init__(self, watch_phases: bool = False, scenario_path: str = None, cohort: str = '',
+                 theme: str = None):
         self.root = tk.Tk()
         self.root.title("🎮 Simulador Estratégico Empresarial")
         self.root.geometry("1200x800")  # Ventana más grande para mejor UI
@@ -24,15 +30,32 @@ class BusinessSimulator:
         self._setup_window_style()
         
         try:
-            self.game_engine = GameEngine()
-            self.ui_manager = UIManager(self.root, self.handle_decision)
+            self.game_engine = GameEngine(scenario_path)
+            self.game_engine.add_listener(DecisionLog(self.game_engine))   # Log de decisiones en consola
+            self.option_previewer = OptionPreviewer(self.game_engine)
+            self.autosave = AutosaveManager()
+            self.results_store = ResultsStore()
+            self.cohort = cohort
+            self.ui_manager = UIManager(self.root, self.handle_decision,
+                                        self.option_previewer.request_preview, theme=theme)
+            self.root.bind('<F2>', lambda event: self.toggle_theme())
             
             # Mostrar pantalla de inicio en lugar de iniciar el juego directamente
             self.show_start_screen()
+            
+            if watch_phases:
+                print("👀 Modo watch: los cambios en el archivo de fases se aplicarán en caliente")
+                self.root.after(GameConfig.HOT_RELOAD_INTERVAL_MS, self._watch_phases_file)
         except Exception as e:
             print(f"❌ Error en inicialización: {e}")
             raise
     
+    def toggle_theme(self):
+        """Alterna entre los temas disponibles sin reconstruir la pantalla"""
+        themes = list(UIConfig.THEMES)
+        current = themes.index(self.ui_manager.styles.theme)
+        self.ui_manager.set_theme(themes[(current + 1) % len(themes)])
+    
     def _setup_window_style(self):
         """Configura el estilo moderno de la ventana en pantalla completa"""
         try:
@@ -50,11 +73,29 @@ class BusinessSimulator:
             except Exception as e2:
                 print(f"⚠️ Error configurando ventana: {e2}")
     
+    def _watch_phases_file(self):
+        """Revisa periódicamente el archivo de fases y aplica los cambios sin reiniciar la partida"""
+        try:
+            changed = self.game_engine.reload_phases()
+            if changed is not None:
+                self.option_previewer.clear()
+                in_game = (self.game_engine.game_state == GameState.PLAYING
+                           and self.ui_manager.content_frame.winfo_exists())
+                if in_game:
+                    self.update_ui()
+                    if self.game_engine.current_phase in changed:
+                        self.show_current_phase()
+        except Exception as e:
+            print(f"⚠️ Error en recarga en caliente: {e}")
+        finally:
+            self.root.after(GameConfig.HOT_RELOAD_INTERVAL_MS, self._watch_phases_file)
+    
     def start_game(self):
         """Inicia o reinicia el juego"""
         try:
             print("🔄 Iniciando nuevo juego...")
             self.game_engine.reset_game()
+            self.autosave.clear()
             self.update_ui()
             self.show_current_phase()
             print("✅ Juego iniciado correctamente")
@@ -69,7 +110,8 @@ class BusinessSimulator:
             self.ui_manager.update_indicators_display(
                 game_info['indicators'],
                 game_info['current_phase'],
-                game_info['max_phases']
+                game_info['max_phases'],
+                game_info['indicator_specs']
             )
         except Exception as e:
             print(f"❌ Error al actualizar UI: {e}")
@@ -117,7 +159,7 @@ class BusinessSimulator:
                 for decision in phase_data.decisions:
                     option = {
                         'title': decision.text,
-                        'description': decision.description,
+                        'description': decision.description,   # LazyText en .scn: se lee al desplegarla
                         'strategy_type': getattr(decision, 'strategy_type', ''),
                         'effects': decision.effects,
                         'synergy_with': getattr(decision, 'synergy_with', None),
@@ -129,8 +171,8 @@ class BusinessSimulator:
                 
                 return {
                     'title': phase_data.title,
-                    'description': getattr(phase_data, 'context', ''),
-                    'context': getattr(phase_data, 'context', ''),
+                    'description': str(getattr(phase_data, 'context', '')),
+                    'context': str(getattr(phase_data, 'context', '')),
                     'question': phase_data.question,
                     'options': options,
                     'id': phase_data.id,
@@ -190,29 +232,34 @@ class BusinessSimulator:
             print(f"🎯 Procesando decisión {decision_index}...")
             result = self.game_engine.make_decision(decision_index)
             
-            if not result.get('success', False):
-                print(f"⚠️ Decisión fallida: {result.get('error', 'Error desconocido')}")
+            if not result.success:
+                print(f"⚠️ Decisión fallida: {result.message or 'Error desconocido'}")
                 return
             
+            # Autoguardado en segundo plano (una partida terminada ya no se puede reanudar)
+            if result.game_over or result.game_completed:
+                self.autosave.clear()
+                self._record_results()
+            else:
+                self.autosave.save(self.game_engine.get_snapshot())
+            
             # Mostrar efectos de la decisión
-            if result.get('decision_text') and result.get('effects_list'):
-                self.ui_manager.show_decision_effects(
-                    result['decision_text'],
-                    result['effects_list']
-                )
+            effects_list = result.format_effects()
+            if result.decision_text and effects_list:
+                self.ui_manager.show_decision_effects(result.decision_text, effects_list)
             
             # Verificar condiciones especiales ANTES de actualizar UI
-            if result.get('game_over'):
+            if result.game_over:
                 print("💀 Game Over detectado")
                 self.ui_manager.show_game_over(
-                    result.get('failed_indicators', []),
+                    result.failed_indicators,
                     self.game_engine.current_phase + 1,
                     self.game_engine.max_phases
                 )
                 self.show_restart_option()
                 return
             
-            if result.get('game_completed'):
+            if result.game_completed:
                 print("🎉 Juego completado")
                 self.update_ui()
                 self.show_final_results()
@@ -221,8 +268,8 @@ class BusinessSimulator:
             # Actualizar UI y continuar
             self.update_ui()
             
-            if result.get('critical_indicators'):
-                self.ui_manager.show_critical_warning(result['critical_indicators'])
+            if result.critical:
+                self.ui_manager.show_critical_warning(result.critical_indicators)
             
             self.show_current_phase()
             
@@ -236,6 +283,18 @@ class BusinessSimulator:
             except:
                 self.show_final_results()
     
+    def _record_results(self):
+        """Registra la partida terminada en el almacén de resultados (sin bloquear la UI)"""
+        try:
+            self.results_store.record(
+                self.game_engine.get_final_results(),
+                cohort=self.cohort,
+                scenario=os.path.basename(self.game_engine.data_manager.data_path),
+                session_id=self.game_engine.session_id
+            )
+        except Exception as e:
+            print(f"⚠️ Error registrando resultados: {e}")
+    
     def show_final_results(self):
         """Muestra los resultados finales"""
         try:
@@ -272,16 +331,36 @@ class BusinessSimulator:
     def quit_game(self):
         """Cierra el juego"""
         print("👋 Cerrando simulador...")
+        self.option_previewer.shutdown()
+        self.autosave.close()
+        self.results_store.close()
+        self.game_engine.data_manager.close()
         self.root.quit()
     
     def show_start_screen(self):
         """Muestra la pantalla de inicio"""
         print("🏠 Mostrando pantalla de inicio...")
+        snapshot = self.autosave.load()
+        can_resume = snapshot is not None and snapshot.get('game_state') == GameState.PLAYING.value
         self.ui_manager.show_start_screen(
             start_game_callback=self.start_game_from_menu,
-            show_rules_callback=self.show_rules_screen
+            show_rules_callback=self.show_rules_screen,
+            resume_game_callback=(lambda: self.resume_game(snapshot)) if can_resume else None
         )
     
+    def resume_game(self, snapshot):
+        """Reanuda una partida interrumpida a partir del autoguardado"""
+        try:
+            print("💾 Reanudando partida guardada...")
+            self.ui_manager.setup_game_ui()
+            self.game_engine.restore_snapshot(snapshot)
+            self.update_ui()
+            self.show_current_phase()
+            print("✅ Partida reanudada correctamente")
+        except Exception as e:
+            print(f"❌ Error al reanudar partida: {e}. Iniciando una nueva.")
+            self.start_game()
+    
     def show_rules_screen(self):
         """Muestra la pantalla de reglas"""
         print("📖 Mostrando pantalla de reglas...")
@@ -302,16 +381,32 @@ class BusinessSimulator:
         print("🚀 Iniciando interfaz gráfica...")
         self.root.mainloop()
 
+def _parse_args():
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Simulador Estratégico Empresarial")
+    parser.add_argument('--watch', action='store_true',
+                        help="recarga en caliente el archivo de fases al modificarlo")
+    parser.add_argument('--scenario', default=None,
+                        help="archivo de escenario a usar (phases.json o un archivo .scn)")
+    parser.add_argument('--cohort', default='',
+                        help="cohorte o curso con el que se registran los resultados")
+    parser.add_argument('--theme', choices=list(UIConfig.THEMES), default=None,
+                        help="tema de la interfaz (F2 alterna durante el juego)")
+    return parser.parse_args()
+
 def main():
     """Función principal con mejor presentación y validaciones"""
+    args = _parse_args()
+    scenario_path = args.scenario or 'data/phases.json'
+
     print("=" * 60)
     print("🎮 SIMULADOR ESTRATÉGICO EMPRESARIAL")
     print("=" * 60)
     print()
     print("📋 INSTRUCCIONES:")
     print("   🔸 Comenzarás con todos los indicadores al 80%")
-    print("   🔸 Debes completar 5 fases estratégicas")
-    print("   🔸 Evita que cualquier indicador baje del 5%")
+    print("   🔸 Debes completar todas las fases estratégicas del escenario")
+    print("   🔸 Evita que cualquier indicador caiga bajo su umbral de fracaso")
     print("   🔸 Busca encadenamientos lógicos entre decisiones")
     print("   🔸 ¡Mantén el equilibrio y haz crecer tu empresa!")
     print()
@@ -325,7 +420,7 @@ def main():
             'ui/ui_manager.py',
             'logic/game_engine.py', 
             'config/settings.py',
-            'data/phases.json'
+            scenario_path
         ]
         
         missing_files = []
@@ -340,13 +435,21 @@ def main():
             input("Presiona Enter para salir...")
             return
         
-        # Verificar que el JSON es válido
+        # Verificar que el escenario es válido
         try:
-            with open('data/phases.json', 'r', encoding='utf-8') as f:
-                phases_data = json.load(f)
-                print(f"✅ Archivo phases.json cargado ({len(phases_data['phases'])} fases)")
-        except json.JSONDecodeError as e:
-            print(f"❌ Error en phases.json: {e}")
+            if scenario_path.endswith(ARCHIVE_EXTENSION):
+                with ScenarioArchive(scenario_path) as archive:
+                    print(f"✅ Archivo {scenario_path} cargado ({len(archive.phases)} fases)")
+            else:
+                with open(scenario_path, 'r', encoding='utf-8') as f:
+                    phases_data = json.load(f)
+                    print(f"✅ Archivo {scenario_path} cargado ({len(phases_data['phases'])} fases)")
+        except ArchiveError as e:
+            print(f"❌ Archivo de escenario dañado {scenario_path}: {e}")
+            input("Presiona Enter para salir...")
+            return
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"❌ Error en {scenario_path}: {e}")
             input("Presiona Enter para salir...")
             return
         
@@ -370,7 +473,8 @@ def main():
         print("✅ Todos los archivos y módulos verificados. Iniciando simulador...")
         print()
         
-        game = BusinessSimulator()
+        game = BusinessSimulator(watch_phases=args.watch, scenario_path=args.scenario,
+                                 cohort=args.cohort, theme=args.theme)
         game.run()
         
     except KeyboardInterrupt:
@@ -0,0 +1,27 @@
+"""Textos fijos de las pantallas de inicio y reglas, compartidos por las interfaces.
+
+Sin dependencias de tkinter: los usan tanto ui.ui_manager como la interfaz de terminal.
+"""
+
+RULES_WELCOME = 'Bienvenido al Simulador de Decisiones Estratégicas "El Rincón de Amaru"'
+
+RULES_DESCRIPTION = """En este juego representarás a un emprendedor que ha fundado una cafetería con identidad cultural, insumos locales y un enfoque experiencial. Tu objetivo es mantener el equilibrio estratégico a lo largo de 5 rondas (islas), cada una basada en una de las 5 fuerzas de Porter."""
+
+RULES_TITLE = "📋 Reglas del Juego:"
+
+GAME_RULES = [
+    "Cada decisión que tomes afectará uno o más de los siguientes indicadores: liquidez, rentabilidad, reputación, sostenibilidad estratégica y riesgo acumulado.",
+    "No hay decisiones \"correctas\" o \"incorrectas\" absolutas. El éxito radica en tu coherencia estratégica, capacidad de adaptación y visión de largo plazo.",
+    "Tu empresa puede crecer, sostenerse o fracasar según cómo combines tus decisiones.",
+    "Al finalizar cada isla, verás cómo cambian tus indicadores. Analiza los resultados y aprende.",
+    "El juego termina cuando completas las 5 islas o cuando el riesgo acumulado alcanza el 100% (fracaso operativo)."
+]
+
+STORY_TITLE = '📖 Historia de la Cafetería "El Rincón de Amaru"'
+
+STORY_PARAGRAPHS = [
+    """Amaru Mamani, joven emprendedor cochabambino, fundó El Rincón de Amaru con el sueño de unir café de altura, cultura local y emprendimiento juvenil. Tras años de esfuerzo, abrió una cafetería con una propuesta única: arte local, música en vivo, productos regionales y atención personalizada.""",
+    """Aunque el inicio fue exitoso, pronto enfrentó dilemas estratégicos: expandir el menú o mejorar márgenes, contratar personal o mantener turnos familiares, elegir entre proveedores baratos o microproductores, participar en ferias o enfocarse en el local, y adoptar delivery o preservar la experiencia presencial.""",
+    """Cada decisión afectaba indicadores clave como liquidez, rentabilidad, reputación y sostenibilidad. Amaru aprendió que no hay decisiones "correctas", sino estrategias coherentes que acumulen valor a largo plazo.""",
+    """Este concepto se convierte en la base de un juego de simulación empresarial, donde el jugador toma decisiones como Amaru, enfrentando las 5 fuerzas de Porter: proveedores, clientes, productos sustitutos, nuevos competidores y rivalidad sectorial. El resultado final dependerá de cómo se gestionan estas decisiones y su impacto acumulado en el negocio."""
+]
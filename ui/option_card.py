@@ -0,0 +1,182 @@
+"""Tarjeta de opción de una fase con descripción plegable y construida bajo demanda.
+
+La tarjeta muestra de inmediato el botón con el título y el tipo de estrategia; la
+descripción (varias oraciones con ajuste de línea, la parte más costosa de
+maquetar) se crea recién cuando el jugador la despliega. Así ni la primera pintura
+de una fase ni el desplazamiento maquetan textos que quizá nunca se lean.
+
+Uso (compara la primera pintura con descripciones inmediatas y plegadas, como las ve el jugador):
+    python -m ui.option_card [--scenario data/phases.json] [--rounds 20]
+"""
+import argparse
+import sys
+import time
+import tkinter as tk
+from typing import Callable, Dict, List
+from ui.style_registry import StyleRegistry, ThemedButton, ThemedFrame, ThemedLabel
+
+class OptionCard(ThemedFrame):
+    """Opción de una fase: botón, proyección, tipo de estrategia y descripción plegable"""
+
+    EXPAND_TEXT = "▸ Ver descripción"
+    COLLAPSE_TEXT = "▾ Ocultar descripción"
+
+    def __init__(self, parent, index: int, option: Dict, styles: StyleRegistry,
+                 on_select: Callable, on_preview: Callable = None, expanded: bool = False):
+        colors = styles.colors
+        super().__init__(parent, bg=colors['secondary'])
+        self.index = index
+        self.styles = styles
+        self.colors = colors
+        self._description = option.get('description')   # str o LazyText: se convierte al mostrarla
+        self._description_label = None
+        self.expanded = False
+
+        # Botón principal con tema oscuro - ocupa todo el ancho
+        self.button = ThemedButton(
+            self,
+            text=f"{chr(65 + index)}) {option['title']}",
+            font=styles.font(11, 'bold'),
+            bg=colors['card_bg'],
+            fg=colors['text_primary'],
+            activebackground=colors['highlight'],
+            activeforeground=colors['text_primary'],
+            relief='flat',
+            bd=1,
+            wraplength=850,
+            justify='left',
+            command=lambda: on_select(index),
+            cursor="hand2"
+        )
+        self.button.pack(fill='x', pady=(0, 5), padx=5)
+
+        # Proyección de la opción (se calcula en segundo plano al pasar el mouse o enfocar)
+        if on_preview:
+            preview_label = ThemedLabel(
+                self,
+                text="",
+                font=styles.font(9),
+                fg=colors['highlight'],
+                bg=colors['secondary'],
+                wraplength=900,
+                justify='left'
+            )
+            preview_label.pack(fill='x', padx=25, pady=(0, 3))
+            show_preview = lambda event: on_preview(index, preview_label)
+            self.button.bind('<Enter>', show_preview)
+            self.button.bind('<FocusIn>', show_preview)
+
+        # Tipo de estrategia (si está disponible)
+        if option.get('strategy_type'):
+            strategy_label = ThemedLabel(
+                self,
+                text=f"📋 {option['strategy_type']}",
+                font=styles.font(9, 'italic'),
+                fg=colors['accent'],
+                bg=colors['secondary'],
+                justify='left'
+            )
+            strategy_label.pack(fill='x', padx=25, pady=(0, 3))
+
+        # Enlace para desplegar la descripción (el texto en sí se crea al desplegarla)
+        self.toggle_label = None
+        if self._description:
+            self.toggle_label = ThemedLabel(
+                self,
+                text=self.EXPAND_TEXT,
+                font=styles.font(9),
+                fg=colors['highlight'],
+                bg=colors['secondary'],
+                cursor="hand2"
+            )
+            self.toggle_label.pack(anchor='w', padx=25)
+            self.toggle_label.bind('<Button-1>', lambda event: self.toggle())
+            if expanded:
+                self.expand()
+
+    @property
+    def description_built(self) -> bool:
+        return self._description_label is not None
+
+    def expand(self) -> None:
+        """Muestra la descripción, creándola la primera vez"""
+        if self.toggle_label is None or self.expanded:
+            return
+        if self._description_label is None:
+            # Descripción con texto claro - ocupa todo el ancho
+            self._description_label = ThemedLabel(
+                self,
+                text=str(self._description),
+                font=self.styles.font(10),
+                fg=self.colors['text_secondary'],
+                bg=self.colors['secondary'],
+                wraplength=900,
+                justify='left'
+            )
+        self._description_label.pack(fill='x', padx=25, before=self.toggle_label)
+        self.toggle_label.config(text=self.COLLAPSE_TEXT)
+        self.expanded = True
+
+    def collapse(self) -> None:
+        """Oculta la descripción sin destruirla"""
+        if not self.expanded:
+            return
+        self._description_label.pack_forget()
+        self.toggle_label.config(text=self.EXPAND_TEXT)
+        self.expanded = False
+
+    def toggle(self) -> None:
+        if self.expanded:
+            self.collapse()
+        else:
+            self.expand()
+
+def _sample_options(scenario_path: str) -> List[List[Dict]]:
+    # Import local: el benchmark carga un escenario real, la tarjeta solo recibe dicts
+    from data.data_manager import DataManager
+    return [
+        [{'title': decision.text, 'description': decision.description,
+          'strategy_type': decision.strategy_type} for decision in phase.decisions]
+        for phase in DataManager(scenario_path).get_phases()
+    ]
+
+def main(argv: List[str]) -> int:
+    """Mide la primera pintura de cada fase con descripciones inmediatas y plegadas"""
+    parser = argparse.ArgumentParser(description="Benchmark de la primera pintura de las opciones de una fase")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--rounds', type=int, default=20, help="veces que se dibuja cada fase")
+    args = parser.parse_args(argv)
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"❌ No hay pantalla disponible para medir: {e}")
+        return 1
+    root.geometry("1000x700")
+    styles = StyleRegistry(root)
+    colors = styles.colors
+    phases = _sample_options(args.scenario)
+
+    def first_paint(options: List[Dict], expanded: bool) -> float:
+        started = time.perf_counter()
+        frame = ThemedFrame(root, bg=colors['secondary'])
+        frame.pack(fill='both', expand=True)
+        for i, option in enumerate(options):
+            OptionCard(frame, i, option, styles, on_select=lambda idx: None,
+                       expanded=expanded).pack(fill='x', pady=10)
+        root.update()
+        elapsed = time.perf_counter() - started
+        frame.destroy()
+        root.update()
+        return elapsed
+
+    first_paint(phases[0], True)   # Calienta fuentes y estilos antes de medir
+    for label, expanded in (("inmediatas", True), ("plegadas (sin construir)", False)):
+        times = sorted(first_paint(options, expanded) for options in phases for _ in range(args.rounds))
+        print(f"⏱️ Descripciones {label}: mediana {times[len(times) // 2] * 1000:.1f} ms, "
+              f"máximo {times[-1] * 1000:.1f} ms por fase")
+    root.destroy()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
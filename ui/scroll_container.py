@@ -0,0 +1,187 @@
+"""Área con scroll vertical virtualizada, compartida por todas las pantallas con scroll.
+
+Los elementos se registran como fábricas (parent -> widget) y se colocan como
+ventanas de un Canvas en posiciones calculadas. Solo se crean los que quedan cerca
+de la zona visible (OVERSCAN píxeles arriba y abajo); los que se alejan se ocultan
+sin destruirse, así Tk no los dibuja pero conservan su estado. Las alturas se
+estiman hasta crear cada elemento y se corrigen con su tamaño real, también cuando
+un elemento cambia de alto (p. ej. una descripción que se despliega).
+
+La rueda del mouse se atiende con un único binding global compartido por los
+contenedores visibles: se instala al mostrarse el primero y se retira cuando ya no
+queda ninguno, en lugar de que cada pantalla agregue su propio bind_all.
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, List, Optional, Tuple, Union
+from ui.style_registry import ThemedCanvas, ThemedFrame
+
+_WHEEL_EVENTS = ('<MouseWheel>', '<Button-4>', '<Button-5>')
+_visible_containers = {}   # Ruta Tk del contenedor -> contenedor mostrado en pantalla
+
+def _on_wheel(event):
+    """Desplaza el contenedor que está bajo el puntero"""
+    if isinstance(event.widget, str):
+        return None   # Widgets internos de Tk (p. ej. menús desplegables)
+    target = event.widget.winfo_containing(event.x_root, event.y_root)
+    while target is not None:
+        container = _visible_containers.get(str(target))
+        if container is not None:
+            container.scroll_wheel(event)
+            return 'break'
+        target = target.master
+    return None
+
+def _activate(container: 'ScrollContainer') -> None:
+    if not _visible_containers:
+        for sequence in _WHEEL_EVENTS:
+            container.bind_all(sequence, _on_wheel)
+    _visible_containers[str(container)] = container
+
+def _deactivate(container: 'ScrollContainer') -> None:
+    if _visible_containers.pop(str(container), None) is not None and not _visible_containers:
+        for sequence in _WHEEL_EVENTS:
+            container.unbind_all(sequence)
+
+class _Item:
+    """Elemento registrado: fábrica, widget (si ya se creó) y posición"""
+    __slots__ = ('factory', 'padx', 'pady', 'height', 'y', 'widget', 'window')
+
+    def __init__(self, factory: Callable, padx: int, pady: Tuple[int, int], height: int):
+        self.factory = factory
+        self.padx = padx
+        self.pady = pady
+        self.height = height        # Estimada hasta crear el widget; luego la real
+        self.y = 0
+        self.widget = None
+        self.window = None          # Id de la ventana en el Canvas
+
+class ScrollContainer(ThemedFrame):
+    """Lista vertical con scroll que solo crea y dibuja los elementos cercanos a la vista"""
+
+    OVERSCAN = 300          # Píxeles fuera de la vista que se mantienen creados y visibles
+    ESTIMATED_HEIGHT = 100  # Alto supuesto de un elemento que aún no se creó
+    SCROLL_INCREMENT = 20   # Píxeles por unidad de scroll
+    WHEEL_UNITS = 3         # Unidades por paso de la rueda
+    MAX_PASSES = 8          # Rondas de creación y medición por refresco
+
+    def __init__(self, parent, bg: str, on_visible: Callable = None, overscan: int = None):
+        super().__init__(parent, bg=bg)
+        self.on_visible = on_visible    # widget -> None, para cada elemento que entra en la vista
+        self.overscan = self.OVERSCAN if overscan is None else overscan
+        self._items: List[_Item] = []
+        self._pending = None
+        self._region = None
+        self._view = None
+
+        self.canvas = ThemedCanvas(self, bg=bg, highlightthickness=0, yscrollincrement=self.SCROLL_INCREMENT)
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_view_change)
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind('<Configure>', lambda event: self._schedule_refresh())
+        self.bind('<Map>', lambda event: _activate(self))
+        self.bind('<Unmap>', lambda event: _deactivate(self))
+        self.bind('<Destroy>', lambda event: _deactivate(self) if event.widget is self else None)
+
+    def add(self, factory: Callable, padx: int = 0, pady: Union[int, Tuple[int, int]] = 0,
+            height: int = None) -> int:
+        """Registra un elemento; `factory(parent)` crea su widget cuando se acerca a la vista"""
+        if isinstance(pady, int):
+            pady = (pady, pady)
+        self._items.append(_Item(factory, padx, pady, height or self.ESTIMATED_HEIGHT))
+        self._schedule_refresh()
+        return len(self._items) - 1
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def widget(self, index: int) -> Optional[tk.Widget]:
+        """Widget del elemento, o None si todavía no se creó"""
+        return self._items[index].widget
+
+    @property
+    def created_count(self) -> int:
+        return sum(1 for item in self._items if item.widget is not None)
+
+    def scroll_wheel(self, event) -> None:
+        if event.num == 4:
+            steps = -1
+        elif event.num == 5:
+            steps = 1
+        else:
+            steps = -int(event.delta / 120) or (-1 if event.delta > 0 else 1)
+        self.canvas.yview_scroll(steps * self.WHEEL_UNITS, "units")
+
+    def _schedule_refresh(self) -> None:
+        if self._pending is None:
+            self._pending = self.after_idle(self.refresh)
+
+    def _on_view_change(self, first, last) -> None:
+        self.scrollbar.set(first, last)
+        if (first, last) != self._view:
+            self._view = (first, last)
+            self._schedule_refresh()
+
+    def _on_item_configure(self, item: _Item, event) -> None:
+        if event.height != item.height:
+            item.height = event.height
+            self._schedule_refresh()
+
+    def _layout(self) -> None:
+        """Recalcula las posiciones a partir de las alturas conocidas o estimadas"""
+        width = max(self.canvas.winfo_width(), 1)
+        y = 0
+        for item in self._items:
+            y += item.pady[0]
+            item.y = y
+            if item.window is not None:
+                self.canvas.coords(item.window, item.padx, y)
+                self.canvas.itemconfigure(item.window, width=max(width - 2 * item.padx, 1))
+            y += item.height + item.pady[1]
+        if (width, y) != self._region:
+            self._region = (width, y)
+            self.canvas.configure(scrollregion=(0, 0, width, y))
+
+    def _create(self, item: _Item) -> None:
+        item.widget = item.factory(self.canvas)
+        item.window = self.canvas.create_window(item.padx, item.y, window=item.widget, anchor='nw')
+        item.widget.bind('<Configure>', lambda event, item=item: self._on_item_configure(item, event), add='+')
+
+    def refresh(self) -> None:
+        """Crea los elementos cercanos a la vista, oculta los lejanos y corrige posiciones"""
+        self._pending = None
+        if not self.winfo_exists():
+            return
+        self._layout()
+        for _ in range(self.MAX_PASSES):
+            top = self.canvas.canvasy(0)
+            bottom = top + self.canvas.winfo_height()
+            created = []
+            for item in self._items:
+                near = item.y < bottom + self.overscan and item.y + item.height > top - self.overscan
+                if near and item.widget is None:
+                    self._create(item)
+                    created.append(item)
+                elif item.window is not None:
+                    self.canvas.itemconfigure(item.window, state='normal' if near else 'hidden')
+            if not created:
+                break
+            # Medir los nuevos con su tamaño real antes de decidir si entran más
+            self.update_idletasks()
+            for item in created:
+                item.height = item.widget.winfo_reqheight()
+            self._layout()
+
+        if self.on_visible:
+            self.after_idle(self._notify_visible)
+
+    def _notify_visible(self) -> None:
+        if not self.winfo_exists():
+            return
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        for item in self._items:
+            if item.widget is not None and item.y < bottom and item.y + item.height > top:
+                self.on_visible(item.widget)
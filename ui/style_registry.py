@@ -0,0 +1,214 @@
+"""Registro compartido de fuentes, colores y estilos ttk, creado una vez al iniciar la interfaz.
+
+Las fuentes son objetos tkinter.font.Font con nombre: Tk las resuelve una sola vez y
+los widgets solo guardan la referencia, en lugar de volver a interpretar una tupla
+('Segoe UI', 14, 'bold') en cada widget creado. Los anchos de texto medidos para
+estimar alturas con ajuste de línea quedan en caché.
+
+Los colores de la paleta son RoleColor (el valor hexadecimal más el rol que ocupa),
+y los widgets Themed* anotan al crearse o reconfigurarse qué rol usa cada opción
+de color. apply_theme cambia la paleta en su lugar, reconfigura los estilos ttk y
+recorre los widgets existentes asignando a cada opción anotada el color de su rol
+en el tema nuevo, sin reconstruir las pantallas (dos roles con el mismo color en
+un tema no se confunden).
+"""
+import tkinter as tk
+from tkinter import font as tkfont
+from tkinter import ttk
+from typing import Dict, Sequence
+from config.settings import UIConfig
+
+# Opciones de color de los widgets tk que se reasignan al cambiar de tema
+COLOR_OPTIONS = ('background', 'foreground', 'activebackground', 'activeforeground',
+                 'highlightbackground', 'disabledforeground')
+_OPTION_ALIASES = {'bg': 'background', 'fg': 'foreground'}
+
+# Nivel del indicador (ScoreCalculator.get_indicator_level) -> estilo de barra de progreso
+PROGRESS_STYLES = {
+    'danger': "Danger.Horizontal.TProgressbar",
+    'warning': "Warning.Horizontal.TProgressbar",
+    'success': "Success.Horizontal.TProgressbar"
+}
+
+class RoleColor(str):
+    """Color de la paleta que recuerda su rol ('primary', 'danger'...)"""
+    __slots__ = ('role',)
+
+    def __new__(cls, value: str, role: str):
+        color = super().__new__(cls, value)
+        color.role = role
+        return color
+
+def _palette(theme: str) -> Dict[str, RoleColor]:
+    return {role: RoleColor(color, role) for role, color in UIConfig.THEMES[theme].items()}
+
+def record_color_roles(widget: tk.Misc, options: Dict) -> None:
+    """Anota el rol de cada opción de color; un color fuera de la paleta borra el rol anterior"""
+    roles = widget.__dict__.setdefault('_color_roles', {})
+    for option, value in options.items():
+        option = _OPTION_ALIASES.get(option, option)
+        if option not in COLOR_OPTIONS:
+            continue
+        if isinstance(value, RoleColor):
+            roles[option] = value.role
+        else:
+            roles.pop(option, None)
+
+class _Themed:
+    """Mezcla para widgets tk que anotan el rol de sus colores al crearse y al reconfigurarse"""
+
+    def __init__(self, master=None, cnf=None, **kw):
+        super().__init__(master, cnf or {}, **kw)
+        record_color_roles(self, dict(cnf or {}, **kw))
+
+    def configure(self, cnf=None, **kw):
+        if isinstance(cnf, dict) or kw:
+            record_color_roles(self, dict(cnf or {}, **kw))
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+class ThemedFrame(_Themed, tk.Frame):
+    pass
+
+class ThemedLabel(_Themed, tk.Label):
+    pass
+
+class ThemedButton(_Themed, tk.Button):
+    pass
+
+class ThemedCanvas(_Themed, tk.Canvas):
+    pass
+
+class StyleRegistry:
+    """Fuentes con nombre, paleta del tema y estilos ttk de una ventana"""
+
+    # Fuentes por rol (tamaño y estilos) usadas por las pantallas principales
+    ROLE_FONTS = {
+        'title': (24, 'bold'),
+        'subtitle': (16, 'bold'),
+        'body': (14,),
+        'small': (12,),
+        'mono': (12,)
+    }
+    MEASURE_CACHE_SIZE = 20_000
+
+    def __init__(self, root: tk.Misc, theme: str = None):
+        self.root = root
+        self.theme = theme or UIConfig.DEFAULT_THEME
+        self.colors = _palette(self.theme)   # RoleColor por rol; se actualiza en su lugar con apply_theme
+        self._fonts = {}            # (familia, tamaño, estilos) -> Font
+        self._measures = {}         # (fuente, texto) -> ancho en píxeles
+        self._linespace = {}        # fuente -> alto de línea
+        self.style = ttk.Style(root)
+        self.fonts = {role: self.font(*spec) for role, spec in self.ROLE_FONTS.items()}
+        self._configure_ttk()
+
+    def font(self, size: int, *styles: str, family: str = None) -> tkfont.Font:
+        """Fuente con nombre (creada la primera vez que se pide): styles admite 'bold' e 'italic'"""
+        family = family or UIConfig.FONT_FAMILY
+        key = (family, size, tuple(sorted(styles)))
+        font = self._fonts.get(key)
+        if font is None:
+            name = f"amaru-{family}-{size}-{'-'.join(key[2]) or 'normal'}".replace(' ', '_')
+            options = dict(family=family, size=size,
+                           weight='bold' if 'bold' in styles else 'normal',
+                           slant='italic' if 'italic' in styles else 'roman')
+            try:
+                font = tkfont.Font(self.root, name=name, **options)
+            except tk.TclError:
+                # Ya existe en el intérprete (otro registro sobre la misma ventana)
+                font = tkfont.Font(self.root, name=name, exists=True)
+                font.configure(**options)
+            self._fonts[key] = font
+        return font
+
+    def font_from_spec(self, spec: Sequence) -> tkfont.Font:
+        """Fuente con nombre equivalente a una tupla (familia, tamaño, estilos...)"""
+        family, size, *styles = spec
+        return self.font(size, *styles, family=family)
+
+    def measure(self, font: tkfont.Font, text: str) -> int:
+        """Ancho en píxeles de un texto de una línea (en caché)"""
+        key = (font.name, text)
+        width = self._measures.get(key)
+        if width is None:
+            if len(self._measures) >= self.MEASURE_CACHE_SIZE:
+                self._measures.clear()
+            width = self._measures[key] = font.measure(text)
+        return width
+
+    def text_height(self, text, font: tkfont.Font, wraplength: int) -> int:
+        """Alto aproximado de un texto con ajuste de línea en `wraplength` píxeles"""
+        linespace = self._linespace.get(font.name)
+        if linespace is None:
+            linespace = self._linespace[font.name] = font.metrics('linespace')
+        space = self.measure(font, ' ')
+        lines = 0
+        for paragraph in str(text).split('\n'):
+            lines += 1
+            used = 0
+            for word in paragraph.split():
+                width = self.measure(font, word)
+                if used and wraplength and used + space + width > wraplength:
+                    lines += 1
+                    used = width
+                else:
+                    used += (space if used else 0) + width
+        return lines * linespace
+
+    def _configure_ttk(self) -> None:
+        """Estilos de las barras de progreso según el nivel del indicador"""
+        for level, style_name in PROGRESS_STYLES.items():
+            self.style.configure(style_name,
+                                 background=self.colors[level],
+                                 troughcolor=self.colors['secondary'],
+                                 borderwidth=0,
+                                 lightcolor=self.colors[level],
+                                 darkcolor=self.colors[level])
+
+    def set_color_roles(self, widget: tk.Misc, **roles: str) -> None:
+        """Colorea un widget que no es Themed* (p. ej. la ventana raíz) y anota sus roles"""
+        colors = {option: self.colors[role] for option, role in roles.items()}
+        widget.configure(colors)
+        record_color_roles(widget, colors)
+
+    def apply_theme(self, theme: str) -> int:
+        """Cambia de tema y reestiliza los widgets existentes; retorna cuántas opciones cambió"""
+        self.theme = theme
+        self.colors.update(_palette(theme))
+        self._configure_ttk()
+
+        changed = 0
+        stack = [self.root]
+        while stack:
+            widget = stack.pop()
+            stack.extend(widget.winfo_children())
+            roles = widget.__dict__.get('_color_roles')
+            if not roles:
+                continue   # Widgets ttk o sin colores de la paleta
+            for option, role in roles.items():
+                color = self.colors[role]
+                if str(widget.cget(option)).lower() != color.lower():
+                    tk.Misc.configure(widget, {option: str(color)})
+                    changed += 1
+        return changed
+
+def _alive(widget: tk.Misc) -> bool:
+    try:
+        return bool(widget.winfo_exists())
+    except tk.TclError:
+        return False   # La aplicación Tk ya se destruyó
+
+_shared_registry = None
+
+def get_style_registry(root: tk.Misc = None, theme: str = None) -> StyleRegistry:
+    """Registro compartido por toda la interfaz (se crea con la primera ventana que lo pide)"""
+    global _shared_registry
+    if _shared_registry is None or (root is not None and not _alive(_shared_registry.root)):
+        if root is None:
+            raise RuntimeError("El registro de estilos se crea con la ventana principal")
+        _shared_registry = StyleRegistry(root, theme)
+    elif theme and theme != _shared_registry.theme:
+        _shared_registry.apply_theme(theme)
+    return _shared_registry
@@ -0,0 +1,386 @@
+"""Interfaz de terminal: la misma secuencia de pantallas que BusinessSimulator, sin tkinter.
+
+Pensada para equipos sin pantalla o conectados por SSH: no importa tkinter ni
+configura ventanas, así que arranca en unas decenas de milisegundos. Lee un
+comando por línea, por lo que también se puede guionar (tubería o --script) y
+jugar partidas automáticas con una política (--policy) para pruebas rápidas.
+
+Comandos en una fase: la letra de la opción (A, B, ...), ?A para ver su descripción
+y M para volver al menú (la partida queda guardada).
+
+Uso:
+    python -m ui.terminal_ui [--scenario data/phases.json] [--cohort 2025-A]
+    python -m ui.terminal_ui --script "1,A,C,B,A,D,0"
+    python -m ui.terminal_ui --policy greedy --games 1000 --quiet
+"""
+import time
+
+_STARTED = time.perf_counter()   # Para medir el arranque, antes de importar el motor
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import textwrap
+from typing import Callable, Dict, Iterator, List, Optional
+from config.settings import GameState
+from logic.game_engine import DecisionLog, GameEngine
+from logic.simulation import step
+from ui.game_texts import (GAME_RULES, RULES_DESCRIPTION, RULES_TITLE, RULES_WELCOME,
+                           STORY_PARAGRAPHS, STORY_TITLE)
+
+LEVEL_LABELS = {'danger': "CRÍTICO", 'warning': "ALERTA", 'success': "ESTABLE"}
+LEVEL_COLORS = {'danger': '31', 'warning': '33', 'success': '32'}   # Códigos ANSI
+BAR_WIDTH = 20
+MAX_WIDTH = 100
+
+def _policy_first(engine: GameEngine, rng: random.Random) -> int:
+    return 0
+
+def _policy_random(engine: GameEngine, rng: random.Random) -> int:
+    return rng.randrange(len(engine.get_current_phase().decisions))
+
+def _policy_greedy(engine: GameEngine, rng: random.Random) -> int:
+    """Opción con mejor puntaje inmediato que no termina el juego (logic.simulation.step)"""
+    scenario = engine.get_compiled_scenario()
+    best_index, best_score = 0, None
+    for index in range(len(engine.get_current_phase().decisions)):
+        state, outcome = step(scenario, engine.state, index)
+        score = scenario.score(state.indicators) if outcome.status != GameState.GAME_OVER else -1.0
+        if best_score is None or score > best_score:
+            best_index, best_score = index, score
+    return best_index
+
+# Políticas de juego automático: (motor, rng) -> posición de la opción entre las disponibles
+PLAYER_POLICIES: Dict[str, Callable[[GameEngine, random.Random], int]] = {
+    'first': _policy_first,
+    'random': _policy_random,
+    'greedy': _policy_greedy
+}
+
+class TerminalUI:
+    """Pantallas de inicio, reglas, fases, efectos y resultados en modo texto"""
+
+    def __init__(self, engine: GameEngine, lines: Iterator[str] = None, out=None, color: bool = None,
+                 save: bool = False, cohort: str = '', verbose: bool = False):
+        self.engine = engine
+        self.out = out or sys.stdout
+        self.color = (self.out.isatty() and 'NO_COLOR' not in os.environ) if color is None else color
+        self.width = min(shutil.get_terminal_size((MAX_WIDTH, 24)).columns, MAX_WIDTH)
+        self.cohort = cohort
+        self._lines = lines               # Comandos guionados; None = teclado
+        if verbose:
+            engine.add_listener(DecisionLog(engine, out=self.out))
+        # Autoguardado y resultados igual que la interfaz gráfica (se importan al usarlos)
+        self.autosave = None
+        self._results_store = None
+        self._save = save
+        if save:
+            from data.autosave_manager import AutosaveManager
+            self.autosave = AutosaveManager()
+
+    # --- Entrada y salida ---
+
+    def write(self, text: str = '') -> None:
+        self.out.write(text + '\n')
+
+    def paint(self, text: str, code: str) -> str:
+        return f"\033[{code}m{text}\033[0m" if self.color else text
+
+    def wrap(self, text, indent: str = '', hanging: str = None) -> str:
+        return textwrap.fill(str(text), self.width, initial_indent=indent,
+                             subsequent_indent=indent if hanging is None else hanging)
+
+    def ask(self, prompt: str) -> Optional[str]:
+        """Lee un comando (None si la entrada terminó)"""
+        self.out.write(prompt)
+        self.out.flush()
+        if self._lines is None:
+            try:
+                return input().strip()
+            except EOFError:
+                self.write()
+                return None
+        line = next(self._lines, None)
+        if line is None:
+            self.write()
+            return None
+        self.write(line)   # Eco del comando guionado
+        return line.strip()
+
+    def close(self) -> None:
+        if self.autosave:
+            self.autosave.close()
+        if self._results_store:
+            self._results_store.close()
+        self.engine.data_manager.close()
+
+    # --- Pantallas ---
+
+    def run(self) -> int:
+        """Pantalla de inicio hasta que el jugador sale"""
+        while self.show_start_screen():
+            pass
+        self.write("👋 Cerrando simulador...")
+        return 0
+
+    def show_start_screen(self) -> bool:
+        """Menú principal; retorna False para salir"""
+        intro = self.engine.data_manager.get_game_intro()
+        snapshot = self.autosave.load() if self.autosave else None
+        can_resume = snapshot is not None and snapshot.get('game_state') == GameState.PLAYING.value
+
+        self.write()
+        self.write(self.paint(f"🎮 {intro.get('title') or 'Simulador de Decisiones Estratégicas'}", '1'))
+        if intro.get('subtitle'):
+            self.write(f"   {intro['subtitle']}")
+        self.write()
+        if can_resume:
+            self.write("  [C] 💾 Continuar partida")
+        self.write("  [J] 🚀 Jugar")
+        self.write("  [R] 📖 Reglas")
+        self.write("  [S] ❌ Salir")
+        while True:
+            command = self.ask("> ")
+            if command is None:
+                return False
+            command = command.upper()
+            if command in ('J', '1'):
+                self.start_game()
+                return True
+            if command in ('R', '2'):
+                self.show_rules_screen()
+                return True
+            if command in ('C', '3') and can_resume:
+                self.resume_game(snapshot)
+                return True
+            if command in ('S', '0', 'Q'):
+                return False
+            self.write("⚠️ Opción no válida")
+
+    def show_rules_screen(self) -> None:
+        self.write()
+        self.write(self.paint(f"📖 {RULES_WELCOME}", '1'))
+        self.write()
+        self.write(self.wrap(RULES_DESCRIPTION))
+        self.write()
+        self.write(self.paint(RULES_TITLE, '32'))
+        for i, rule in enumerate(GAME_RULES, 1):
+            self.write(self.wrap(f"{i}. {rule}", '  ', '     '))
+        self.write()
+        self.write(self.paint(STORY_TITLE, '33'))
+        for paragraph in STORY_PARAGRAPHS:
+            self.write(self.wrap(paragraph, '  '))
+            self.write()
+        self.ask("Enter para volver... ")
+
+    def start_game(self) -> None:
+        self.engine.reset_game()
+        if self.autosave:
+            self.autosave.clear()
+        self.play()
+
+    def resume_game(self, snapshot: Dict) -> None:
+        try:
+            self.engine.restore_snapshot(snapshot)
+        except (KeyError, ValueError) as e:
+            self.write(f"⚠️ No se pudo reanudar la partida ({e}); comienza una nueva")
+            self.start_game()
+            return
+        self.play()
+
+    def play(self) -> None:
+        """Muestra fases y procesa comandos hasta que la partida termina o se vuelve al menú"""
+        while self.engine.game_state == GameState.PLAYING:
+            phase = self.engine.get_current_phase()
+            self.show_indicators()
+            self.show_phase(phase)
+            while True:
+                command = self.ask("Tu decisión (letra, ?letra, M = menú): ")
+                if command is None or command.upper() == 'M':
+                    return
+                index = self._option_index(command.lstrip('?'), len(phase.decisions))
+                if index is None:
+                    self.write("⚠️ Opción no válida")
+                elif command.startswith('?'):
+                    decision = phase.decisions[index]
+                    self.write(self.wrap(decision.description or "Sin descripción", '     '))
+                else:
+                    break
+            if not self.handle_decision(index):
+                return
+
+    @staticmethod
+    def _option_index(command: str, count: int) -> Optional[int]:
+        command = command.strip().upper()
+        if len(command) == 1 and 'A' <= command < chr(ord('A') + count):
+            return ord(command) - ord('A')
+        if command.isdigit() and 1 <= int(command) <= count:
+            return int(command) - 1
+        return None
+
+    def show_indicators(self) -> None:
+        info = self.engine.get_game_info()
+        self.write()
+        self.write(self.paint(f"📊 Indicadores · Fase {info['current_phase'] + 1}/{info['max_phases']}", '1'))
+        name_width = max(len(name) for name in info['indicators'])
+        for name, value in info['indicators'].items():
+            self.write("  " + self._indicator_line(name, value, name_width))
+
+    def _indicator_line(self, name: str, value: float, name_width: int) -> str:
+        level = self.engine.score_calculator.get_indicator_level(name, value)
+        filled = max(0, min(BAR_WIDTH, round(value / 100 * BAR_WIDTH)))
+        bar = "█" * filled + "░" * (BAR_WIDTH - filled)
+        return (f"{name:<{name_width}} {self.paint(bar, LEVEL_COLORS[level])} "
+                f"{value:5.1f}% {self.paint(LEVEL_LABELS[level], LEVEL_COLORS[level])}")
+
+    def show_phase(self, phase) -> None:
+        self.write()
+        self.write(self.paint(phase.title, '1'))
+        self.write(self.wrap(phase.question))
+        self.write()
+        for i, decision in enumerate(phase.decisions):
+            self.write(self.wrap(f"{chr(65 + i)}) {decision.text}", '  ', '     '))
+            if decision.strategy_type:
+                self.write(f"     📋 {decision.strategy_type}")
+
+    def handle_decision(self, index: int) -> bool:
+        """Aplica una decisión como BusinessSimulator.handle_decision; retorna True si la partida sigue"""
+        result = self.engine.make_decision(index)
+        if not result.success:
+            self.write(f"⚠️ Decisión fallida: {result.message or 'Error desconocido'}")
+            return True
+
+        if result.game_over or result.game_completed:
+            if self.autosave:
+                self.autosave.clear()
+            self._record_results()
+        elif self.autosave:
+            self.autosave.save(self.engine.get_snapshot())
+
+        effects = result.format_effects()
+        if result.decision_text and effects:
+            self.write()
+            self.write(self.paint(f"✅ Decisión tomada: {result.decision_text}", '1'))
+            for line in effects:
+                self.write(f"   {line}")
+
+        if result.game_over:
+            self.show_game_over(result.failed_indicators)
+            return False
+        if result.game_completed:
+            self.show_final_results()
+            return False
+        if result.critical:
+            self.show_critical_warning(result.critical_indicators)
+        return True
+
+    def show_critical_warning(self, critical_indicators: List[str]) -> None:
+        self.write(self.paint("⚠️ Alerta: Indicadores en zona de riesgo", LEVEL_COLORS['warning']))
+        for name in critical_indicators:
+            spec = self.engine.score_calculator.get_spec(name)
+            self.write(f"   • {name} (menos del {spec.critical:g}%)")
+
+    def show_game_over(self, failed_indicators: List[str]) -> None:
+        self.write()
+        self.write(self.paint("💀 Fin del juego", LEVEL_COLORS['danger']))
+        self.write(f"   Llegaste hasta la Fase {self.engine.current_phase + 1}/{self.engine.max_phases}")
+        for name in failed_indicators:
+            spec = self.engine.score_calculator.get_spec(name)
+            self.write(f"   • {name} (menos del {spec.failure:g}%)")
+        self.show_final_results()
+
+    def show_final_results(self) -> None:
+        results = self.engine.get_final_results()
+        self.write()
+        self.write(self.paint(f"🏁 Puntuación final: {results['avg_score']:.1f} · {results['category']}", '1'))
+        self.write(self.wrap(results['message'], '   '))
+        name_width = max(len(name) for name in results['indicators'])
+        for name, value in results['indicators'].items():
+            self.write("  " + self._indicator_line(name, value, name_width))
+
+    def _record_results(self) -> None:
+        """Registra la partida terminada en el almacén de resultados (si se guarda el progreso)"""
+        if not self._save:
+            return
+        try:
+            if self._results_store is None:
+                # Import local: sqlite3 solo se carga al terminar la primera partida
+                from data.results_store import ResultsStore
+                self._results_store = ResultsStore()
+            self._results_store.record(
+                self.engine.get_final_results(),
+                cohort=self.cohort,
+                scenario=os.path.basename(self.engine.data_manager.data_path),
+                session_id=self.engine.session_id
+            )
+        except Exception as e:
+            self.write(f"⚠️ Error registrando resultados: {e}")
+
+    def autoplay(self, policy: Callable[[GameEngine, random.Random], int], rng: random.Random) -> Dict:
+        """Juega una partida completa eligiendo con una política; retorna get_final_results"""
+        self.engine.reset_game()
+        while self.engine.game_state == GameState.PLAYING:
+            self.show_indicators()
+            self.show_phase(self.engine.get_current_phase())
+            index = policy(self.engine, rng)
+            self.write(f"> {chr(65 + index)}")
+            self.handle_decision(index)
+        return self.engine.get_final_results()
+
+def main(argv: List[str]) -> int:
+    """Juega en la terminal, con comandos guionados o con partidas automáticas"""
+    parser = argparse.ArgumentParser(description="Simulador Estratégico Empresarial en la terminal")
+    parser.add_argument('--scenario', default=None, help="phases.json o archivo .scn")
+    parser.add_argument('--cohort', default='', help="cohorte con la que se registran los resultados")
+    parser.add_argument('--script', default=None,
+                        help="comandos separados por comas en lugar del teclado (p. ej. \"J,A,C,B,A,D,S\")")
+    parser.add_argument('--policy', choices=sorted(PLAYER_POLICIES), default=None,
+                        help="juega partidas automáticas con esta política")
+    parser.add_argument('--games', type=int, default=1, help="partidas automáticas (con --policy)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quiet', action='store_true', help="solo el resumen de las partidas automáticas")
+    parser.add_argument('--save', action=argparse.BooleanOptionalAction, default=None,
+                        help="autoguardado y registro de resultados (por defecto solo al jugar con teclado)")
+    parser.add_argument('--verbose', action='store_true', help="muestra el log de cada decisión")
+    args = parser.parse_args(argv)
+
+    automated = args.script is not None or args.policy is not None
+    save = (not automated and sys.stdin.isatty()) if args.save is None else args.save
+    lines = iter(args.script.split(',')) if args.script is not None else None
+    out = open(os.devnull, 'w', encoding='utf-8') if args.quiet else None
+
+    engine = GameEngine(args.scenario)
+    ui = TerminalUI(engine, lines=lines, out=out, save=save, cohort=args.cohort, verbose=args.verbose)
+    startup_ms = (time.perf_counter() - _STARTED) * 1000
+
+    try:
+        if args.policy is None:
+            if args.script is not None:
+                print(f"⚡ Inicio en {startup_ms:.0f} ms (sin contar el intérprete)")
+            return ui.run()
+
+        rng = random.Random(args.seed)
+        policy = PLAYER_POLICIES[args.policy]
+        started = time.perf_counter()
+        scores, game_overs = [], 0
+        for _ in range(args.games):
+            results = ui.autoplay(policy, rng)
+            scores.append(results['avg_score'])
+            game_overs += results['game_over']
+        elapsed = time.perf_counter() - started
+        print(f"⚡ Inicio en {startup_ms:.0f} ms (sin contar el intérprete)")
+        print(f"🎲 {args.games:,} partidas '{args.policy}' en {elapsed:.2f} s "
+              f"({args.games / elapsed if elapsed else 0:,.0f} partidas/s)")
+        if scores:
+            print(f"🏆 Puntaje promedio: {sum(scores) / len(scores):.1f}  "
+                  f"💀 Game over: {game_overs:,} ({game_overs / len(scores):.1%})")
+        return 0
+    finally:
+        ui.close()
+        if out:
+            out.close()
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
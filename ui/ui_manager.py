@@ -2,88 +2,66 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import Dict, List, Callable
 from config.settings import UIConfig
+from ui.game_texts import (GAME_RULES, RULES_DESCRIPTION, RULES_TITLE, RULES_WELCOME,
+                           STORY_PARAGRAPHS, STORY_TITLE)
+from ui.option_card import OptionCard
+from ui.scroll_container import ScrollContainer
+from ui.style_registry import (PROGRESS_STYLES, ThemedButton, ThemedFrame, ThemedLabel,
+                               get_style_registry)
 from ui.widget_factory import WidgetFactory
 from logic.score_calculator import ScoreCalculator
-from data.data_manager import Phase
+from data.data_manager import IndicatorSpec, Phase
 
 class UIManager:
     """Gestiona toda la interfaz de usuario con diseño gaming minimalista"""
     
-    def __init__(self, root: tk.Tk, on_decision_callback: Callable):
+    PREVIEW_POLL_MS = 40
+    COMPACT_INDICATOR_COUNT = 6   # Con más indicadores se usan tarjetas de una sola fila
+    CARD_HEIGHT = 115             # Alto estimado de una tarjeta de indicador (se corrige al crearla)
+    COMPACT_CARD_HEIGHT = 45
+    
+    # Nivel del indicador (ScoreCalculator.get_indicator_level) -> estilo de barra y etiqueta
+    PROGRESS_STYLES = PROGRESS_STYLES
+    LEVEL_LABELS = {'danger': "CRÍTICO", 'warning': "ALERTA", 'success': "ESTABLE"}
+    
+    def __init__(self, root: tk.Tk, on_decision_callback: Callable,
+                 on_preview_callback: Callable = None, theme: str = None):
         self.root = root
         self.on_decision_callback = on_decision_callback
+        self.on_preview_callback = on_preview_callback  # idx -> Future[OptionPreview] o None
         self.indicators_frame = None
         self.content_frame = None
         self.buttons_frame = None
         self.start_game_callback = None
-        self._setup_modern_styles()
+        self.score_calculator = ScoreCalculator()
+        self._indicators_title = None
+        self._indicator_layout = None
+        self._indicator_widgets = {}   # nombre -> (etiqueta de valor, barra, etiqueta de estado), si ya se creó
+        self._indicator_values = {}    # nombre -> último valor mostrado (para tarjetas creadas después)
+        # Fuentes con nombre, paleta y estilos ttk compartidos (creados una sola vez)
+        self.styles = get_style_registry(root, theme)
+        self.colors = self.styles.colors
+        self.fonts = self.styles.fonts
         self._setup_main_ui()
     
-    def _setup_modern_styles(self):
-        """Configura estilos oscuros modernos"""
-        # Paleta de colores oscura moderna
-        self.colors = {
-            'primary': '#1a1b23',      # Fondo principal muy oscuro
-            'secondary': '#2d3142',    # Fondo secundario gris oscuro
-            'accent': '#44475a',       # Elementos de acento
-            'highlight': '#6272a4',    # Hover y destacados
-            'success': '#50fa7b',      # Verde brillante
-            'warning': '#ffb86c',      # Naranja brillante
-            'danger': '#ff5555',       # Rojo brillante
-            'text_primary': '#f8f8f2', # Texto principal claro
-            'text_secondary': '#6272a4', # Texto secundario
-            'card_bg': '#373844'       # Fondo de cards
-        }
-        
-        # Fuentes limpias
-        self.fonts = {
-            'title': ('Segoe UI', 24, 'bold'),
-            'subtitle': ('Segoe UI', 16, 'bold'), 
-            'body': ('Segoe UI', 14),
-            'small': ('Segoe UI', 12),
-            'mono': ('Segoe UI', 12)
-        }
-        
-        # Configurar estilos de ttk para barras de progreso oscuras
-        style = ttk.Style()
-        
-        # Estilo normal (verde)
-        style.configure("Success.Horizontal.TProgressbar", 
-                       background=self.colors['success'],
-                       troughcolor=self.colors['secondary'],
-                       borderwidth=0,
-                       lightcolor=self.colors['success'],
-                       darkcolor=self.colors['success'])
-        
-        # Estilo warning (naranja)
-        style.configure("Warning.Horizontal.TProgressbar",
-                       background=self.colors['warning'],
-                       troughcolor=self.colors['secondary'],
-                       borderwidth=0,
-                       lightcolor=self.colors['warning'],
-                       darkcolor=self.colors['warning'])
-        
-        # Estilo danger (rojo)
-        style.configure("Danger.Horizontal.TProgressbar",
-                       background=self.colors['danger'],
-                       troughcolor=self.colors['secondary'],
-                       borderwidth=0,
-                       lightcolor=self.colors['danger'],
-                       darkcolor=self.colors['danger'])
+    def set_theme(self, theme: str) -> None:
+        """Cambia el tema y reestiliza en su lugar los widgets de la pantalla actual"""
+        changed = self.styles.apply_theme(theme)
+        print(f"🎨 Tema '{theme}': {changed} colores actualizados")
     
     def _setup_main_ui(self):
         """Configura la interfaz principal con layout lateral y pantalla completa"""
         self.root.title("🎮 Simulador Estratégico Empresarial")
         self.root.state('zoomed')  # Pantalla completa en Windows
-        self.root.configure(bg=self.colors['primary'])
+        self.styles.set_color_roles(self.root, bg='primary')
         self.root.resizable(True, True)
         
         # Container principal con padding
-        main_container = tk.Frame(self.root, bg=self.colors['primary'])
+        main_container = ThemedFrame(self.root, bg=self.colors['primary'])
         main_container.pack(fill='both', expand=True, padx=20, pady=20)
         
         # Título principal centrado arriba
-        title_label = tk.Label(
+        title_label = ThemedLabel(
             main_container, 
             text="🎮 Simulador Estratégico Empresarial",
             font=self.fonts['title'],
@@ -93,138 +71,188 @@ class UIManager:
         title_label.pack(pady=(0, 20))
         
         # Container horizontal para contenido y panel lateral
-        content_container = tk.Frame(main_container, bg=self.colors['primary'])
+        content_container = ThemedFrame(main_container, bg=self.colors['primary'])
         content_container.pack(fill='both', expand=True)
         
         # Área de contenido principal (lado izquierdo)
-        self.content_frame = tk.Frame(content_container, 
+        self.content_frame = ThemedFrame(content_container, 
                                     bg=self.colors['secondary'],
                                     relief='flat',
                                     bd=0)
         self.content_frame.pack(side='left', fill='both', expand=True, padx=(0, 20))
         
         # Panel de indicadores (lado derecho)
-        self.indicators_frame = tk.Frame(content_container, 
+        self.indicators_frame = ThemedFrame(content_container, 
                                        bg=self.colors['primary'],
                                        width=350)
         self.indicators_frame.pack(side='right', fill='y', padx=(20, 0))
         self.indicators_frame.pack_propagate(False)  # Mantener ancho fijo
     
-    def update_indicators_display(self, indicators: Dict[str, float], current_phase: int, max_phases: int):
-        """Actualiza la visualización de indicadores en panel lateral derecho"""
+    def update_indicators_display(self, indicators: Dict[str, float], current_phase: int, max_phases: int,
+                                  indicator_specs: List[IndicatorSpec] = None):
+        """Actualiza la visualización de indicadores en panel lateral derecho.
+        
+        Las tarjetas se crean una vez por conjunto de indicadores, en un ScrollContainer
+        que solo crea las cercanas a la vista; las actualizaciones siguientes solo
+        cambian textos, colores y barras de las tarjetas ya creadas.
+        """
+        if indicator_specs is not None:
+            self.score_calculator.set_indicator_specs(indicator_specs)
+        
+        layout = tuple(indicators)
+        if (layout != self._indicator_layout or self._indicators_title is None
+                or not self._indicators_title.winfo_exists()):
+            self._build_indicator_cards(layout)
+        
+        self._indicators_title.config(text=f"📊 Indicadores\nFase {current_phase + 1}/{max_phases}")
+        self._indicator_values = dict(indicators)
+        for name in self._indicator_widgets:
+            self._show_indicator_value(name)
+    
+    def _show_indicator_value(self, name: str) -> None:
+        """Aplica el último valor del indicador a su tarjeta"""
+        value = self._indicator_values.get(name)
+        if value is None:
+            return
+        value_label, progress, status_label = self._indicator_widgets[name]
+        level = self.score_calculator.get_indicator_level(name, value)
+        value_label.config(text=f"{value:.1f}%", fg=self.colors[level])
+        progress.config(value=value, style=self.PROGRESS_STYLES[level])
+        if status_label is not None:
+            status_label.config(text=self.LEVEL_LABELS[level], fg=self.colors[level])
+    
+    def _build_indicator_cards(self, names):
+        """Crea las tarjetas de indicadores (compactas si el escenario declara muchos)"""
         # Limpiar frame anterior
         for widget in self.indicators_frame.winfo_children():
             widget.destroy()
+        self._indicator_widgets = {}
+        self._indicator_layout = tuple(names)
+        compact = len(names) > self.COMPACT_INDICATOR_COUNT
         
         # Título del panel de indicadores (más compacto)
-        indicators_title = tk.Label(
+        self._indicators_title = ThemedLabel(
             self.indicators_frame,
-            text=f"📊 Indicadores\nFase {current_phase + 1}/{max_phases}",
-            font=('Segoe UI', 14, 'bold'),  # Reducido de 16 a 14
+            text="📊 Indicadores",
+            font=self.styles.font(14, 'bold'),  # Reducido de 16 a 14
             fg=self.colors['text_primary'],
             bg=self.colors['primary'],
             justify='center'
         )
-        indicators_title.pack(pady=(8, 15))  # Reducido de (10, 20) a (8, 15)
-        
-        # Container para los indicadores verticales
-        indicators_container = tk.Frame(self.indicators_frame, bg=self.colors['primary'])
-        indicators_container.pack(fill='both', expand=True, padx=15, pady=(0, 15))  # Reducido padding
-        
-        # Crear indicadores verticalmente con espaciado optimizado
-        for i, (name, value) in enumerate(indicators.items()):
-            # Frame para cada indicador con fondo oscuro (más compacto)
-            indicator_card = tk.Frame(indicators_container, 
-                                    bg=self.colors['card_bg'], 
-                                    relief='flat', 
-                                    bd=1)
-            indicator_card.pack(fill='x', pady=4)  # Reducido de 8 a 4
-            
-            # Contenido del indicador (padding reducido)
-            indicator_content = tk.Frame(indicator_card, bg=self.colors['card_bg'])
-            indicator_content.pack(fill='both', expand=True, padx=12, pady=10)  # Reducido de (15, 15) a (12, 10)
-            
-            # Nombre del indicador (fuente más pequeña)
-            label = tk.Label(
-                indicator_content,
-                text=name,
-                font=('Segoe UI', 10, 'bold'),  # Reducido de 11 a 10
-                fg=self.colors['text_primary'],
-                bg=self.colors['card_bg']
-            )
-            label.pack()
-            
-            # Valor numérico (tamaño reducido)
-            color = self._get_indicator_color(value)
-            value_label = tk.Label(
-                indicator_content,
-                text=f"{value:.1f}%",
-                font=('Segoe UI', 14, 'bold'),  # Reducido de 16 a 14
-                fg=color,
-                bg=self.colors['card_bg']
+        self._indicators_title.pack(pady=(8, 15))  # Reducido de (10, 20) a (8, 15)
+        
+        # Indicadores verticales con scroll: el panel tiene ancho fijo y alto de la ventana
+        indicators_scroll = ScrollContainer(self.indicators_frame, bg=self.colors['primary'])
+        indicators_scroll.pack(fill='both', expand=True, padx=15, pady=(0, 15))  # Reducido padding
+        
+        create_card = self._create_compact_indicator_card if compact else self._create_indicator_card
+        for name in names:
+            indicators_scroll.add(
+                lambda parent, name=name: self._add_indicator_card(parent, name, create_card),
+                pady=2 if compact else 4,
+                height=self.COMPACT_CARD_HEIGHT if compact else self.CARD_HEIGHT
             )
-            value_label.pack(pady=(3, 8))  # Reducido de (5, 10) a (3, 8)
-            
-            # Determinar estilo de la barra según el valor
-            if value < 20:
-                style_name = "Danger.Horizontal.TProgressbar"
-            elif value < 50:
-                style_name = "Warning.Horizontal.TProgressbar"
-            else:
-                style_name = "Success.Horizontal.TProgressbar"
-            
-            # Barra de progreso horizontal (más pequeña)
-            progress = ttk.Progressbar(
-                indicator_content,
-                length=220,  # Reducido de 250 a 220
-                mode='determinate',
-                value=value,
-                style=style_name
-            )
-            progress.pack(pady=(0, 3))  # Reducido de (0, 5) a (0, 3)
-            
-            # Estado del indicador (fuente más pequeña)
-            if value < 20:
-                status_text = "CRÍTICO"
-                status_color = self.colors['danger']
-            elif value < 50:
-                status_text = "ALERTA"
-                status_color = self.colors['warning']
-            else:
-                status_text = "ESTABLE"
-                status_color = self.colors['success']
-            
-            status_label = tk.Label(
-                indicator_content,
-                text=status_text,
-                font=('Segoe UI', 8, 'bold'),  # Reducido de 9 a 8
-                fg=status_color,
-                bg=self.colors['card_bg']
-            )
-            status_label.pack()
     
-    def _get_indicator_color(self, value: float) -> str:
-        """Determina el color del indicador según su valor (tema oscuro)"""
-        if value < 20:
-            return self.colors['danger']    # Rojo brillante
-        elif value < 50:
-            return self.colors['warning']   # Naranja brillante
-        else:
-            return self.colors['success']   # Verde brillante
+    def _add_indicator_card(self, parent, name: str, create_card: Callable) -> ThemedFrame:
+        """Fábrica del ScrollContainer: crea la tarjeta y le aplica el último valor"""
+        indicator_card, widgets = create_card(parent, name)
+        self._indicator_widgets[name] = widgets
+        self._show_indicator_value(name)
+        return indicator_card
+    
+    def _create_indicator_card(self, parent, name: str):
+        """Tarjeta completa: nombre, valor, barra y estado"""
+        # Frame para cada indicador con fondo oscuro (más compacto)
+        indicator_card = ThemedFrame(parent, 
+                                bg=self.colors['card_bg'], 
+                                relief='flat', 
+                                bd=1)
+        
+        # Contenido del indicador (padding reducido)
+        indicator_content = ThemedFrame(indicator_card, bg=self.colors['card_bg'])
+        indicator_content.pack(fill='both', expand=True, padx=12, pady=10)  # Reducido de (15, 15) a (12, 10)
+        
+        # Nombre del indicador (fuente más pequeña)
+        label = ThemedLabel(
+            indicator_content,
+            text=name,
+            font=self.styles.font(10, 'bold'),  # Reducido de 11 a 10
+            fg=self.colors['text_primary'],
+            bg=self.colors['card_bg']
+        )
+        label.pack()
+        
+        # Valor numérico (tamaño reducido)
+        value_label = ThemedLabel(
+            indicator_content,
+            font=self.styles.font(14, 'bold'),  # Reducido de 16 a 14
+            bg=self.colors['card_bg']
+        )
+        value_label.pack(pady=(3, 8))  # Reducido de (5, 10) a (3, 8)
+        
+        # Barra de progreso horizontal (más pequeña)
+        progress = ttk.Progressbar(
+            indicator_content,
+            length=220,  # Reducido de 250 a 220
+            mode='determinate'
+        )
+        progress.pack(pady=(0, 3))  # Reducido de (0, 5) a (0, 3)
+        
+        # Estado del indicador (fuente más pequeña)
+        status_label = ThemedLabel(
+            indicator_content,
+            font=self.styles.font(8, 'bold'),  # Reducido de 9 a 8
+            bg=self.colors['card_bg']
+        )
+        status_label.pack()
+        
+        return indicator_card, (value_label, progress, status_label)
+    
+    def _create_compact_indicator_card(self, parent, name: str):
+        """Tarjeta de una fila (nombre y valor) con barra, para escenarios con muchos indicadores"""
+        indicator_card = ThemedFrame(parent, bg=self.colors['card_bg'], relief='flat', bd=1)
+        
+        header = ThemedFrame(indicator_card, bg=self.colors['card_bg'])
+        header.pack(fill='x', padx=10, pady=(4, 0))
+        
+        label = ThemedLabel(
+            header,
+            text=name,
+            font=self.styles.font(9, 'bold'),
+            fg=self.colors['text_primary'],
+            bg=self.colors['card_bg']
+        )
+        label.pack(side='left')
+        
+        value_label = ThemedLabel(
+            header,
+            font=self.styles.font(9, 'bold'),
+            bg=self.colors['card_bg']
+        )
+        value_label.pack(side='right')
+        
+        progress = ttk.Progressbar(indicator_card, length=260, mode='determinate')   # Deja lugar a la barra de scroll
+        progress.pack(padx=10, pady=(2, 5))
+        
+        return indicator_card, (value_label, progress, None)
+    
+    def _get_indicator_color(self, name: str, value: float) -> str:
+        """Determina el color del indicador según sus umbrales (tema oscuro)"""
+        return self.colors[self.score_calculator.get_indicator_level(name, value)]
     
     def show_phase(self, phase_data):
         """Muestra fase con diseño oscuro limpio y scroll en opciones"""
         self._clear_content()
         
         # Container principal con padding
-        main_frame = tk.Frame(self.content_frame, bg=self.colors['secondary'])
+        main_frame = ThemedFrame(self.content_frame, bg=self.colors['secondary'])
         main_frame.pack(fill='both', expand=True, padx=40, pady=30)
         
         # Pregunta principal centrada y destacada
-        question_frame = tk.Frame(main_frame, bg=self.colors['accent'], relief='flat', bd=0)
+        question_frame = ThemedFrame(main_frame, bg=self.colors['accent'], relief='flat', bd=0)
         question_frame.pack(fill='x', pady=(0, 20))
         
-        question_label = tk.Label(
+        question_label = ThemedLabel(
             question_frame,
             text=phase_data['question'],
             font=self.fonts['subtitle'],
@@ -235,91 +263,61 @@ class UIManager:
         )
         question_label.pack(pady=15, padx=30)
         
-        # Frame con scrollbar para las opciones
-        canvas_frame = tk.Frame(main_frame, bg=self.colors['secondary'])
-        canvas_frame.pack(fill='both', expand=True, pady=(10, 0))
-        
-        # Canvas y scrollbar
-        canvas = tk.Canvas(canvas_frame, bg=self.colors['secondary'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['secondary'])
-        
-        # Crear ventana del frame dentro del canvas
-        canvas_window = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        
-        def on_canvas_configure(event):
-            # Actualizar scroll region
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            # Hacer que el frame scrollable ocupe todo el ancho del canvas
-            canvas.itemconfig(canvas_window, width=event.width)
-        
-        def on_frame_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-        
-        # Bindings para mantener el tamaño sincronizado
-        canvas.bind('<Configure>', on_canvas_configure)
-        scrollable_frame.bind('<Configure>', on_frame_configure)
-        
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack canvas y scrollbar
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        # Opciones con scroll: título y estrategia de inmediato; la descripción se crea
+        # solo si el jugador la despliega
+        options_scroll = ScrollContainer(main_frame, bg=self.colors['secondary'])
+        options_scroll.pack(fill='both', expand=True, pady=(10, 0))
         
-        # Opciones de decisión con tema oscuro dentro del frame scrollable
+        on_preview = self._show_option_preview if self.on_preview_callback else None
+        title_font = self.styles.font(11, 'bold')
         for i, option in enumerate(phase_data['options']):
-            # Frame para cada opción SIN padx para usar todo el ancho
-            option_frame = tk.Frame(scrollable_frame, bg=self.colors['secondary'])
-            option_frame.pack(fill='x', pady=10, padx=0)
-            
-            # Botón principal con tema oscuro - ocupa todo el ancho
-            btn = tk.Button(
-                option_frame,
-                text=f"{chr(65+i)}) {option['title']}",
-                font=('Segoe UI', 11, 'bold'),
-                bg=self.colors['card_bg'],
-                fg=self.colors['text_primary'],
-                activebackground=self.colors['highlight'],
-                activeforeground=self.colors['text_primary'],
-                relief='flat',
-                bd=1,
-                wraplength=850,
-                justify='left',
-                command=lambda idx=i: self.on_decision_callback(idx),
-                cursor="hand2"
+            options_scroll.add(
+                lambda parent, i=i, option=option: OptionCard(
+                    parent, i, option, self.styles,
+                    on_select=self.on_decision_callback, on_preview=on_preview),
+                pady=10,
+                height=self.styles.text_height(f"A) {option['title']}", title_font, 850) + 50
             )
-            btn.pack(fill='x', pady=(0, 5), padx=5)
-            
-            # Tipo de estrategia (si está disponible)
-            if option.get('strategy_type'):
-                strategy_label = tk.Label(
-                    option_frame,
-                    text=f"📋 {option['strategy_type']}",
-                    font=('Segoe UI', 9, 'italic'),
-                    fg=self.colors['accent'],
-                    bg=self.colors['secondary'],
-                    justify='left'
-                )
-                strategy_label.pack(fill='x', padx=25, pady=(0, 3))
-            
-            # Descripción con texto claro - ocupa todo el ancho
-            if option.get('description'):
-                desc_label = tk.Label(
-                    option_frame,
-                    text=option['description'],
-                    font=('Segoe UI', 10),
-                    fg=self.colors['text_secondary'],
-                    bg=self.colors['secondary'],
-                    wraplength=900,
-                    justify='left'
-                )
-                desc_label.pack(fill='x', padx=25)
-        
-        # Bind mouse wheel to canvas for scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+    
+    def _show_option_preview(self, decision_index: int, label: ThemedLabel):
+        """Muestra la proyección de una opción sin bloquear el renderizado"""
+        future = self.on_preview_callback(decision_index)
+        if future is None:
+            return
+        
+        def poll():
+            if not label.winfo_exists():
+                return
+            if not future.done():
+                self.root.after(self.PREVIEW_POLL_MS, poll)
+                return
+            try:
+                label.config(text=self._format_option_preview(future.result()))
+            except Exception as e:
+                print(f"⚠️ Error calculando proyección: {e}")
+                label.config(text="")
+        
+        if future.done():
+            poll()
+        else:
+            label.config(text="⏳ Calculando proyección...")
+            self.root.after(self.PREVIEW_POLL_MS, poll)
+    
+    def _format_option_preview(self, preview) -> str:
+        """Construye el texto de la proyección de una opción"""
+        changes = "  ·  ".join(
+            f"{name} {preview.indicators[name] - delta:.0f}→{preview.indicators[name]:.0f}"
+            for name, delta in preview.deltas.items()
+        ) or "Sin cambios en indicadores"
+        if preview.synergy_effects:
+            changes += "  ✨ sinergia"
+        
+        if preview.game_over:
+            return f"🔮 {changes}\n💀 Esta opción termina el juego ({', '.join(preview.failed_indicators)})"
+        if preview.best_score is None:
+            return f"🔮 {changes}\n💀 Ningún camino posterior evita el fin del juego"
+        label = "Mejor puntaje alcanzable" if preview.best_exact else "Mejor puntaje estimado"
+        return f"🔮 {changes}\n🏆 {label}: {preview.best_score:.1f} ({preview.best_category})"
     
     def _clear_content(self):
         """Limpia el contenido del frame"""
@@ -338,7 +336,7 @@ class UIManager:
         """Muestra advertencia crítica limpia"""
         warning_msg = "⚠️ Alerta: Indicadores en zona de riesgo\n\n"
         for indicator in critical_indicators:
-            warning_msg += f"• {indicator} (menos del 20%)\n"
+            warning_msg += f"• {indicator} (menos del {self.score_calculator.get_spec(indicator).critical:g}%)\n"
         warning_msg += "\nTen cuidado con las próximas decisiones."
         
         messagebox.showwarning("Zona de Riesgo", warning_msg)
@@ -349,7 +347,7 @@ class UIManager:
         failure_msg += f"Llegaste hasta la Fase {current_phase}/{max_phases}\n\n"
         failure_msg += "Indicadores críticos:\n"
         for indicator in failed_indicators:
-            failure_msg += f"• {indicator} (menos del 5%)\n"
+            failure_msg += f"• {indicator} (menos del {self.score_calculator.get_spec(indicator).failure:g}%)\n"
         
         messagebox.showerror("Fin del Juego", failure_msg)
     
@@ -361,44 +359,46 @@ class UIManager:
         self._clear_content()
         
         # Título de resultados oscuro
-        title_label = tk.Label(
+        title_label = ThemedLabel(
             self.content_frame,
             text="🎊 Simulación Completada",
-            font=('Segoe UI', 18, 'bold'),
+            font=self.styles.font(18, 'bold'),
             fg=self.colors['text_primary'],
             bg=self.colors['secondary']
         )
         title_label.pack(pady=20)
         
         # Categoría con colores oscuros
-        cat_color = self.colors['success'] if avg_score >= 70 else self.colors['warning'] if avg_score >= 50 else self.colors['danger']
-        category_label = tk.Label(
+        cat_color = (self.colors['success'] if avg_score >= ScoreCalculator.EXCELLENT_SCORE
+                     else self.colors['warning'] if avg_score >= ScoreCalculator.GOOD_SCORE
+                     else self.colors['danger'])
+        category_label = ThemedLabel(
             self.content_frame,
             text=category,
-            font=('Segoe UI', 16, 'bold'),
+            font=self.styles.font(16, 'bold'),
             fg=cat_color,
             bg=self.colors['secondary']
         )
         category_label.pack(pady=10)
         
         # Puntuación en frame destacado oscuro
-        score_frame = tk.Frame(self.content_frame, bg=self.colors['accent'], relief='flat', bd=0)
+        score_frame = ThemedFrame(self.content_frame, bg=self.colors['accent'], relief='flat', bd=0)
         score_frame.pack(pady=15)
         
-        score_label = tk.Label(
+        score_label = ThemedLabel(
             score_frame,
             text=f"Puntuación Final: {avg_score:.1f}/100",
-            font=('Segoe UI', 14, 'bold'),
+            font=self.styles.font(14, 'bold'),
             fg=self.colors['text_primary'],
             bg=self.colors['accent']
         )
         score_label.pack(pady=15, padx=30)
         
         # Mensaje con tema oscuro
-        message_label = tk.Label(
+        message_label = ThemedLabel(
             self.content_frame,
             text=message,
-            font=('Segoe UI', 12),
+            font=self.styles.font(12),
             fg=self.colors['text_secondary'],
             bg=self.colors['secondary'],
             wraplength=500,
@@ -407,53 +407,53 @@ class UIManager:
         message_label.pack(pady=20)
         
         # Desglose de indicadores finales
-        details_frame = tk.Frame(self.content_frame, bg=self.colors['secondary'])
+        details_frame = ThemedFrame(self.content_frame, bg=self.colors['secondary'])
         details_frame.pack(pady=20)
         
-        details_title = tk.Label(
+        details_title = ThemedLabel(
             details_frame,
             text="� INDICADORES FINALES:",
-            font=('Arial', 12, 'bold'),
+            font=self.styles.font(12, 'bold', family='Arial'),
             fg=self.colors['success'],
             bg=self.colors['secondary']
         )
         details_title.pack()
         
         for name, value in indicators.items():
-            color = self._get_indicator_color(value)
-            indicator_label = tk.Label(
+            color = self._get_indicator_color(name, value)
+            indicator_label = ThemedLabel(
                 details_frame,
                 text=f"{name}: {value:.1f}%",
-                font=('Arial', 11),
+                font=self.styles.font(11, family='Arial'),
                 fg=color,
                 bg=self.colors['secondary']
             )
             indicator_label.pack()
         
         # Botones de acción
-        buttons_frame = tk.Frame(self.content_frame, bg=self.colors['secondary'])
+        buttons_frame = ThemedFrame(self.content_frame, bg=self.colors['secondary'])
         buttons_frame.pack(pady=30)
         
-        restart_btn = tk.Button(
+        restart_btn = ThemedButton(
             buttons_frame,
             text="🔄 JUGAR NUEVAMENTE",
-            font=('Arial', 12, 'bold'),
+            font=self.styles.font(12, 'bold', family='Arial'),
             bg=self.colors['success'],
             fg=self.colors['secondary'],
-            activebackground='#8be9fd',
+            activebackground=self.colors['highlight'],
             command=restart_callback,
             padx=20,
             pady=10
         )
         restart_btn.pack(side='left', padx=10)
         
-        quit_btn = tk.Button(
+        quit_btn = ThemedButton(
             buttons_frame,
             text="❌ SALIR",
-            font=('Arial', 12, 'bold'),
+            font=self.styles.font(12, 'bold', family='Arial'),
             bg=self.colors['danger'],
             fg=self.colors['text_primary'],
-            activebackground='#ff6b6b',
+            activebackground=self.colors['highlight'],
             command=quit_callback,
             padx=20,
             pady=10
@@ -462,13 +462,13 @@ class UIManager:
     
     def _show_restart_buttons(self, restart_callback: Callable, quit_callback: Callable):
         """Muestra botones de reinicio con tema oscuro después de game over"""
-        restart_frame = tk.Frame(self.content_frame, bg=self.colors['secondary'])
+        restart_frame = ThemedFrame(self.content_frame, bg=self.colors['secondary'])
         restart_frame.pack(pady=30)
         
-        restart_btn = tk.Button(
+        restart_btn = ThemedButton(
             restart_frame,
             text="🔄 Nueva Partida",
-            font=('Segoe UI', 12, 'bold'),
+            font=self.styles.font(12, 'bold'),
             bg=self.colors['success'],
             fg=self.colors['primary'],
             activebackground=self.colors['highlight'],
@@ -481,10 +481,10 @@ class UIManager:
         )
         restart_btn.pack(side='left', padx=10)
         
-        quit_btn = tk.Button(
+        quit_btn = ThemedButton(
             restart_frame,
             text="❌ Salir",
-            font=('Segoe UI', 12, 'bold'),
+            font=self.styles.font(12, 'bold'),
             bg=self.colors['danger'],
             fg=self.colors['text_primary'],
             activebackground=self.colors['highlight'],
@@ -497,8 +497,9 @@ class UIManager:
         )
         quit_btn.pack(side='left', padx=10)
 
-    def show_start_screen(self, start_game_callback: Callable, show_rules_callback: Callable):
-        """Muestra la pantalla de inicio del juego"""
+    def show_start_screen(self, start_game_callback: Callable, show_rules_callback: Callable,
+                          resume_game_callback: Callable = None):
+        """Muestra la pantalla de inicio del juego (con opción de reanudar si hay autoguardado)"""
         # Guardar callback para usar después
         self.start_game_callback = start_game_callback
         
@@ -506,42 +507,61 @@ class UIManager:
         self._clear_all_content()
         
         # Container principal centrado
-        main_container = tk.Frame(self.root, bg=self.colors['primary'])
+        main_container = ThemedFrame(self.root, bg=self.colors['primary'])
         main_container.pack(fill='both', expand=True)
         
         # Frame central para centrar todo el contenido
-        center_frame = tk.Frame(main_container, bg=self.colors['primary'])
+        center_frame = ThemedFrame(main_container, bg=self.colors['primary'])
         center_frame.place(relx=0.5, rely=0.5, anchor='center')
         
         # Título principal del juego
-        title_label = tk.Label(
+        title_label = ThemedLabel(
             center_frame,
             text="🎮 Simulador de Decisiones Estratégicas",
-            font=('Segoe UI', 28, 'bold'),
+            font=self.styles.font(28, 'bold'),
             fg=self.colors['text_primary'],
             bg=self.colors['primary']
         )
         title_label.pack(pady=(0, 10))
         
         # Subtítulo
-        subtitle_label = tk.Label(
+        subtitle_label = ThemedLabel(
             center_frame,
             text='"El Rincón de Amaru"',
-            font=('Segoe UI', 20, 'italic'),
+            font=self.styles.font(20, 'italic'),
             fg=self.colors['accent'],
             bg=self.colors['primary']
         )
         subtitle_label.pack(pady=(0, 50))
         
         # Frame para los botones
-        buttons_frame = tk.Frame(center_frame, bg=self.colors['primary'])
+        buttons_frame = ThemedFrame(center_frame, bg=self.colors['primary'])
         buttons_frame.pack(pady=20)
         
+        # Botón Continuar (solo si hay una partida interrumpida)
+        if resume_game_callback:
+            resume_btn = ThemedButton(
+                buttons_frame,
+                text="💾 CONTINUAR PARTIDA",
+                font=self.styles.font(16, 'bold'),
+                bg=self.colors['warning'],
+                fg=self.colors['primary'],
+                activebackground=self.colors['highlight'],
+                activeforeground=self.colors['text_primary'],
+                command=resume_game_callback,
+                padx=40,
+                pady=15,
+                relief='flat',
+                bd=0,
+                cursor="hand2"
+            )
+            resume_btn.pack(pady=10)
+        
         # Botón Jugar
-        play_btn = tk.Button(
+        play_btn = ThemedButton(
             buttons_frame,
             text="🚀 JUGAR",
-            font=('Segoe UI', 16, 'bold'),
+            font=self.styles.font(16, 'bold'),
             bg=self.colors['success'],
             fg=self.colors['primary'],
             activebackground=self.colors['highlight'],
@@ -556,10 +576,10 @@ class UIManager:
         play_btn.pack(pady=10)
         
         # Botón Reglas
-        rules_btn = tk.Button(
+        rules_btn = ThemedButton(
             buttons_frame,
             text="📖 REGLAS",
-            font=('Segoe UI', 16, 'bold'),
+            font=self.styles.font(16, 'bold'),
             bg=self.colors['card_bg'],
             fg=self.colors['text_primary'],
             activebackground=self.colors['highlight'],
@@ -574,10 +594,10 @@ class UIManager:
         rules_btn.pack(pady=10)
         
         # Información adicional
-        info_label = tk.Label(
+        info_label = ThemedLabel(
             center_frame,
             text="Un juego basado en las 5 Fuerzas de Porter\nDesarrolla tu estrategia empresarial",
-            font=('Segoe UI', 12),
+            font=self.styles.font(12),
             fg=self.colors['text_secondary'],
             bg=self.colors['primary'],
             justify='center'
@@ -590,210 +610,93 @@ class UIManager:
         self._clear_all_content()
         
         # Container principal
-        main_container = tk.Frame(self.root, bg=self.colors['primary'])
+        main_container = ThemedFrame(self.root, bg=self.colors['primary'])
         main_container.pack(fill='both', expand=True, padx=40, pady=20)
         
         # Título de reglas
-        title_label = tk.Label(
+        title_label = ThemedLabel(
             main_container,
             text="📖 Reglas del Juego",
-            font=('Segoe UI', 24, 'bold'),
+            font=self.styles.font(24, 'bold'),
             fg=self.colors['text_primary'],
             bg=self.colors['primary']
         )
         title_label.pack(pady=(10, 20))
         
-        # Frame con scroll para el contenido de reglas
-        canvas_frame = tk.Frame(main_container, bg=self.colors['primary'])
-        canvas_frame.pack(fill='both', expand=True, pady=(0, 20))
-        
-        # Canvas y scrollbar
-        canvas = tk.Canvas(canvas_frame, bg=self.colors['secondary'], highlightthickness=0)
-        scrollbar = ttk.Scrollbar(canvas_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['secondary'])
-        
-        # Crear ventana del frame dentro del canvas
-        canvas_window = canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        
-        def on_canvas_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-            canvas.itemconfig(canvas_window, width=event.width)
-        
-        def on_frame_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
-        
-        canvas.bind('<Configure>', on_canvas_configure)
-        scrollable_frame.bind('<Configure>', on_frame_configure)
-        canvas.configure(yscrollcommand=scrollbar.set)
-        
-        # Pack canvas y scrollbar
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Contenido de las reglas
-        content_frame = tk.Frame(scrollable_frame, bg=self.colors['secondary'])
-        content_frame.pack(fill='both', expand=True, padx=60, pady=40)
+        # Contenido de las reglas con scroll: cada bloque se crea al acercarse a la vista
+        rules_scroll = ScrollContainer(main_container, bg=self.colors['secondary'])
+        rules_scroll.pack(fill='both', expand=True, pady=(0, 20))
+        
+        def add_text_block(text, font, bg, fg=self.colors['text_primary'], wraplength=None,
+                           justify='left', pady=0, padx=0, anchor=None, fill=None, margin=0, spacing=0):
+            """Agrega un bloque de texto (frame con fondo propio y una etiqueta) con su alto estimado"""
+            def factory(parent):
+                frame = ThemedFrame(parent, bg=bg, relief='flat', bd=0)
+                label = ThemedLabel(frame, text=text, font=font, fg=fg, bg=bg,
+                                 wraplength=wraplength or 0, justify=justify)
+                label.pack(pady=pady, padx=padx, anchor=anchor, fill=fill)
+                return frame
+            vertical_padding = sum(pady) if isinstance(pady, tuple) else 2 * pady
+            height = self.styles.text_height(text, font, wraplength) + vertical_padding
+            rules_scroll.add(factory, padx=margin, pady=spacing, height=height)
+        
+        margin = 60   # Margen lateral del contenido
         
         # Bienvenida en un frame destacado
-        welcome_frame = tk.Frame(content_frame, bg=self.colors['accent'], relief='flat', bd=0)
-        welcome_frame.pack(fill='x', pady=(0, 30))
-        
-        welcome_label = tk.Label(
-            welcome_frame,
-            text='Bienvenido al Simulador de Decisiones Estratégicas "El Rincón de Amaru"',
-            font=('Segoe UI', 18, 'bold'),
-            fg=self.colors['text_primary'],
-            bg=self.colors['accent'],
-            wraplength=650,
-            justify='center'
+        add_text_block(
+            RULES_WELCOME, font=self.styles.font(18, 'bold'), bg=self.colors['accent'],
+            wraplength=650, justify='center', pady=20, padx=30,
+            margin=margin, spacing=(40, 30)
         )
-        welcome_label.pack(pady=20, padx=30)
         
         # Descripción principal en frame separado
-        desc_frame = tk.Frame(content_frame, bg=self.colors['card_bg'], relief='flat', bd=0)
-        desc_frame.pack(fill='x', pady=(0, 25))
-        
-        description_text = """En este juego representarás a un emprendedor que ha fundado una cafetería con identidad cultural, insumos locales y un enfoque experiencial. Tu objetivo es mantener el equilibrio estratégico a lo largo de 5 rondas (islas), cada una basada en una de las 5 fuerzas de Porter."""
-        
-        description_label = tk.Label(
-            desc_frame,
-            text=description_text,
-            font=('Segoe UI', 13),
-            fg=self.colors['text_primary'],
-            bg=self.colors['card_bg'],
-            wraplength=650,
-            justify='left'
+        add_text_block(
+            RULES_DESCRIPTION, font=self.styles.font(13), bg=self.colors['card_bg'],
+            wraplength=650, pady=20, padx=30, fill='x',
+            margin=margin, spacing=(0, 25)
         )
-        description_label.pack(pady=20, padx=30, fill='x')
-        
-        # Sección de reglas con frame propio
-        rules_frame = tk.Frame(content_frame, bg=self.colors['secondary'])
-        rules_frame.pack(fill='x', pady=(10, 30))
         
         # Título de reglas
-        rules_title = tk.Label(
-            rules_frame,
-            text="📋 Reglas del Juego:",
-            font=('Segoe UI', 16, 'bold'),
-            fg=self.colors['success'],
-            bg=self.colors['secondary']
+        add_text_block(
+            RULES_TITLE, font=self.styles.font(16, 'bold'),
+            bg=self.colors['secondary'], fg=self.colors['success'], anchor='w',
+            margin=margin, spacing=(10, 15)
         )
-        rules_title.pack(anchor='w', pady=(0, 15))
         
         # Lista de reglas con mejor espaciado
-        rules_list = [
-            "Cada decisión que tomes afectará uno o más de los siguientes indicadores: liquidez, rentabilidad, reputación, sostenibilidad estratégica y riesgo acumulado.",
-            "No hay decisiones \"correctas\" o \"incorrectas\" absolutas. El éxito radica en tu coherencia estratégica, capacidad de adaptación y visión de largo plazo.",
-            "Tu empresa puede crecer, sostenerse o fracasar según cómo combines tus decisiones.",
-            "Al finalizar cada isla, verás cómo cambian tus indicadores. Analiza los resultados y aprende.",
-            "El juego termina cuando completas las 5 islas o cuando el riesgo acumulado alcanza el 100% (fracaso operativo)."
-        ]
-        
-        for i, rule in enumerate(rules_list, 1):
-            # Frame para cada regla individual
-            rule_frame = tk.Frame(rules_frame, bg=self.colors['card_bg'], relief='flat', bd=1)
-            rule_frame.pack(fill='x', pady=5, padx=10)
-            
-            rule_label = tk.Label(
-                rule_frame,
-                text=f"{i}. {rule}",
-                font=('Segoe UI', 12),
-                fg=self.colors['text_primary'],
-                bg=self.colors['card_bg'],
-                wraplength=600,
-                justify='left'
+        for i, rule in enumerate(GAME_RULES, 1):
+            last = i == len(GAME_RULES)
+            add_text_block(
+                f"{i}. {rule}", font=self.styles.font(12), bg=self.colors['card_bg'],
+                wraplength=600, pady=12, padx=20, anchor='w',
+                margin=margin + 10, spacing=(5, 35 if last else 5)
             )
-            rule_label.pack(pady=12, padx=20, anchor='w')
-        
-        # Sección de historia con frame propio
-        story_frame = tk.Frame(content_frame, bg=self.colors['secondary'])
-        story_frame.pack(fill='x', pady=(20, 30))
         
         # Título de historia
-        story_title = tk.Label(
-            story_frame,
-            text='📖 Historia de la Cafetería "El Rincón de Amaru"',
-            font=('Segoe UI', 16, 'bold'),
-            fg=self.colors['warning'],
-            bg=self.colors['secondary']
+        add_text_block(
+            STORY_TITLE, font=self.styles.font(16, 'bold'),
+            bg=self.colors['secondary'], fg=self.colors['warning'], anchor='w',
+            margin=margin, spacing=(20, 20)
         )
-        story_title.pack(anchor='w', pady=(0, 20))
         
-        # Container para los párrafos de historia
-        story_container = tk.Frame(story_frame, bg=self.colors['card_bg'], relief='flat', bd=0)
-        story_container.pack(fill='x', padx=10)
-        
-        # Historia - párrafo 1
-        story_p1 = """Amaru Mamani, joven emprendedor cochabambino, fundó El Rincón de Amaru con el sueño de unir café de altura, cultura local y emprendimiento juvenil. Tras años de esfuerzo, abrió una cafetería con una propuesta única: arte local, música en vivo, productos regionales y atención personalizada."""
-        
-        story_label1 = tk.Label(
-            story_container,
-            text=story_p1,
-            font=('Segoe UI', 12),
-            fg=self.colors['text_primary'],
-            bg=self.colors['card_bg'],
-            wraplength=600,
-            justify='left'
-        )
-        story_label1.pack(pady=(20, 15), padx=30, fill='x')
-        
-        # Historia - párrafo 2
-        story_p2 = """Aunque el inicio fue exitoso, pronto enfrentó dilemas estratégicos: expandir el menú o mejorar márgenes, contratar personal o mantener turnos familiares, elegir entre proveedores baratos o microproductores, participar en ferias o enfocarse en el local, y adoptar delivery o preservar la experiencia presencial."""
-        
-        story_label2 = tk.Label(
-            story_container,
-            text=story_p2,
-            font=('Segoe UI', 12),
-            fg=self.colors['text_primary'],
-            bg=self.colors['card_bg'],
-            wraplength=600,
-            justify='left'
-        )
-        story_label2.pack(pady=(0, 15), padx=30, fill='x')
-        
-        # Historia - párrafo 3
-        story_p3 = """Cada decisión afectaba indicadores clave como liquidez, rentabilidad, reputación y sostenibilidad. Amaru aprendió que no hay decisiones "correctas", sino estrategias coherentes que acumulen valor a largo plazo."""
-        
-        story_label3 = tk.Label(
-            story_container,
-            text=story_p3,
-            font=('Segoe UI', 12),
-            fg=self.colors['text_primary'],
-            bg=self.colors['card_bg'],
-            wraplength=600,
-            justify='left'
-        )
-        story_label3.pack(pady=(0, 15), padx=30, fill='x')
-        
-        # Historia - párrafo final
-        story_p4 = """Este concepto se convierte en la base de un juego de simulación empresarial, donde el jugador toma decisiones como Amaru, enfrentando las 5 fuerzas de Porter: proveedores, clientes, productos sustitutos, nuevos competidores y rivalidad sectorial. El resultado final dependerá de cómo se gestionan estas decisiones y su impacto acumulado en el negocio."""
-        
-        story_label4 = tk.Label(
-            story_container,
-            text=story_p4,
-            font=('Segoe UI', 12),
-            fg=self.colors['text_primary'],
-            bg=self.colors['card_bg'],
-            wraplength=600,
-            justify='left'
-        )
-        story_label4.pack(pady=(0, 20), padx=30, fill='x')
-        
-        # Bind mouse wheel to canvas for scrolling
-        def _on_mousewheel(event):
-            canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        # Historia en párrafos contiguos sobre el mismo fondo
+        for i, paragraph in enumerate(STORY_PARAGRAPHS):
+            first, last = i == 0, i == len(STORY_PARAGRAPHS) - 1
+            add_text_block(
+                paragraph, font=self.styles.font(12), bg=self.colors['card_bg'],
+                wraplength=600, pady=(20 if first else 0, 20 if last else 15), padx=30, fill='x',
+                margin=margin + 10, spacing=(0, 70 if last else 0)
+            )
         
         # Botones de navegación
-        nav_frame = tk.Frame(main_container, bg=self.colors['primary'])
+        nav_frame = ThemedFrame(main_container, bg=self.colors['primary'])
         nav_frame.pack(pady=20)
         
         # Botón Volver
-        back_btn = tk.Button(
+        back_btn = ThemedButton(
             nav_frame,
             text="⬅️ VOLVER",
-            font=('Segoe UI', 14, 'bold'),
+            font=self.styles.font(14, 'bold'),
             bg=self.colors['card_bg'],
             fg=self.colors['text_primary'],
             activebackground=self.colors['highlight'],
@@ -808,10 +711,10 @@ class UIManager:
         back_btn.pack(side='left', padx=10)
         
         # Botón Jugar desde reglas
-        play_btn = tk.Button(
+        play_btn = ThemedButton(
             nav_frame,
             text="🚀 JUGAR",
-            font=('Segoe UI', 14, 'bold'),
+            font=self.styles.font(14, 'bold'),
             bg=self.colors['success'],
             fg=self.colors['primary'],
             activebackground=self.colors['highlight'],
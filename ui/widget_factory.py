@@ -1,16 +1,17 @@
 import tkinter as tk
 from tkinter import ttk
 from config.settings import UIConfig
+from ui.style_registry import get_style_registry
 
 class WidgetFactory:
-    """Factory para crear widgets con estilos consistentes"""
+    """Factory para crear widgets con estilos consistentes (fuentes con nombre del registro compartido)"""
     
     @staticmethod
     def create_label(parent, text: str, font_key: str = 'normal', 
                     fg_key: str = 'fg_primary', **kwargs) -> tk.Label:
         """Crea un label con estilo consistente"""
         defaults = {
-            'font': UIConfig.FONTS[font_key],
+            'font': get_style_registry(parent.winfo_toplevel()).font_from_spec(UIConfig.FONTS[font_key]),
             'fg': UIConfig.COLORS[fg_key],
             'bg': UIConfig.COLORS['bg_secondary'],
             'wraplength': 800 if 'wraplength' not in kwargs else kwargs['wraplength']
@@ -23,7 +24,7 @@ class WidgetFactory:
     def create_button(parent, text: str, command=None, **kwargs) -> tk.Button:
         """Crea un botón con estilo consistente"""
         defaults = {
-            'font': UIConfig.FONTS['normal'],
+            'font': get_style_registry(parent.winfo_toplevel()).font_from_spec(UIConfig.FONTS['normal']),
             'bg': UIConfig.COLORS['bg_button'],
             'fg': UIConfig.COLORS['fg_primary'],
             'activebackground': UIConfig.COLORS['bg_button_active'],